@@ -0,0 +1,246 @@
+"""On-disk index of article metadata, validated by file mtime and size.
+
+Status views and pre-publish checks need only a few header fields per article
+(title, topics, published flag) plus a body hash and the images it references.
+The index keeps those per file in scripts/.cache/article-index.json. A lookup
+stats the file and re-reads it only if its mtime or size changed, so a status
+run over an unchanged corpus reads no article files at all.
+
+zenn_publish.py --status and images.py use their own ArticleIndex; publish.py
+keeps one shared by everything that parses articles through it
+(scheduled_publish.py processing, reconcile and --verify, linkcheck.py, the
+translation check), saved when the process exits.
+
+read_frontmatter() reads a file only up to the closing ``---``. It parses
+the header with PyYAML's C loader when available. Without PyYAML (for
+example, zenn_publish.py running outside the venv), it falls back to a
+reader for the flat ``key: value`` headers Zenn uses: scalars and
+``["a", "b"]`` topic lists.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import re
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent
+DEFAULT_INDEX_PATH = SCRIPT_DIR / ".cache" / "article-index.json"
+
+# Bump when ArticleMeta or the header reader changes; drops old entries.
+INDEX_VERSION = 3
+
+# Same delimiter python-frontmatter splits on.
+_BOUNDARY_RE = re.compile(r"^-{3,}\s*$", re.MULTILINE)
+
+# Zenn image reference; the name stops before a `` =250x`` size suffix.
+IMAGE_REF_RE = re.compile(r"!\[[^\]]*\]\(/images/([^)\s]+)")
+# Opening code fence: up to 3 spaces, then 3+ backticks or tildes.
+_FENCE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+
+_PAIR_DIRS = {"articles": "articles-en", "articles-en": "articles"}
+
+
+@dataclass(frozen=True)
+class ArticleMeta:
+    title: str
+    topics: tuple[str, ...]
+    published: bool | None  # None when the header has no published key
+    body_hash: str  # SHA-256 of the markdown body (after the header)
+    images: tuple[str, ...] = ()  # /images/ names referenced outside code blocks
+
+
+def read_frontmatter(path: Path) -> dict[str, Any]:
+    """Return an article's frontmatter fields, reading no further than the header."""
+    # Binary mode: text mode would decode whole buffered chunks of the body.
+    with open(path, "rb") as f:
+        first = f.readline().decode("utf-8-sig")
+        if not _BOUNDARY_RE.match(first.lstrip()):
+            return {}
+        lines = []
+        for raw in f:
+            line = raw.decode("utf-8")
+            if _BOUNDARY_RE.match(line):
+                return parse_header("".join(lines))
+            lines.append(line)
+    return {}  # no closing delimiter: not frontmatter
+
+
+def _split(text: str) -> tuple[str | None, str]:
+    """Split text into (header, body) the way python-frontmatter does."""
+    text = text.strip()
+    if not _BOUNDARY_RE.match(text):
+        return None, text
+    parts = _BOUNDARY_RE.split(text, 2)
+    if len(parts) < 3:
+        return None, text
+    return parts[1], parts[2].strip()
+
+
+def read_header(text: str) -> tuple[dict[str, Any], str]:
+    """Split a Zenn article into (frontmatter fields, body).
+
+    The body matches python-frontmatter's ``Post.content``.
+    """
+    header, body = _split(text)
+    return ({} if header is None else parse_header(header)), body
+
+
+def split_body(text: str) -> str:
+    """The markdown body of an article, without parsing its header."""
+    return _split(text)[1]
+
+
+@functools.cache
+def _yaml() -> tuple[Any, Any] | None:
+    """PyYAML and its fastest safe loader, imported on the first header parse.
+
+    Deferred so that runs answered from the index never import PyYAML.
+    """
+    try:
+        import yaml
+    except ImportError:  # zenn_publish.py may run with the system Python
+        return None
+    return yaml, getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def parse_header(header: str) -> dict[str, Any]:
+    """Parse frontmatter YAML (C loader if available, else the flat reader)."""
+    loaded = _yaml()
+    if loaded is not None:
+        yaml, loader = loaded
+        data = yaml.load(header, Loader=loader)
+        return data if isinstance(data, dict) else {}
+    fields: dict[str, Any] = {}
+    for line in header.splitlines():
+        key, sep, value = line.partition(":")
+        if not sep or not key or key[0].isspace():
+            continue
+        fields[key.strip()] = _scalar(value.strip())
+    return fields
+
+
+def _scalar(value: str) -> Any:
+    if value in ("true", "false"):
+        return value == "true"
+    if value.startswith("["):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            inner = value.strip("[]")
+            return [item.strip().strip("'\"") for item in inner.split(",") if item.strip()]
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def image_refs(body: str) -> tuple[str, ...]:
+    """Names of the ``/images/`` files a body references, skipping fenced code."""
+    if "](/images/" not in body:
+        return ()
+    names: dict[str, None] = {}
+    fence: str | None = None
+    for line in body.splitlines():
+        if fence is not None:
+            stripped = line.strip()
+            if stripped.startswith(fence) and not stripped.lstrip(fence[0]):
+                fence = None
+            continue
+        match = _FENCE_RE.match(line)
+        if match:
+            fence = match.group(1)
+        elif "](/images/" in line:
+            names.update(dict.fromkeys(IMAGE_REF_RE.findall(line)))
+    return tuple(names)
+
+
+def _read_meta(path: Path) -> ArticleMeta:
+    fields, body = read_header(path.read_text(encoding="utf-8"))
+    published = fields.get("published")
+    return ArticleMeta(
+        title=str(fields.get("title", "")),
+        topics=tuple(fields.get("topics") or ()),
+        published=published if isinstance(published, bool) else None,
+        body_hash=hashlib.sha256(body.encode()).hexdigest(),
+        images=image_refs(body),
+    )
+
+
+def pair_path(path: Path) -> Path | None:
+    """The EN counterpart of a JP article (articles/ <-> articles-en/), or the reverse."""
+    other = _PAIR_DIRS.get(path.parent.name)
+    if other is None:
+        return None
+    return path.parent.parent / other / path.name
+
+
+class ArticleIndex:
+    """mtime/size-validated cache of ArticleMeta, keyed by resolved path."""
+
+    def __init__(self, index_path: Path = DEFAULT_INDEX_PATH) -> None:
+        self.index_path = index_path
+        self._entries: dict[str, dict[str, Any]] = self._load()
+        self._dirty = False
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        try:
+            data = json.loads(self.index_path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError):
+            return {}
+        if data.get("version") != INDEX_VERSION:
+            return {}
+        return data.get("entries", {})
+
+    def get(self, path: Path) -> ArticleMeta | None:
+        """Metadata for ``path``, re-read only if the file changed; None if missing."""
+        key = str(Path(path).resolve())
+        try:
+            stat = os.stat(key)
+        except FileNotFoundError:
+            if self._entries.pop(key, None) is not None:
+                self._dirty = True
+            return None
+        cached = self._entries.get(key)
+        if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+            meta = cached["meta"]
+            return ArticleMeta(
+                meta["title"], tuple(meta["topics"]), meta["published"], meta["body_hash"],
+                tuple(meta["images"]),
+            )
+        meta = _read_meta(Path(key))
+        self._entries[key] = {
+            "mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "meta": asdict(meta),
+        }
+        self._dirty = True
+        return meta
+
+    def pair(self, path: Path) -> Path | None:
+        """The existing EN/JP counterpart of ``path``, if any.
+
+        The counterpart is looked up (and indexed) like any other article,
+        so its metadata is cached alongside the original's.
+        """
+        other = pair_path(Path(path))
+        return other if other is not None and self.get(other) is not None else None
+
+    def save(self) -> None:
+        """Write the index if anything changed (temp file + rename)."""
+        if not self._dirty:
+            return
+        data = json.dumps({"version": INDEX_VERSION, "entries": self._entries}, ensure_ascii=False)
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.index_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, self.index_path)
+        except OSError:
+            return  # a read-only disk only costs the cache
+        self._dirty = False
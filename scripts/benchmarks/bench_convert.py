@@ -0,0 +1,129 @@
+"""Benchmark the parser and converters over the real corpus and scaled inputs.
+
+Usage:
+    python benchmarks/bench_convert.py                  # run, compare with baseline
+    python benchmarks/bench_convert.py --save-baseline  # run, write this machine's baseline
+    python benchmarks/bench_convert.py --quick          # skip the 10 MB case
+
+The conversion cache is disabled and the parse cases start from an empty
+article index, so every case measures real work.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+
+from harness import BASELINE_DIR, DEFAULT_THRESHOLD, SCRIPTS_DIR, finish, run_cases
+
+# harness (imported first) puts scripts/ on sys.path
+import publish
+from article_index import ArticleIndex
+from conversion_cache import ConversionCache
+from publish import (
+    Article,
+    _strip_zenn_syntax,
+    convert_to_devto,
+    convert_to_hashnode,
+    convert_to_qiita,
+    parse_zenn_article,
+)
+
+REPO_ROOT = SCRIPTS_DIR.parent
+BASELINE_PATH = BASELINE_DIR / "convert.json"
+
+
+def corpus_paths() -> list[Path]:
+    return sorted(REPO_ROOT.glob("articles/*.md")) + sorted(REPO_ROOT.glob("articles-en/*.md"))
+
+
+def scaled_body(corpus: list[Article], size: int) -> str:
+    """Concatenate corpus bodies until ``size`` bytes (UTF-8) are reached."""
+    text = "\n\n".join(article.body for article in corpus)
+    chunk = len(text.encode())
+    return "\n\n".join([text] * (size // chunk + 1))
+
+
+def _empty_index() -> ArticleIndex:
+    """A fresh article index that is never saved, so every header is parsed."""
+    return ArticleIndex(Path(os.devnull))
+
+
+def nested_details(depth: int) -> str:
+    opening = "".join(f"{':' * 3}details Level {i}\n" for i in range(depth))
+    return opening + "innermost ![x](/images/a.png)\n" + ":::\n" * depth
+
+
+def build_cases(*, quick: bool) -> list[tuple[str, object, int]]:
+    paths = corpus_paths()
+    corpus = [parse_zenn_article(path) for path in paths]
+    bodies = [article.body for article in corpus]
+    n = len(paths)
+
+    def parse_headers() -> None:
+        publish._articles = _empty_index()
+        for path in paths:
+            parse_zenn_article(path)
+
+    def parse_full() -> None:
+        publish._articles = _empty_index()
+        for path in paths:
+            parse_zenn_article(path).body
+
+    def strip_corpus() -> None:
+        for body in bodies:
+            _strip_zenn_syntax(body)
+
+    def convert_all(convert) -> object:
+        def run() -> None:
+            for article in corpus:
+                convert(article)
+        return run
+
+    one_mb = scaled_body(corpus, 1 << 20)
+    cases = [
+        (f"corpus/parse_header ({n} files)", parse_headers, 20),
+        (f"corpus/parse_with_body ({n} files)", parse_full, 20),
+        (f"corpus/strip_zenn_syntax ({n} bodies)", strip_corpus, 20),
+        ("corpus/convert_to_qiita", convert_all(convert_to_qiita), 20),
+        (
+            "corpus/convert_to_devto",
+            convert_all(lambda a: convert_to_devto(a, canonical_url="https://zenn.dev/x")),
+            20,
+        ),
+        (
+            "corpus/convert_to_hashnode",
+            convert_all(lambda a: convert_to_hashnode(a, "pub", canonical_url="https://zenn.dev/x")),
+            20,
+        ),
+        ("synthetic/strip_zenn_syntax_1MB", lambda: _strip_zenn_syntax(one_mb), 5),
+        ("synthetic/nested_details_depth_500", lambda: _strip_zenn_syntax(nested_details(500)), 5),
+    ]
+    if not quick:
+        ten_mb = scaled_body(corpus, 10 << 20)
+        cases.append(("synthetic/strip_zenn_syntax_10MB", lambda: _strip_zenn_syntax(ten_mb), 3))
+    return cases
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Parser/converter benchmarks")
+    parser.add_argument(
+        "--save-baseline", "--save", dest="save", action="store_true",
+        help="Write results as this machine's baseline",
+    )
+    parser.add_argument("--quick", action="store_true", help="Skip the 10 MB case")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help=f"Regression ratio vs baseline (default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    args = parser.parse_args()
+
+    publish._cache = ConversionCache(Path(), enabled=False)
+    results = run_cases(build_cases(quick=args.quick))
+    return finish(results, args.baseline, save=args.save, threshold=args.threshold)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
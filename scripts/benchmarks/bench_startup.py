@@ -0,0 +1,92 @@
+"""Benchmark script startup: fresh interpreters running the quick commands.
+
+Usage:
+    python benchmarks/bench_startup.py                  # run, compare with baseline
+    python benchmarks/bench_startup.py --save-baseline  # run, write this machine's baseline
+    python benchmarks/bench_startup.py --modules        # also list heavy modules each case imports
+
+Each case starts a new interpreter (``python -c``), so the numbers include
+interpreter startup; ``python/bare`` is that floor. The status cases call
+the same functions as ``--status`` but skip log-file setup, so running the
+benchmark leaves no files behind.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from harness import BASELINE_DIR, DEFAULT_THRESHOLD, SCRIPTS_DIR, finish, run_cases
+
+BASELINE_PATH = BASELINE_DIR / "startup.json"
+
+# Modules the quick paths should not load (see lazy.py).
+HEAVY_MODULES = ("httpx", "asyncio", "yaml", "frontmatter", "publish", "cProfile", "tracemalloc")
+
+CASES = {
+    "python/bare": "pass",
+    "zenn_publish/--status": (
+        "import zenn_publish as m; m.show_status(m.load_schedule())"
+    ),
+    "scheduled_publish/--status": (
+        "import scheduled_publish as m; m.show_status(m.load_schedule())"
+    ),
+    "plan_schedule/--dry-run": (
+        "import sys, plan_schedule as m; "
+        "sys.argv = ['plan_schedule.py', '--start', '2026-01-06', '--slugs', 'a,b', '--dry-run']; "
+        "m.main()"
+    ),
+    "publish/import": "import publish",
+}
+
+# Prints which heavy modules were really executed (not just bound lazily).
+_LOADED_PROBE = (
+    "; import json, sys; print(json.dumps(sorted(n for n in {names!r} "
+    "if n in sys.modules and type(sys.modules[n]).__name__ != '_LazyModule')), file=sys.stderr)"
+)
+
+
+def _run(code: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=SCRIPTS_DIR, check=True, capture_output=True, text=True,
+    )
+
+
+def loaded_heavy_modules(code: str) -> list[str]:
+    result = _run(code + _LOADED_PROBE.format(names=HEAVY_MODULES))
+    return json.loads(result.stderr.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Startup-time benchmarks")
+    parser.add_argument(
+        "--save-baseline", "--save", dest="save", action="store_true",
+        help="Write results as this machine's baseline",
+    )
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per case (default: 10)")
+    parser.add_argument(
+        "--modules", action="store_true", help="List the heavy modules each case loads",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help=f"Regression ratio vs baseline (default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    args = parser.parse_args()
+
+    if args.modules:
+        for name, code in CASES.items():
+            print(f"{name:<45} {', '.join(loaded_heavy_modules(code)) or '-'}")
+        print()
+
+    cases = [(name, lambda code=code: _run(code), args.repeat) for name, code in CASES.items()]
+    results = run_cases(cases)
+    return finish(results, args.baseline, save=args.save, threshold=args.threshold)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,125 @@
+"""Minimal timing harness with JSON baselines for the benchmark scripts.
+
+A benchmark is a name and a zero-argument callable. Each is run ``repeat``
+times and the best and median wall times are kept. Results can be saved as
+a baseline and later compared against it. A case slower than ``threshold``
+times its baseline counts as a regression, and the script exits non-zero.
+
+Baselines are machine-specific and not committed (baselines/ is ignored):
+save one with ``--save-baseline`` on the machine that compares against it,
+before making the change being measured. Each baseline records the
+Python version and platform it was saved on. Against a baseline from
+another environment the ratios are still printed, but no case counts as a
+regression.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+DEFAULT_THRESHOLD = 1.25
+
+# benchmarks/ sits next to the scripts it measures.
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+def measure(fn: Callable[[], object], *, repeat: int) -> dict[str, float]:
+    """Run ``fn`` ``repeat`` times; return best and median seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {"best": min(times), "median": statistics.median(times), "runs": repeat}
+
+
+def run_cases(
+    cases: list[tuple[str, Callable[[], object], int]], *, verbose: bool = True,
+) -> dict[str, dict[str, float]]:
+    """Measure ``(name, fn, repeat)`` cases in order."""
+    results = {}
+    for name, fn, repeat in cases:
+        results[name] = measure(fn, repeat=repeat)
+        if verbose:
+            r = results[name]
+            print(f"{name:<45} best {r['best'] * 1000:10.3f} ms   median {r['median'] * 1000:10.3f} ms")
+    return results
+
+
+def machine() -> dict[str, str]:
+    """The environment a baseline is valid for."""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+    }
+
+
+def save_baseline(path: Path, results: dict[str, dict[str, float]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {"machine": machine(), "results": results}
+    path.write_text(json.dumps(data, indent=2) + "\n")
+    print(f"Baseline written to {path}")
+
+
+def compare(
+    results: dict[str, dict[str, float]], baseline: dict[str, Any], *, threshold: float,
+) -> list[str]:
+    """Print best-time ratios against ``baseline``; return names of regressed cases."""
+    regressions = []
+    base_results = baseline.get("results", {})
+    print(f"\n{'case':<45} {'baseline':>12} {'now':>12} {'ratio':>8}")
+    for name, result in results.items():
+        base = base_results.get(name)
+        if base is None:
+            print(f"{name:<45} {'-':>12} {result['best'] * 1000:10.3f}ms {'new':>8}")
+            continue
+        ratio = result["best"] / base["best"] if base["best"] else float("inf")
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(
+            f"{name:<45} {base['best'] * 1000:10.3f}ms {result['best'] * 1000:10.3f}ms "
+            f"{ratio:7.2f}x{flag}"
+        )
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def finish(
+    results: dict[str, dict[str, float]],
+    baseline_path: Path,
+    *,
+    save: bool,
+    threshold: float,
+) -> int:
+    """Save or compare against the baseline. Returns the process exit code."""
+    if save:
+        save_baseline(baseline_path, results)
+        return 0
+    if not baseline_path.exists():
+        print(f"\nNo baseline at {baseline_path}; run with --save-baseline to create one.")
+        return 0
+    baseline = json.loads(baseline_path.read_text())
+    if baseline.get("machine") != machine():
+        print(f"\nWarning: {baseline_path} was saved in another environment:")
+        for key, value in machine().items():
+            print(f"  {key:<15} baseline {baseline.get('machine', {}).get(key, '?')}, now {value}")
+        print("Regressions are not checked. Run with --save-baseline to make a baseline here.")
+        compare(results, baseline, threshold=float("inf"))
+        return 0
+    regressions = compare(results, baseline, threshold=threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {threshold:.2f}x: {', '.join(regressions)}")
+        return 1
+    print("\nNo regressions.")
+    return 0
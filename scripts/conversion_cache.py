@@ -0,0 +1,115 @@
+"""On-disk cache for converted platform payloads.
+
+publish.py stores each payload a convert_to_*() function builds as a JSON
+file named by a content-addressed key (see cache_key). The key covers the
+article's title, topics and body, the converter version, the platform
+options and the article's image URLs, so a change to any of them simply
+misses. Article metadata is cached separately (see article_index.py).
+
+The directory is size-bounded: hits refresh a file's mtime and the least
+recently used files are evicted once the total exceeds the limit.
+
+Set PUBLISH_CACHE_DIR to move the cache, or PUBLISH_NO_CACHE=1 to disable it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+DEFAULT_CACHE_DIR = Path(__file__).parent / ".cache" / "convert"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def cache_key(*parts: object) -> str:
+    """Return a SHA-256 key over the given parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ConversionCache:
+    """Size-bounded LRU store of JSON values under a directory."""
+
+    def __init__(
+        self, directory: Path, *, max_bytes: int = DEFAULT_MAX_BYTES, enabled: bool = True,
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._size: int | None = None  # bytes on disk, computed on first write
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value for key, or None on a miss."""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            value = json.loads(path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError):
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store value under key, evicting least recently used entries if needed."""
+        if not self.enabled:
+            return
+        data = json.dumps(value, ensure_ascii=False, default=str).encode()
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if self._size is None:
+                self._size = sum(p.stat().st_size for p in self.directory.glob("*.json"))
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            return  # a read-only or full disk only costs the cache
+        self._size += len(data)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until under 90% of the limit."""
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort()
+        size = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 9 // 10
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            path.unlink(missing_ok=True)
+            size -= entry_size
+        self._size = size
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+        self._size = 0
+
+
+def default_cache() -> ConversionCache:
+    """Build the cache configured by PUBLISH_CACHE_DIR / PUBLISH_NO_CACHE."""
+    directory = Path(os.environ.get("PUBLISH_CACHE_DIR") or DEFAULT_CACHE_DIR)
+    enabled = os.environ.get("PUBLISH_NO_CACHE", "") not in ("1", "true", "yes")
+    return ConversionCache(directory, enabled=enabled)
@@ -0,0 +1,252 @@
+"""Long-running scheduler — publishes each schedule entry at its due time.
+
+The launchd jobs run once a day, so an entry goes out at the next run
+after its date. This process stays up instead. It keeps a queue of the
+pending Zenn and cross-post items, ordered by exact due time (see
+scheduled_publish.due_at(): the date plus ``post_time_utc``), and sleeps
+until the first one is due. Then it runs the same code as
+scheduled_publish.py for everything due at that moment. The HTTP clients,
+conversion cache and image hashes stay warm between runs.
+
+schedule.json and its journal are checked every POLL_INTERVAL seconds and
+reloaded when they change, so edits and plan_schedule.py runs are picked up
+without a restart. An item still due after a run (a failed post, an entry
+waiting for its parent) is retried after RETRY_DELAY, or as soon as the
+schedule changes.
+
+Each run starts with an empty metrics registry, so the ``publish_due.prom``
+and ``runs/*.json`` written after it describe that run only.
+
+Usage:
+    python daemon.py                 # Run until SIGINT / SIGTERM
+    python daemon.py --dry-run       # Log what would be posted, when
+    python daemon.py --check-links   # Hold back entries with broken links
+    python daemon.py --profile /tmp/prof  # Profile the whole session
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import heapq
+import json
+import signal
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import metrics
+import profiling
+import publish
+import retry
+import scheduled_publish as sp
+
+POLL_INTERVAL = 30.0  # seconds between schedule-file checks
+RETRY_DELAY = timedelta(minutes=15)
+
+logger = sp.logger
+
+
+class DueItem(NamedTuple):
+    at: datetime
+    kind: str  # "zenn" or "crosspost"
+    file: str
+
+
+def due_items(schedule: dict[str, Any]) -> list[DueItem]:
+    """One item per pending Zenn publish and per entry not yet cross-posted."""
+    items = []
+    for entry in schedule["articles"]:
+        post_time = sp._post_time(entry, schedule)
+        if entry.get("zenn_date") and entry.get("zenn_published") is False:
+            items.append(DueItem(sp.due_at(entry["zenn_date"], post_time), "zenn", entry["file"]))
+        if not sp._is_entry_done(entry):
+            items.append(DueItem(sp.due_at(entry["date"], post_time), "crosspost", entry["file"]))
+    return items
+
+
+def _stamp(path: Path) -> tuple[int, int, int] | None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+class Scheduler:
+    """The pending items of schedule.json in a heap keyed by due time."""
+
+    def __init__(
+        self,
+        *,
+        dry_run: bool = False,
+        check_links: bool = False,
+        metrics_dir: Path | None = None,
+        concurrency: int = sp.CONCURRENCY,
+        clock: Callable[[], datetime] = lambda: datetime.now(UTC),
+    ) -> None:
+        self.dry_run = dry_run
+        self.check_links = check_links
+        self.metrics_dir = metrics_dir
+        self.concurrency = concurrency
+        self.clock = clock
+        self.schedule: dict[str, Any] = {"articles": []}
+        self._queue: list[DueItem] = []
+        # Items left due by a run: not retried before this time.
+        self._held: dict[tuple[str, str], datetime] = {}
+        self._stamps: tuple[Any, ...] | None = None
+
+    def _file_stamps(self) -> tuple[Any, ...]:
+        store = sp._store()
+        return _stamp(store.path), _stamp(store.journal_path)
+
+    def reload_if_changed(self) -> bool:
+        """Reload the schedule if its files changed; False if not (or unreadable)."""
+        stamps = self._file_stamps()
+        if stamps == self._stamps:
+            return False
+        try:
+            schedule = sp._store().load()
+        except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError) as e:
+            # Mid-edit or removed: keep the last good schedule, try again later.
+            logger.error("Could not load %s: %s", sp.SCHEDULE_PATH, e)
+            return False
+        self.schedule = schedule
+        self._stamps = stamps
+        self._held.clear()
+        self._rebuild()
+        return True
+
+    def _rebuild(self) -> None:
+        self._queue = [
+            item._replace(at=max(item.at, self._held.get((item.kind, item.file), item.at)))
+            for item in due_items(self.schedule)
+        ]
+        heapq.heapify(self._queue)
+
+    def next_due(self) -> datetime | None:
+        return self._queue[0].at if self._queue else None
+
+    def pending(self) -> list[DueItem]:
+        return sorted(self._queue)
+
+    async def run_due(self) -> int:
+        """Publish everything due now; hold what is still due afterwards."""
+        now = self.clock()
+        due = [item for item in self._queue if item.at <= now]
+        logger.info(
+            "Due: %s", ", ".join(f"{item.file} ({item.kind})" for item in sorted(due)),
+        )
+        metrics.registry = metrics.Registry()  # per-run, as in a one-shot process
+        started = time.monotonic()
+        exit_code = await sp.publish_due_async(
+            self.schedule, dry_run=self.dry_run, check_links=self.check_links,
+            now=now, keep_clients=True, concurrency=self.concurrency,
+        )
+        if not self.dry_run and self.metrics_dir is not None:
+            sp.write_metrics(self.metrics_dir, started=started, exit_code=exit_code)
+
+        # The run saved the schedule; reload it, then hold whatever it left due.
+        held = dict(self._held)
+        self._stamps = None
+        self.reload_if_changed()
+        self._held = held
+        for item in self._queue:
+            if item.at <= now:
+                self._held[(item.kind, item.file)] = now + RETRY_DELAY
+        self._rebuild()
+        return exit_code
+
+    async def serve(self, stop: asyncio.Event, *, poll_interval: float = POLL_INTERVAL) -> None:
+        """Run until ``stop`` is set."""
+        try:
+            while not stop.is_set():
+                if self.reload_if_changed():
+                    self._log_next("Schedule loaded")
+                next_due = self.next_due()
+                now = self.clock()
+                if next_due is not None and next_due <= now:
+                    await self.run_due()
+                    self._log_next("Run finished")
+                    continue
+                # Wake at the due time, or sooner to look for schedule edits.
+                timeout = poll_interval
+                if next_due is not None:
+                    timeout = min(timeout, (next_due - now).total_seconds())
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout)
+                except TimeoutError:
+                    pass
+        finally:
+            await publish.aclose_clients()
+
+    def _log_next(self, event: str) -> None:
+        next_due = self.next_due()
+        if next_due is None:
+            logger.info("%s: nothing pending", event)
+            return
+        first = self._queue[0]
+        logger.info(
+            "%s: %d item(s) pending, next %s (%s) at %s",
+            event, len(self._queue), first.file, first.kind, next_due.isoformat(),
+        )
+
+
+def main() -> int:
+    sp._setup_logging()
+    parser = argparse.ArgumentParser(description="Long-running scheduled publisher")
+    parser.add_argument("--dry-run", action="store_true", help="Preview without posting")
+    parser.add_argument(
+        "--check-links", action="store_true",
+        help="Do not cross-post entries whose article has a broken link (see linkcheck.py)",
+    )
+    parser.add_argument(
+        "--retries", type=int,
+        help="Retries after a timeout or 5xx (default: PUBLISH_RETRIES or 2)",
+    )
+    parser.add_argument(
+        "--timeout", type=float,
+        help="Per-request timeout in seconds (default: PUBLISH_TIMEOUT or 30)",
+    )
+    parser.add_argument(
+        "--metrics-dir", type=Path, default=sp.METRICS_DIR,
+        help="Where to write publish_due.prom and runs/*.json after each run",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=sp.CONCURRENCY,
+        help=f"Maximum entries cross-posted at once (default: {sp.CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=POLL_INTERVAL,
+        help=f"Seconds between schedule-file checks (default: {POLL_INTERVAL:g})",
+    )
+    profiling.add_argument(parser)
+    args = parser.parse_args()
+    with profiling.profiled(args.profile, "daemon"):
+        return _run(args)
+
+
+def _run(args: argparse.Namespace) -> int:
+    retry.configure(retries=args.retries, timeout=args.timeout)
+    scheduler = Scheduler(
+        dry_run=args.dry_run, check_links=args.check_links, metrics_dir=args.metrics_dir,
+        concurrency=args.concurrency,
+    )
+
+    async def _serve() -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        logger.info("Daemon started")
+        await scheduler.serve(stop, poll_interval=args.poll_interval)
+        logger.info("Daemon stopped")
+
+    asyncio.run(_serve())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,286 @@
+"""Drift audit — do the cross-posted copies still match the local articles?
+
+Every post recorded in schedule.json is fetched: by the ``remote`` ID if
+one is recorded, else by the posted URL. Each live post is compared with
+what convert_to_*() makes of the local article now. The comparable fields
+are title, body, tags (Qiita, Dev.to) and canonical URL (Dev.to, Hashnode,
+when the entry has one). They are hashed on both sides, and only on a
+mismatch are they compared one by one to say which differ. Bodies are
+compared with line endings and trailing whitespace normalized, and tags
+without case, as the platforms rewrite both.
+
+A post's verdict is one of:
+
+- ok
+- drift: title, body or tags differ. If the local payload still hashes to
+  the one last sent (``remote.<platform>.hash``), the post was edited on
+  the platform. Otherwise the local article changed since the last sync.
+- canonical: only the canonical URL differs
+- missing: the platform answers 404 (deleted, or no longer public)
+- unknown: the post could not be fetched (auth, 5xx, timeout)
+
+Posts are fetched concurrently through the shared clients of publish.py,
+so its rate limits and retries apply. At most ``concurrency`` fetches are
+in flight.
+
+scheduled_publish.py runs this with ``--verify``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any, NamedTuple
+from urllib.parse import urlsplit
+
+import httpx
+
+import metrics
+import publish
+import retry
+from publish import Article
+from retry import IDEMPOTENT
+
+CONCURRENCY = 8
+
+OK = "ok"
+DRIFT = "drift"
+CANONICAL = "canonical"
+MISSING = "missing"
+UNKNOWN = "unknown"
+
+_POST_FIELDS = "id title url canonicalUrl content { markdown }"
+_HASHNODE_POST_QUERY = f"""\
+query GetPost($id: ID!) {{
+  post(id: $id) {{ {_POST_FIELDS} }}
+}}"""
+_HASHNODE_POST_BY_SLUG_QUERY = f"""\
+query GetPostBySlug($publicationId: ObjectId!, $slug: String!) {{
+  publication(id: $publicationId) {{
+    post(slug: $slug) {{ {_POST_FIELDS} }}
+  }}
+}}"""
+
+# Front matter Dev.to may put back in front of an API-created body.
+_DEVTO_FRONT_MATTER = re.compile(r"\A---\n.*?\n---\n", re.DOTALL)
+
+
+class Target(NamedTuple):
+    """One posted copy of a schedule entry."""
+
+    file: str
+    platform: str
+    post_id: str | int | None
+    url: str | None
+    canonical_url: str | None
+    recorded_hash: str | None  # payload hash of the last update sent
+
+
+class Verdict(NamedTuple):
+    target: Target
+    status: str  # OK, DRIFT, CANONICAL, MISSING or UNKNOWN
+    fields: tuple[str, ...] = ()  # the differing fields (DRIFT, CANONICAL)
+    error: str = ""
+    local_changed: bool = False  # local payload differs from the last one sent
+
+
+class _FetchError(Exception):
+    pass
+
+
+def targets(entry: dict[str, Any]) -> list[Target]:
+    """The posted copies of an entry: platforms with a URL or a recorded ID."""
+    found = []
+    for platform in publish.PLATFORMS:
+        if platform == "qiita" and "qiita" not in entry:
+            continue
+        value = entry.get(platform)
+        url = value if isinstance(value, str) and value.startswith("http") else None
+        record = entry.get("remote", {}).get(platform, {})
+        post_id = record.get("id")
+        if url is None and post_id is None:
+            continue
+        found.append(Target(
+            entry["file"], platform, post_id, url or record.get("url"),
+            entry.get("canonical_url"), record.get("hash"),
+        ))
+    return found
+
+
+def _normalize_body(body: str | None) -> str:
+    lines = (body or "").replace("\r\n", "\n").strip().split("\n")
+    return "\n".join(line.rstrip() for line in lines)
+
+
+def _tag_names(tags: Any) -> list[str]:
+    """Sorted lowercase names from "a, b", ["a", "b"] or [{"name": "a"}]."""
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    names = (tag.get("name", "") if isinstance(tag, dict) else str(tag) for tag in tags or ())
+    return sorted(name.strip().lower() for name in names if name.strip())
+
+
+def local_fields(
+    platform: str, article: Article, canonical_url: str | None, publication_id: str,
+) -> tuple[dict[str, Any], str]:
+    """The comparable fields of the local article, and its payload hash."""
+    if platform == "qiita":
+        payload = publish.convert_to_qiita(article)
+        fields = {"title": payload["title"], "body": payload["body"],
+                  "tags": _tag_names(payload["tags"])}
+    elif platform == "devto":
+        payload = publish.convert_to_devto(article, canonical_url=canonical_url)
+        data = payload["article"]
+        fields = {"title": data["title"], "body": data["body_markdown"],
+                  "tags": _tag_names(data["tags"])}
+        if "canonical_url" in data:
+            fields["canonical_url"] = data["canonical_url"]
+    else:
+        payload = publish.convert_to_hashnode(article, publication_id, canonical_url=canonical_url)
+        data = payload["variables"]["input"]
+        fields = {"title": data["title"], "body": data["contentMarkdown"]}
+        if "originalArticleURL" in data:
+            fields["canonical_url"] = data["originalArticleURL"]
+    fields["body"] = _normalize_body(fields["body"])
+    return fields, publish.payload_hash(payload)
+
+
+def remote_fields(platform: str, post: dict[str, Any]) -> dict[str, Any]:
+    """The comparable fields of a fetched post (same keys as local_fields)."""
+    if platform == "qiita":
+        return {"title": post.get("title"), "body": _normalize_body(post.get("body")),
+                "tags": _tag_names(post.get("tags"))}
+    if platform == "devto":
+        body = _DEVTO_FRONT_MATTER.sub("", post.get("body_markdown") or "")
+        return {"title": post.get("title"), "body": _normalize_body(body),
+                "tags": _tag_names(post.get("tags") or post.get("tag_list")),
+                "canonical_url": post.get("canonical_url")}
+    return {"title": post.get("title"),
+            "body": _normalize_body((post.get("content") or {}).get("markdown")),
+            "canonical_url": post.get("canonicalUrl")}
+
+
+def compare(local: dict[str, Any], remote: dict[str, Any]) -> tuple[str, tuple[str, ...]]:
+    """(status, differing fields) for the fields the local side has."""
+    remote = {key: remote.get(key) for key in local}
+    if publish.payload_hash(local) == publish.payload_hash(remote):
+        return OK, ()
+    differing = tuple(key for key in local if local[key] != remote[key])
+    if differing == ("canonical_url",):
+        return CANONICAL, differing
+    return DRIFT, differing
+
+
+def _json_or_missing(resp: httpx.Response) -> dict[str, Any] | None:
+    if resp.status_code == 404:
+        return None
+    if resp.status_code != 200:
+        raise _FetchError(f"{resp.status_code}: {resp.text[:200]}")
+    return resp.json()
+
+
+def _url_path(url: str | None) -> list[str]:
+    return [part for part in urlsplit(url or "").path.split("/") if part]
+
+
+@dataclass
+class Auditor:
+    """Fetches posted copies concurrently and compares them with the articles."""
+
+    qiita_token: str
+    devto_key: str
+    hashnode_token: str
+    hashnode_pub_id: str
+    concurrency: int = CONCURRENCY
+
+    async def audit(
+        self, jobs: Iterable[tuple[Target, Article]],
+    ) -> list[Verdict]:
+        """One verdict per target, in order."""
+        limit = asyncio.Semaphore(self.concurrency)
+
+        async def _one(target: Target, article: Article) -> Verdict:
+            async with limit:
+                verdict = await self.verify(target, article)
+            metrics.inc("publish_verify_total", platform=target.platform, result=verdict.status)
+            return verdict
+
+        return list(await asyncio.gather(*(_one(target, article) for target, article in jobs)))
+
+    async def verify(self, target: Target, article: Article) -> Verdict:
+        local, local_hash = local_fields(
+            target.platform, article, target.canonical_url, self.hashnode_pub_id,
+        )
+        local_changed = target.recorded_hash is not None and target.recorded_hash != local_hash
+        try:
+            post = await self.fetch(target)
+        except (_FetchError, httpx.HTTPError, ValueError) as e:
+            return Verdict(target, UNKNOWN, error=str(e) or type(e).__name__)
+        if post is None:
+            return Verdict(target, MISSING, local_changed=local_changed)
+        status, differing = compare(local, remote_fields(target.platform, post))
+        return Verdict(target, status, differing, local_changed=local_changed)
+
+    async def fetch(self, target: Target) -> dict[str, Any] | None:
+        """The live post, or None if the platform has no such post."""
+        client = publish.get_async_client(target.platform)
+        if target.platform == "qiita":
+            item_id = target.post_id or _url_path(target.url)[-1]
+            resp = await client.get(
+                f"{publish.QIITA_API_BASE}/items/{item_id}",
+                headers=publish._qiita_headers(self.qiita_token),
+                timeout=retry.policy.timeout,
+            )
+            return _json_or_missing(resp)
+        if target.platform == "devto":
+            # /articles/{id}, or /articles/{username}/{slug} from the post URL
+            path = str(target.post_id) if target.post_id is not None else "/".join(
+                _url_path(target.url)[-2:]
+            )
+            resp = await client.get(
+                f"{publish.DEVTO_API_BASE}/articles/{path}",
+                headers=publish._devto_headers(self.devto_key),
+                timeout=retry.policy.timeout,
+            )
+            return _json_or_missing(resp)
+
+        if target.post_id is not None:
+            request = {"query": _HASHNODE_POST_QUERY, "variables": {"id": target.post_id}}
+        else:
+            request = {"query": _HASHNODE_POST_BY_SLUG_QUERY, "variables": {
+                "publicationId": self.hashnode_pub_id, "slug": _url_path(target.url)[-1],
+            }}
+        resp = await client.post(
+            publish.HASHNODE_API_URL,
+            headers=publish._hashnode_headers(self.hashnode_token),
+            json=request,
+            timeout=retry.policy.timeout,
+            extensions={IDEMPOTENT: True},
+        )
+        body = _json_or_missing(resp)
+        if body is None:
+            return None
+        if body.get("errors"):
+            raise _FetchError(str(body["errors"])[:200])
+        data = body.get("data") or {}
+        if target.post_id is None:
+            data = data.get("publication") or {}
+        return data.get("post")
+
+
+def describe(verdict: Verdict) -> str:
+    """One report line for a verdict that is not OK."""
+    target = verdict.target
+    where = f"{target.file} [{target.platform}] {target.url or target.post_id}"
+    if verdict.status == UNKNOWN:
+        return f"{where}: could not fetch ({verdict.error})"
+    if verdict.status == MISSING:
+        return f"{where}: post not found"
+    if verdict.status == CANONICAL:
+        return f"{where}: canonical URL differs (expected {target.canonical_url})"
+    cause = "local article changed since last sync" if verdict.local_changed else (
+        "edited on the platform" if target.recorded_hash is not None else "no sync recorded"
+    )
+    return f"{where}: {', '.join(verdict.fields)} differ ({cause})"
@@ -0,0 +1,357 @@
+"""Local stand-in for the Qiita, Dev.to and Hashnode APIs used by publish.py.
+
+Implements the endpoints the publishers call, in memory:
+
+- Qiita:    POST /items, PATCH /items/{id}, GET /authenticated_user/items
+- Dev.to:   POST /articles, PUT /articles/{id}, GET /articles/me/{published,all}
+- Hashnode: GraphQL publishPost, updatePost (also several aliased ones in
+            one document, see hashnode_batch.py) and the publication posts query
+
+with optional latency, periodic 429s (with Retry-After), bursts of 503s and
+capped page sizes, so the scripts can be exercised and load-tested offline.
+
+Usage:
+    python fake_api.py --port 8765 --latency 0.05 --rate-limit-every 50 \\
+        --fail-rate 0.05 --burst 3 --max-per-page 20
+
+then point the scripts at it with the printed environment, e.g.:
+    QIITA_API_BASE=http://127.0.0.1:8765/qiita/api/v2 python publish.py ...
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+
+@dataclass
+class Faults:
+    latency: float = 0.0  # seconds added to every response
+    jitter: float = 0.0  # extra uniform random latency, seconds
+    rate_limit_every: int = 0  # every Nth request gets a 429 (0: never)
+    retry_after: float = 1.0  # Retry-After seconds sent with the 429
+    fail_rate: float = 0.0  # chance that a request starts a 5xx burst
+    burst: int = 1  # consecutive 503 responses per burst
+    max_per_page: int = 100  # cap on per_page / first
+    seed: int | None = None
+
+
+@dataclass
+class _State:
+    faults: Faults
+    posts: dict[str, list[dict[str, Any]]] = field(
+        default_factory=lambda: {"qiita": [], "devto": [], "hashnode": []},
+    )
+    request_count: int = 0
+    burst_left: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    rng: random.Random = field(default_factory=random.Random)
+
+
+class FakeAPIServer:
+    """Threaded fake API server; use as a context manager or start()/stop()."""
+
+    def __init__(
+        self, host: str = "127.0.0.1", port: int = 0, faults: Faults | None = None,
+    ) -> None:
+        self.state = _State(faults or Faults())
+        self.state.rng.seed(self.state.faults.seed)
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.state = self.state  # type: ignore[attr-defined]
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> dict[str, str]:
+        """Environment variables pointing publish.py at this server."""
+        return {
+            "QIITA_API_BASE": f"{self.url}/qiita/api/v2",
+            "DEVTO_API_BASE": f"{self.url}/devto/api",
+            "HASHNODE_API_URL": f"{self.url}/hashnode",
+        }
+
+    def posts(self, platform: str) -> list[dict[str, Any]]:
+        with self.state.lock:
+            return [dict(post) for post in self.state.posts[platform]]
+
+    @property
+    def request_count(self) -> int:
+        return self.state.request_count
+
+    def start(self) -> FakeAPIServer:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> FakeAPIServer:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+
+# ---------------------------------------------------------------------------
+# Request handling
+# ---------------------------------------------------------------------------
+
+_QIITA_ITEM = re.compile(r"^/qiita/api/v2/items/([^/]+)$")
+_DEVTO_ARTICLE = re.compile(r"^/devto/api/articles/(\d+)$")
+# "op0: updatePost(input: $i0)" — an aliased mutation field of a batch
+_GRAPHQL_ALIAS = re.compile(r"(\w+):\s*(publishPost|updatePost)\(input:\s*\$(\w+)\)")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._dispatch()
+
+    def do_POST(self) -> None:
+        self._dispatch()
+
+    def do_PUT(self) -> None:
+        self._dispatch()
+
+    def do_PATCH(self) -> None:
+        self._dispatch()
+
+    # -- plumbing ----------------------------------------------------------
+
+    @property
+    def state(self) -> _State:
+        return self.server.state  # type: ignore[attr-defined]
+
+    def _send(self, status: int, body: Any = None, headers: dict[str, str] | None = None) -> None:
+        data = b"" if body is None else json.dumps(body, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _fault(self) -> tuple[int, dict[str, str]] | None:
+        """Decide (under the lock) whether this request fails, and how."""
+        faults = self.state.faults
+        with self.state.lock:
+            self.state.request_count += 1
+            count = self.state.request_count
+            if faults.rate_limit_every and count % faults.rate_limit_every == 0:
+                return 429, {
+                    "Retry-After": f"{faults.retry_after:g}",
+                    "X-RateLimit-Remaining": "0",
+                    "X-RateLimit-Reset": f"{faults.retry_after:g}",
+                }
+            if self.state.burst_left == 0 and self.state.rng.random() < faults.fail_rate:
+                self.state.burst_left = faults.burst
+            if self.state.burst_left:
+                self.state.burst_left -= 1
+                return 503, {}
+            delay = faults.latency + self.state.rng.uniform(0, faults.jitter)
+        if delay:
+            time.sleep(delay)
+        return None
+
+    def _dispatch(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        fault = self._fault()
+        if fault is not None:
+            status, headers = fault
+            self._send(status, {"message": "injected fault"}, headers)
+            return
+        if not (self.headers.get("Authorization") or self.headers.get("api-key")):
+            self._send(401, {"message": "Unauthorized"})
+            return
+        parts = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        body = json.loads(raw) if raw else {}
+        try:
+            status, payload = self._route(self.command, parts.path.rstrip("/"), query, body)
+        except (KeyError, TypeError, ValueError) as e:
+            status, payload = 400, {"message": f"bad request: {e}"}
+        self._send(status, payload)
+
+    def _route(
+        self, method: str, path: str, query: dict[str, str], body: dict[str, Any],
+    ) -> tuple[int, Any]:
+        if path == "/hashnode" and method == "POST":
+            return 200, self._graphql(body)
+        if path == "/qiita/api/v2/items" and method == "POST":
+            return 201, self._create("qiita", body["title"], {"body": body.get("body")})
+        if path == "/qiita/api/v2/authenticated_user/items" and method == "GET":
+            return 200, self._page("qiita", query, "per_page", 20)
+        if (m := _QIITA_ITEM.match(path)) and method == "PATCH":
+            return self._update("qiita", m.group(1), body.get("title"))
+        if path == "/devto/api/articles" and method == "POST":
+            article = body["article"]
+            return 201, self._create("devto", article["title"], {
+                "published": article.get("published", False),
+            })
+        if path in ("/devto/api/articles/me/published", "/devto/api/articles/me/all"):
+            published_only = path.endswith("published")
+            return 200, self._page("devto", query, "per_page", 30, published_only=published_only)
+        if (m := _DEVTO_ARTICLE.match(path)) and method == "PUT":
+            return self._update("devto", int(m.group(1)), body.get("article", {}).get("title"))
+        return 404, {"message": "Not Found"}
+
+    # -- resources ---------------------------------------------------------
+
+    def _create(self, platform: str, title: str, extra: dict[str, Any]) -> dict[str, Any]:
+        with self.state.lock:
+            posts = self.state.posts[platform]
+            if platform == "devto":
+                post_id: str | int = len(posts) + 1
+            else:
+                post_id = uuid.uuid4().hex[:20]
+            post = {
+                "id": post_id,
+                "title": title,
+                "url": f"https://{platform}.example/{post_id}",
+                **extra,
+            }
+            posts.insert(0, post)  # listings are newest first
+            return dict(post)
+
+    def _update(self, platform: str, post_id: str | int, title: str | None) -> tuple[int, Any]:
+        with self.state.lock:
+            for post in self.state.posts[platform]:
+                if post["id"] == post_id:
+                    if title:
+                        post["title"] = title
+                    return 200, dict(post)
+        return 404, {"message": "Not Found"}
+
+    def _page(
+        self,
+        platform: str,
+        query: dict[str, str],
+        size_key: str,
+        default_size: int,
+        *,
+        published_only: bool = False,
+    ) -> list[dict[str, Any]]:
+        page = max(1, int(query.get("page", 1)))
+        size = min(int(query.get(size_key, default_size)), self.state.faults.max_per_page)
+        with self.state.lock:
+            posts = [
+                dict(p) for p in self.state.posts[platform]
+                if not published_only or p.get("published")
+            ]
+        return posts[(page - 1) * size:page * size]
+
+    def _graphql(self, body: dict[str, Any]) -> dict[str, Any]:
+        query = body.get("query", "")
+        variables = body.get("variables", {})
+        if aliases := _GRAPHQL_ALIAS.findall(query):
+            return self._graphql_batch(aliases, variables)
+        if "publishPost" in query:
+            post = self._create("hashnode", variables["input"]["title"], {})
+            return {"data": {"publishPost": {"post": {**post, "slug": post["id"]}}}}
+        if "updatePost" in query:
+            status, post = self._update(
+                "hashnode", variables["input"]["id"], variables["input"].get("title"),
+            )
+            if status != 200:
+                return {"errors": [{"message": "Post not found"}]}
+            return {"data": {"updatePost": {"post": {**post, "slug": post["id"]}}}}
+        if "posts(" in query:
+            first = min(int(variables.get("first", 20)), self.state.faults.max_per_page)
+            start = int(variables.get("after") or 0)
+            with self.state.lock:
+                posts = [dict(p) for p in self.state.posts["hashnode"]]
+            window = posts[start:start + first]
+            end = start + len(window)
+            return {"data": {"publication": {"posts": {
+                "edges": [{"node": post} for post in window],
+                "pageInfo": {"hasNextPage": end < len(posts), "endCursor": str(end)},
+            }}}}
+        return {"errors": [{"message": "Unsupported query"}]}
+
+    def _graphql_batch(
+        self, aliases: list[tuple[str, str, str]], variables: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Aliased mutations; a failing one is null with an error pathed to it."""
+        data: dict[str, Any] = {}
+        errors: list[dict[str, Any]] = []
+        for alias, mutation, variable in aliases:
+            post_input = variables[variable]
+            if mutation == "publishPost":
+                post: dict[str, Any] | None = self._create("hashnode", post_input["title"], {})
+            else:
+                status, post = self._update("hashnode", post_input["id"], post_input.get("title"))
+                if status != 200:
+                    post = None
+            if post is None:
+                data[alias] = None
+                errors.append({"message": "Post not found", "path": [alias]})
+            else:
+                data[alias] = {"post": {**post, "slug": post["id"]}}
+        return {"data": data, "errors": errors} if errors else {"data": data}
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Local fake Qiita/Dev.to/Hashnode API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency")
+    parser.add_argument(
+        "--rate-limit-every", type=int, default=0, help="Answer every Nth request with 429",
+    )
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds")
+    parser.add_argument(
+        "--fail-rate", type=float, default=0.0, help="Chance a request starts a 503 burst",
+    )
+    parser.add_argument("--burst", type=int, default=1, help="503 responses per burst")
+    parser.add_argument("--max-per-page", type=int, default=100, help="Page size cap")
+    parser.add_argument("--seed", type=int, help="Seed for latency jitter and faults")
+    args = parser.parse_args()
+
+    faults = Faults(
+        latency=args.latency, jitter=args.jitter,
+        rate_limit_every=args.rate_limit_every, retry_after=args.retry_after,
+        fail_rate=args.fail_rate, burst=args.burst,
+        max_per_page=args.max_per_page, seed=args.seed,
+    )
+    server = FakeAPIServer(args.host, args.port, faults)
+    for name, value in server.env().items():
+        print(f"export {name}={value}")
+    print(f"Serving on {server.url} (Ctrl-C to stop)", flush=True)
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
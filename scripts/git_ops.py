@@ -0,0 +1,89 @@
+"""Batched git commit + push for the Zenn publishing scripts.
+
+The files of all articles due in a run are staged with one ``git add`` and
+committed once, and the result is pushed once. A push rejected because the
+remote moved on (another machine published, or an edit was pushed from the
+web UI) is followed by ``git pull --rebase --autostash`` and another push,
+up to PUSH_ATTEMPTS times. The autostash matters: the publish scripts leave
+schedule.json and its journal modified, and git refuses to rebase a dirty
+working tree.
+
+Everything goes through the git CLI via subprocess, with no git library,
+because zenn_publish.py imports this module outside the venv.
+"""
+
+from __future__ import annotations
+
+import subprocess
+from collections.abc import Sequence
+from pathlib import Path
+
+PUSH_ATTEMPTS = 3
+PUSH_TIMEOUT = 60
+
+_REJECTED_MARKERS = ("[rejected]", "non-fast-forward", "fetch first", "[remote rejected]")
+
+
+class GitError(RuntimeError):
+    """A git command failed; the message carries git's stderr."""
+
+
+def _git(
+    repo: Path, *args: str, check: bool = True, timeout: float | None = None,
+) -> subprocess.CompletedProcess[str]:
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(repo), *args],
+            capture_output=True, text=True, timeout=timeout,
+        )
+    except subprocess.TimeoutExpired as e:
+        raise GitError(f"git {args[0]} timed out after {timeout}s") from e
+    if check and result.returncode != 0:
+        raise GitError(f"git {args[0]}: {(result.stderr or result.stdout).strip()}")
+    return result
+
+
+def _has_staged_changes(repo: Path) -> bool:
+    return _git(repo, "diff", "--cached", "--quiet", check=False).returncode != 0
+
+
+def _is_rejected(result: subprocess.CompletedProcess[str]) -> bool:
+    return any(marker in result.stderr for marker in _REJECTED_MARKERS)
+
+
+def commit_and_push(
+    repo: Path,
+    paths: Sequence[str],
+    message: str,
+    *,
+    remote: str | None = None,
+    branch: str | None = None,
+    attempts: int = PUSH_ATTEMPTS,
+) -> bool:
+    """Commit ``paths`` in one commit and push. Returns True if a commit was made.
+
+    Pushes even when there is nothing new to commit, so commits left behind
+    by an earlier failed push reach the remote too. Raises GitError if the
+    commits could not be pushed; a failed rebase is aborted first.
+    """
+    committed = False
+    if paths:
+        _git(repo, "add", "--", *paths)
+        if _has_staged_changes(repo):
+            _git(repo, "commit", "-m", message)
+            committed = True
+
+    target = [remote, branch] if remote and branch else [remote] if remote else []
+    for attempt in range(1, attempts + 1):
+        result = _git(repo, "push", *target, check=False, timeout=PUSH_TIMEOUT)
+        if result.returncode == 0:
+            return committed
+        if not _is_rejected(result) or attempt == attempts:
+            raise GitError(f"git push: {result.stderr.strip()}")
+        rebase = _git(
+            repo, "pull", "--rebase", "--autostash", *target, check=False, timeout=PUSH_TIMEOUT,
+        )
+        if rebase.returncode != 0:
+            _git(repo, "rebase", "--abort", check=False)
+            raise GitError(f"git pull --rebase: {rebase.stderr.strip()}")
+    raise AssertionError("unreachable")
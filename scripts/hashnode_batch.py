@@ -0,0 +1,270 @@
+"""Batched Hashnode GraphQL requests.
+
+Several publishPost / updatePost mutations go out as one request, each as an
+aliased field of one document:
+
+    mutation Batch($i0: UpdatePostInput!, $i1: UpdatePostInput!) {
+      op0: updatePost(input: $i0) { post { id slug title url } }
+      op1: updatePost(input: $i1) { post { id slug title url } }
+    }
+
+GraphQL reports a field's errors with a ``path`` that starts at its alias, so
+each error is mapped back to its operation and the others still succeed. An
+error without a path (bad document, auth) fails every operation in the
+batch. A batch holds at most MAX_OPS operations and about MAX_BYTES of
+variables; larger sets are split. Updates and creates are never mixed: an
+all-update batch is retried like any idempotent request, while creates keep
+the landed-post check of publish._guarded_create_async().
+
+Title lookups are shared the same way: one scan of the publication's posts
+answers every title asked for in the meantime.
+
+HashnodeBatcher collects the calls concurrent coroutines make within WINDOW
+seconds (or until a batch is full) and sends them together. Callers await
+their own result as with the unbatched functions in publish.py.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+import metrics
+import publish
+import retry
+from publish import Article, PublishResult
+from retry import IDEMPOTENT
+
+MAX_OPS = 10
+MAX_BYTES = 512 * 1024  # of JSON variables; a larger single op goes alone
+WINDOW = 0.02  # seconds to wait for more calls before sending
+
+_SELECTION = "{ post { id slug title url } }"
+_INPUT_TYPES = {"publishPost": "PublishPostInput", "updatePost": "UpdatePostInput"}
+
+
+@dataclass(frozen=True)
+class Op:
+    """One mutation: ``mutation`` is publishPost or updatePost."""
+
+    mutation: str
+    input: dict[str, Any]
+
+    def size(self) -> int:
+        return len(json.dumps(self.input, ensure_ascii=False).encode())
+
+
+def publish_op(payload: dict) -> Op:
+    """The publishPost of a convert_to_hashnode() payload."""
+    return Op("publishPost", payload["variables"]["input"])
+
+
+def update_op(post_id: str, article: Article) -> Op:
+    payload = publish._hashnode_update_payload(post_id, article)
+    return Op("updatePost", payload["variables"]["input"])
+
+
+def build_request(ops: list[Op]) -> dict:
+    """One GraphQL request body running ``ops`` as aliases op0, op1, ..."""
+    definitions = ", ".join(f"$i{i}: {_INPUT_TYPES[op.mutation]}!" for i, op in enumerate(ops))
+    fields = "\n".join(
+        f"  op{i}: {op.mutation}(input: $i{i}) {_SELECTION}" for i, op in enumerate(ops)
+    )
+    return {
+        "query": f"mutation Batch({definitions}) {{\n{fields}\n}}",
+        "variables": {f"i{i}": op.input for i, op in enumerate(ops)},
+    }
+
+
+def _alias_index(error: dict, count: int) -> int | None:
+    path = error.get("path") or ()
+    alias = path[0] if path else None
+    if isinstance(alias, str) and alias.startswith("op") and alias[2:].isdigit():
+        index = int(alias[2:])
+        if index < count:
+            return index
+    return None
+
+
+def parse_response(resp: httpx.Response, count: int) -> list[PublishResult]:
+    """One PublishResult per operation of a build_request() batch."""
+    if resp.status_code != 200:
+        failure = PublishResult("hashnode", False, None, f"{resp.status_code}: {resp.text}")
+        return [failure] * count
+    body = resp.json()
+    shared: list[dict] = []
+    own: dict[int, list[dict]] = {}
+    for error in body.get("errors") or ():
+        index = _alias_index(error, count)
+        if index is None:
+            shared.append(error)
+        else:
+            own.setdefault(index, []).append(error)
+
+    data = body.get("data") or {}
+    results = []
+    for i in range(count):
+        post = (data.get(f"op{i}") or {}).get("post")
+        errors = own.get(i) or ([] if post else shared)
+        if errors or not post:
+            error = json.dumps(errors or [{"message": "no data returned"}])
+            not_found = not errors or publish.hashnode_not_found(errors)
+            results.append(PublishResult("hashnode", False, None, error, not_found=not_found))
+        else:
+            results.append(PublishResult("hashnode", True, post.get("url"), None, post.get("id")))
+    return results
+
+
+def split(ops: list[Op], *, max_ops: int = MAX_OPS, max_bytes: int = MAX_BYTES) -> list[list[Op]]:
+    """Consecutive batches of at most ``max_ops`` ops and about ``max_bytes``."""
+    batches: list[list[Op]] = []
+    current: list[Op] = []
+    size = 0
+    for op in ops:
+        op_size = op.size()
+        if current and (len(current) >= max_ops or size + op_size > max_bytes):
+            batches.append(current)
+            current, size = [], 0
+        current.append(op)
+        size += op_size
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def send_batch(ops: list[Op], token: str) -> list[PublishResult]:
+    """Send ``ops`` in one request; transport errors propagate."""
+    idempotent = all(op.mutation == "updatePost" for op in ops)
+    resp = await publish.get_async_client("hashnode").post(
+        publish.HASHNODE_API_URL,
+        headers=publish._hashnode_headers(token),
+        json=build_request(ops),
+        timeout=retry.policy.timeout,
+        extensions={IDEMPOTENT: True} if idempotent else None,
+    )
+    return parse_response(resp, len(ops))
+
+
+@dataclass
+class HashnodeBatcher:
+    """Coalesces concurrent Hashnode calls into batched requests.
+
+    Create one per event loop; its methods mirror the async publishers in
+    publish.py.
+    """
+
+    token: str
+    publication_id: str
+    window: float = WINDOW
+    max_ops: int = MAX_OPS
+    max_bytes: int = MAX_BYTES
+    _ops: dict[str, list[tuple[Op, asyncio.Future[PublishResult]]]] = field(
+        default_factory=dict, init=False,
+    )
+    _titles: dict[str, list[asyncio.Future[str | None]]] = field(
+        default_factory=dict, init=False,
+    )
+    _timer: asyncio.Task[None] | None = field(default=None, init=False)
+    _tasks: set[asyncio.Task[None]] = field(default_factory=set, init=False)
+
+    async def publish(self, payload: dict) -> PublishResult:
+        """Batched publish_to_hashnode_async (same resend safeguards)."""
+        return await publish._guarded_create_async(
+            "hashnode", payload, self.token, lambda: self._submit(publish_op(payload)),
+        )
+
+    async def update(self, post_id: str, article: Article) -> PublishResult:
+        """Batched update_on_hashnode_async."""
+        return await self._submit(update_op(post_id, article))
+
+    async def find(self, title: str) -> str | None:
+        """Batched find_hashnode_post_by_title_async."""
+        future: asyncio.Future[str | None] = asyncio.get_running_loop().create_future()
+        self._titles.setdefault(title, []).append(future)
+        self._schedule()
+        return await future
+
+    async def _submit(self, op: Op) -> PublishResult:
+        future: asyncio.Future[PublishResult] = asyncio.get_running_loop().create_future()
+        queue = self._ops.setdefault(op.mutation, [])
+        queue.append((op, future))
+        if len(queue) >= self.max_ops:
+            self._start(self._send(self._ops.pop(op.mutation)))
+        else:
+            self._schedule()
+        return await future
+
+    def _schedule(self) -> None:
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later())
+
+    def _start(self, coro: Any) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.window)
+        ops, self._ops = self._ops, {}
+        titles, self._titles = self._titles, {}
+        self._timer = None  # calls made from here on start the next batch
+        jobs = [self._send(queue) for queue in ops.values()]
+        if titles:
+            jobs.append(self._scan(titles))
+        await asyncio.gather(*jobs)
+
+    async def _send(self, queue: list[tuple[Op, asyncio.Future[PublishResult]]]) -> None:
+        offset = 0
+        for batch in split([op for op, _ in queue], max_ops=self.max_ops, max_bytes=self.max_bytes):
+            waiting = [future for _, future in queue[offset:offset + len(batch)]]
+            offset += len(batch)
+            try:
+                results = await send_batch(batch, self.token)
+            except Exception as e:  # raised to each caller instead
+                for future in waiting:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for future, result in zip(waiting, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def _scan(self, titles: dict[str, list[asyncio.Future[str | None]]]) -> None:
+        """One listing scan for every waiting title (max 3 pages, as unbatched)."""
+        found: dict[str, str] = {}
+        after: str | None = None
+        try:
+            for _ in range(3):
+                resp = await publish.get_async_client("hashnode").post(
+                    publish.HASHNODE_API_URL,
+                    headers=publish._hashnode_headers(self.token),
+                    json=publish._hashnode_posts_request(self.publication_id, after),
+                    timeout=retry.policy.timeout,
+                    extensions={IDEMPOTENT: True},
+                )
+                metrics.inc("publish_find_pages_total", platform="hashnode")
+                posts_data = publish._hashnode_posts_page(resp)
+                if posts_data is None:
+                    break
+                for edge in posts_data.get("edges", []):
+                    node = edge.get("node", {})
+                    if node.get("title") in titles:
+                        found.setdefault(node["title"], node["id"])
+                page_info = posts_data.get("pageInfo", {})
+                if len(found) == len(titles) or not page_info.get("hasNextPage"):
+                    break
+                after = page_info.get("endCursor")
+        except Exception as e:  # raised to each caller instead
+            for futures in titles.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        for title, futures in titles.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(found.get(title))
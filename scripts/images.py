@@ -0,0 +1,279 @@
+"""Image stage for cross-posts: optimized derivatives with content-hashed names.
+
+Cross-posted articles cannot use Zenn's ``/images/<name>`` paths, so
+publish.py points them at GitHub raw. Instead of the original on ``main``
+(a mutable URL, served at full size), a reference resolves to a derivative
+``images/derived/<stem>.<hash><suffix>``, where ``<hash>`` is the SHA-256
+of the source image. The bytes behind such a URL never change, and an edited
+image gets a new name.
+
+Derivatives are made by ``python images.py build``. With Pillow installed,
+images wider than MAX_WIDTH are downscaled and PNG/JPEG are re-encoded,
+keeping the original bytes if that is not smaller. Without Pillow the
+source is copied. Commit and push the derivatives: a reference uses one
+only once it is in PUBLISHED_REF (the last fetched or pushed ``main``), and
+until then falls back to the original's ``main`` URL, so a cross-post never
+links to a file the remote does not have.
+
+``python images.py audit`` lists referenced-but-missing and unused images
+in one pass over the article index (see article_index.py).
+
+Usage:
+    python images.py audit   # exit 1 if an article references a missing image
+    python images.py build   # create derivatives for referenced images
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from article_index import ArticleIndex
+
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent
+IMAGES_DIR = REPO_ROOT / "images"
+DERIVED = "derived"  # subdirectory of IMAGES_DIR
+DEFAULT_HASH_INDEX = SCRIPT_DIR / ".cache" / "image-hashes.json"
+GITHUB_RAW_BASE = "https://raw.githubusercontent.com/shimo4228/zenn-content/main/images"
+PUBLISHED_REF = "origin/main"  # the branch GITHUB_RAW_BASE serves
+
+MAX_WIDTH = 1600  # px; twice the content width of the target platforms
+HASH_LENGTH = 12
+JPEG_QUALITY = 85
+
+IMAGE_SUFFIXES = frozenset({".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg"})
+
+
+class Audit(NamedTuple):
+    missing: dict[str, list[str]]  # image name -> articles referencing it
+    unused: list[str]  # images no article references
+
+
+class ImageStore:
+    """Source images, their content hashes and derivative URLs.
+
+    Hashes are cached by file mtime and size; with ``index_path`` set the
+    cache is kept on disk across runs (see save()).
+    """
+
+    def __init__(
+        self,
+        images_dir: Path = IMAGES_DIR,
+        *,
+        raw_base: str = GITHUB_RAW_BASE,
+        index_path: Path | None = None,
+    ) -> None:
+        self.images_dir = images_dir
+        self.raw_base = raw_base
+        self.index_path = index_path
+        self._hashes: dict[str, dict[str, Any]] = self._load()
+        self._dirty = False
+        self._pushed: frozenset[str] | None = None
+        self._pushed_loaded = False
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if self.index_path is None:
+            return {}
+        try:
+            return json.loads(self.index_path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError):
+            return {}
+
+    def save(self) -> None:
+        """Write the hash cache if anything changed (temp file + rename)."""
+        if self.index_path is None or not self._dirty:
+            return
+        try:
+            _atomic_write(self.index_path, json.dumps(self._hashes).encode())
+        except OSError:
+            return  # a read-only disk only costs the cache
+        self._dirty = False
+
+    def digest(self, name: str) -> str | None:
+        """SHA-256 of ``images/<name>``, or None if there is no such file."""
+        path = self.images_dir / name
+        try:
+            stat = path.stat()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        cached = self._hashes.get(name)
+        if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+            return cached["sha256"]
+        sha256 = hashlib.sha256(path.read_bytes()).hexdigest()
+        self._hashes[name] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": sha256}
+        self._dirty = True
+        return sha256
+
+    def derived_name(self, name: str) -> str | None:
+        """``derived/<stem>.<hash><suffix>`` for a source image, or None if it is missing."""
+        sha256 = self.digest(name)
+        if sha256 is None:
+            return None
+        source = Path(name)
+        return (Path(DERIVED) / source.parent / f"{source.stem}.{sha256[:HASH_LENGTH]}{source.suffix}").as_posix()
+
+    def _is_published(self, derived: str) -> bool:
+        """Whether the derivative is pushed (or, outside a git checkout, it exists)."""
+        if not self._pushed_loaded:
+            self._pushed = _git_pushed(self.images_dir, DERIVED)
+            self._pushed_loaded = True
+        if self._pushed is None:
+            return (self.images_dir / derived).is_file()
+        return derived in self._pushed
+
+    def url(self, name: str) -> str:
+        """Cross-post URL for ``/images/<name>``: the derivative once published."""
+        derived = self.derived_name(name)
+        if derived is not None and self._is_published(derived):
+            return f"{self.raw_base}/{derived}"
+        return f"{self.raw_base}/{name}"
+
+    def sources(self) -> list[str]:
+        """Names of all source images (derivatives excluded)."""
+        return sorted(
+            path.relative_to(self.images_dir).as_posix()
+            for path in self.images_dir.rglob("*")
+            if path.suffix.lower() in IMAGE_SUFFIXES
+            and path.is_file()
+            and path.relative_to(self.images_dir).parts[0] != DERIVED
+        )
+
+    def build(self, names: list[str], *, max_width: int = MAX_WIDTH) -> list[Path]:
+        """Create the missing derivatives of ``names``; return the paths created."""
+        created = []
+        for name in names:
+            derived = self.derived_name(name)
+            if derived is None:
+                continue
+            dest = self.images_dir / derived
+            if dest.exists():
+                continue
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            _atomic_write(dest, optimize(self.images_dir / name, max_width=max_width))
+            created.append(dest)
+        return created
+
+
+def optimize(path: Path, *, max_width: int = MAX_WIDTH) -> bytes:
+    """Downscaled, re-encoded bytes of an image; the original if not smaller.
+
+    Needs Pillow for anything but a copy.
+    """
+    original = path.read_bytes()
+    try:
+        from PIL import Image
+    except ImportError:
+        return original
+    import io
+
+    with Image.open(io.BytesIO(original)) as image:
+        if image.format not in ("PNG", "JPEG"):
+            return original
+        fmt = image.format
+        if image.width > max_width:
+            height = round(image.height * max_width / image.width)
+            image = image.resize((max_width, height), Image.LANCZOS)
+        out = io.BytesIO()
+        if fmt == "PNG":
+            image.save(out, "PNG", optimize=True)
+        else:
+            image.save(out, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    optimized = out.getvalue()
+    return optimized if len(optimized) < len(original) else original
+
+
+def references(articles: list[Path], index: ArticleIndex) -> dict[str, list[str]]:
+    """Image name -> articles (repo-relative) referencing it, in first-use order."""
+    refs: dict[str, list[str]] = {}
+    for path in articles:
+        meta = index.get(path)
+        if meta is None:
+            continue
+        for name in meta.images:
+            refs.setdefault(name, []).append(path.relative_to(REPO_ROOT).as_posix())
+    return refs
+
+
+def audit(refs: dict[str, list[str]], store: ImageStore) -> Audit:
+    """Referenced-but-missing and unused images."""
+    missing = {name: articles for name, articles in refs.items() if store.digest(name) is None}
+    unused = [name for name in store.sources() if name not in refs]
+    return Audit(missing, unused)
+
+
+def _git_pushed(repo_dir: Path, subdir: str) -> frozenset[str] | None:
+    """Paths under ``subdir`` (relative to ``repo_dir``) in PUBLISHED_REF.
+
+    None outside a git checkout (or without git). Empty if the checkout has
+    no PUBLISHED_REF, e.g. before its first fetch.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(repo_dir), "ls-tree", "-r", "-z", "--name-only",
+             PUBLISHED_REF, "--", subdir],
+            capture_output=True, text=True, timeout=30,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None if "not a git repository" in result.stderr else frozenset()
+    return frozenset(p for p in result.stdout.split("\0") if p)
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _corpus() -> list[Path]:
+    return sorted(REPO_ROOT.glob("articles/*.md")) + sorted(REPO_ROOT.glob("articles-en/*.md"))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Cross-post image derivatives and audit")
+    parser.add_argument("command", choices=("audit", "build"))
+    parser.add_argument(
+        "--max-width", type=int, default=MAX_WIDTH,
+        help=f"Downscale wider images (default: {MAX_WIDTH}px; needs Pillow)",
+    )
+    args = parser.parse_args()
+
+    store = ImageStore(index_path=DEFAULT_HASH_INDEX)
+    index = ArticleIndex()
+    refs = references(_corpus(), index)
+    index.save()
+    result = audit(refs, store)
+
+    for name, articles in sorted(result.missing.items()):
+        print(f"MISSING  {name}  (referenced by {', '.join(articles)})")
+    for name in result.unused:
+        print(f"UNUSED   {name}")
+
+    if args.command == "build":
+        created = store.build([name for name in refs if name not in result.missing],
+                              max_width=args.max_width)
+        for path in created:
+            print(f"CREATED  {path.relative_to(REPO_ROOT)}")
+        if created:
+            print("Commit the new derivatives; cross-posts use them once git tracks them.")
+    store.save()
+    return 1 if result.missing else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
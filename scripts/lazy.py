@@ -0,0 +1,34 @@
+"""Deferred imports for the command-line scripts.
+
+``--status``, dry runs and plan_schedule.py are started from shell hooks and
+launchd, so their startup time matters. Heavy modules (httpx, asyncio, yaml,
+the publisher itself) are bound with lazy_import(): the name exists at once,
+and the module is executed on first attribute access. Import them normally
+under ``if TYPE_CHECKING:`` so type checkers still see the real module.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return module ``name``, executing it on first attribute access.
+
+    A module that is missing raises ImportError here, as ``import`` would;
+    an error while executing it is raised on first use.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,293 @@
+"""Dead-link checker for the article corpus.
+
+Extracts every http(s) URL from the article bodies as they are cross-posted
+(``/images/...`` already rewritten to GitHub raw, see publish.py) and checks
+them concurrently: at most ``concurrency`` requests in flight, and at most
+``per_host`` to any one host. Each URL gets a HEAD request, then a GET if
+the server refuses or fails HEAD. Only status codes are looked at; GET
+bodies are not downloaded.
+
+Results are cached in ``.cache/link-results.json``: working links for
+OK_TTL, broken ones for BROKEN_TTL, so a fixed link is noticed soon.
+A 429, a 5xx or a timeout is reported as neither and is not cached. URLs matching the
+``no-dead-link`` ignore list in ``.textlintrc.json`` are skipped, as are
+localhost and example hosts.
+
+scheduled_publish.py runs this as a pre-publish gate with ``--check-links``:
+a due entry with a broken link is not cross-posted.
+
+Usage:
+    python linkcheck.py                        # Check all articles
+    python linkcheck.py articles/foo.md        # Check some
+    python linkcheck.py --refresh              # Ignore cached results
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import fnmatch
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, NamedTuple
+from urllib.parse import urlsplit
+
+import httpx
+
+import metrics
+from publish import _strip_zenn_syntax, parse_zenn_article
+from retry import AsyncRetryTransport
+
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent
+DEFAULT_CACHE_PATH = SCRIPT_DIR / ".cache" / "link-results.json"
+TEXTLINT_CONFIG = REPO_ROOT / ".textlintrc.json"
+
+CACHE_VERSION = 1
+OK_TTL = 7 * 24 * 3600.0
+BROKEN_TTL = 3600.0
+
+CONCURRENCY = 16
+PER_HOST = 2
+TIMEOUT = 10.0
+USER_AGENT = "zenn-content-linkcheck/1.0"
+
+# Servers that reject or mishandle HEAD; retried with GET.
+_GET_FALLBACK = frozenset({403, 404, 405, 406, 500, 501, 502, 503})
+# Says nothing about the link; reported as unknown and not cached.
+_INCONCLUSIVE = frozenset({429, 500, 502, 503, 504})
+
+_SKIP_HOSTS = frozenset({"localhost", "127.0.0.1", "example.com", "example.org", "example.net"})
+
+_FENCE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+_INLINE_CODE_RE = re.compile(r"`[^`\n]*`")
+_URL_RE = re.compile(r"https?://[^\s<>()\[\]{}\"'`]+")
+_TRAILING = ".,;:!?*_"
+
+
+class LinkResult(NamedTuple):
+    url: str
+    ok: bool | None  # None: inconclusive (rate limited, server error, timeout)
+    status: int | None  # None: no response (DNS, TLS, timeout)
+    error: str = ""
+    cached: bool = False
+
+
+def extract_urls(body: str) -> list[str]:
+    """http(s) URLs in a Markdown body, unique in order; code is skipped."""
+    urls: dict[str, None] = {}
+    fence: str | None = None
+    for line in body.splitlines():
+        if fence is not None:
+            stripped = line.strip()
+            if stripped.startswith(fence) and not stripped.lstrip(fence[0]):
+                fence = None
+            continue
+        fence_match = _FENCE_RE.match(line)
+        if fence_match:
+            fence = fence_match.group(1)
+            continue
+        for match in _URL_RE.finditer(_INLINE_CODE_RE.sub("", line)):
+            urls[match.group().rstrip(_TRAILING)] = None
+    return list(urls)
+
+
+def article_urls(path: Path) -> list[str]:
+    """URLs of an article as cross-posted (Zenn image paths rewritten)."""
+    return extract_urls(_strip_zenn_syntax(parse_zenn_article(path).body))
+
+
+def load_ignore_patterns(config: Path = TEXTLINT_CONFIG) -> tuple[str, ...]:
+    """The ``no-dead-link`` ignore globs from the textlint config, if any."""
+    try:
+        data = json.loads(config.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return ()
+    return tuple(data.get("rules", {}).get("no-dead-link", {}).get("ignore", ()))
+
+
+def is_ignored(url: str, patterns: Iterable[str]) -> bool:
+    host = urlsplit(url).hostname or ""
+    if host in _SKIP_HOSTS or host.endswith(".example"):
+        return True
+    return any(fnmatch.fnmatchcase(url, pattern) for pattern in patterns)
+
+
+class ResultCache:
+    """Link results by URL, valid for OK_TTL / BROKEN_TTL after the check."""
+
+    def __init__(self, path: Path | None = DEFAULT_CACHE_PATH) -> None:
+        self.path = path
+        self._entries: dict[str, dict[str, Any]] = self._load()
+        self._dirty = False
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if self.path is None:
+            return {}
+        try:
+            data = json.loads(self.path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError):
+            return {}
+        if data.get("version") != CACHE_VERSION:
+            return {}
+        return data.get("entries", {})
+
+    def get(self, url: str, *, now: float) -> LinkResult | None:
+        entry = self._entries.get(url)
+        if entry is None:
+            return None
+        ttl = OK_TTL if entry["ok"] else BROKEN_TTL
+        if now - entry["checked_at"] >= ttl:
+            return None
+        return LinkResult(url, entry["ok"], entry["status"], entry["error"], cached=True)
+
+    def put(self, result: LinkResult, *, now: float) -> None:
+        if result.ok is None:
+            return
+        self._entries[result.url] = {
+            "ok": result.ok, "status": result.status, "error": result.error, "checked_at": now,
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache if anything changed (temp file + rename)."""
+        if self.path is None or not self._dirty:
+            return
+        data = json.dumps({"version": CACHE_VERSION, "entries": self._entries})
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, self.path)
+        except OSError:
+            return  # a read-only disk only costs the cache
+        self._dirty = False
+
+
+@dataclass
+class LinkChecker:
+    """Concurrent HEAD-then-GET checker with per-host limits and a result cache."""
+
+    cache: ResultCache
+    concurrency: int = CONCURRENCY
+    per_host: int = PER_HOST
+    timeout: float = TIMEOUT
+    ignore: tuple[str, ...] = ()
+    refresh: bool = False  # recheck cached URLs
+
+    async def check(self, urls: Iterable[str]) -> dict[str, LinkResult]:
+        """Results for every URL not ignored, checked or from the cache."""
+        now = time.time()
+        results: dict[str, LinkResult] = {}
+        pending: list[str] = []
+        for url in dict.fromkeys(urls):
+            if is_ignored(url, self.ignore):
+                continue
+            cached = None if self.refresh else self.cache.get(url, now=now)
+            if cached is not None:
+                results[url] = cached
+                metrics.inc("publish_link_checks_total", result="cached")
+            else:
+                pending.append(url)
+        if not pending:
+            return results
+
+        limit = asyncio.Semaphore(self.concurrency)
+        hosts: dict[str, asyncio.Semaphore] = {}
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_connections=self.concurrency,
+                                max_keepalive_connections=self.concurrency),
+        )
+        async with httpx.AsyncClient(
+            transport=AsyncRetryTransport(transport),
+            timeout=self.timeout,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+        ) as client:
+
+            async def _one(url: str) -> LinkResult:
+                host = hosts.setdefault(urlsplit(url).netloc, asyncio.Semaphore(self.per_host))
+                async with limit, host:
+                    return await _probe(client, url)
+
+            checked = await asyncio.gather(*(_one(url) for url in pending))
+
+        now = time.time()
+        for result in checked:
+            self.cache.put(result, now=now)
+            results[result.url] = result
+            outcome = {True: "ok", False: "broken", None: "unknown"}[result.ok]
+            metrics.inc("publish_link_checks_total", result=outcome)
+        return results
+
+
+async def _probe(client: httpx.AsyncClient, url: str) -> LinkResult:
+    try:
+        response = await client.head(url)
+        status = response.status_code
+        if status in _GET_FALLBACK:
+            async with client.stream("GET", url) as response:
+                status = response.status_code
+    except httpx.TimeoutException as e:
+        return LinkResult(url, None, None, type(e).__name__)
+    except httpx.HTTPError as e:
+        return LinkResult(url, False, None, f"{type(e).__name__}: {e}".rstrip(": "))
+    if status in _INCONCLUSIVE:
+        return LinkResult(url, None, status)
+    return LinkResult(url, status < 400, status)
+
+
+async def check_articles(
+    paths: Iterable[Path], checker: LinkChecker,
+) -> dict[Path, list[LinkResult]]:
+    """Broken links per article (articles without any are left out)."""
+    urls_by_path = {Path(path): article_urls(path) for path in paths}
+    results = await checker.check(url for urls in urls_by_path.values() for url in urls)
+    broken = {
+        path: [results[url] for url in urls if url in results and results[url].ok is False]
+        for path, urls in urls_by_path.items()
+    }
+    return {path: links for path, links in broken.items() if links}
+
+
+def _describe(result: LinkResult) -> str:
+    return str(result.status) if result.status is not None else result.error
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check article links")
+    parser.add_argument("paths", nargs="*", type=Path, help="Articles (default: all)")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached results")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--per-host", type=int, default=PER_HOST)
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(REPO_ROOT.glob("articles/*.md")) + sorted(
+        REPO_ROOT.glob("articles-en/*.md")
+    )
+    checker = LinkChecker(
+        ResultCache(), concurrency=args.concurrency, per_host=args.per_host,
+        ignore=load_ignore_patterns(), refresh=args.refresh,
+    )
+    broken = asyncio.run(check_articles(paths, checker))
+    checker.cache.save()
+
+    for path, links in broken.items():
+        for link in links:
+            print(f"{path}: {link.url} ({_describe(link)})")
+    if broken:
+        print(f"{sum(map(len, broken.values()))} broken link(s) in {len(broken)} article(s)",
+              file=sys.stderr)
+    return 1 if broken else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,338 @@
+"""Run metrics for the publisher: counters, gauges and latency histograms.
+
+Metrics are collected in the process-wide ``registry`` and written at the end
+of a run in two forms:
+
+- Prometheus text exposition format (``<job>.prom``), for node exporter's
+  textfile collector. Written atomically, as the collector requires.
+- A JSON summary per run (``runs/<job>-<UTC timestamp>.json``).
+
+HTTP requests are measured by MetricsTransport, the innermost transport of
+the publisher clients, so every attempt is timed separately and a request
+sent again by the 429 or 5xx retry layers is counted as a retry.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+# Seconds; covers a cached conversion up to a slow API call.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+HELP = {
+    "publish_request_duration_seconds": "HTTP request latency per attempt.",
+    "publish_requests_total": "HTTP request attempts by response status.",
+    "publish_request_bytes_total": "Request body bytes sent.",
+    "publish_retries_total": "Requests sent again after a 429, 5xx or transport error.",
+    "publish_conversion_seconds": "Zenn to platform payload conversion time.",
+    "publish_find_pages_total": "Listing pages fetched while searching posts by title.",
+    "publish_phase_duration_seconds": "Wall time spent in each phase of the last run.",
+    "publish_run_duration_seconds": "Wall time of the last run.",
+    "publish_run_errors": "Errors reported by the last run.",
+    "publish_run_timestamp_seconds": "Unix time the last run finished.",
+}
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram, as Prometheus expects."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+
+class Registry:
+    """Named metrics keyed by their label set."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counters: dict[str, dict[Labels, float]] = {}
+        self.gauges: dict[str, dict[Labels, float]] = {}
+        self.histograms: dict[str, dict[Labels, Histogram]] = {}
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        with self._lock:
+            self.gauges.setdefault(name, {})[_labels(labels)] = value
+
+    def add(self, name: str, amount: float, **labels: str) -> None:
+        """Add to a gauge (e.g. time spent in a phase entered several times)."""
+        key = _labels(labels)
+        with self._lock:
+            series = self.gauges.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    def value(self, name: str, **labels: str) -> float:
+        """Current value of a counter or gauge series (0 if never set)."""
+        key = _labels(labels)
+        for family in (self.counters, self.gauges):
+            if name in family and key in family[name]:
+                return family[name][key]
+        return 0.0
+
+    # -- export -----------------------------------------------------------
+
+    def to_prometheus(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            for kind, family in (("counter", self.counters), ("gauge", self.gauges)):
+                for name in sorted(family):
+                    _header(lines, name, kind)
+                    for labels, value in sorted(family[name].items()):
+                        lines.append(f"{name}{_format_labels(labels)} {_number(value)}")
+            for name in sorted(self.histograms):
+                _header(lines, name, "histogram")
+                for labels, h in sorted(self.histograms[name].items(), key=lambda kv: kv[0]):
+                    for bound, count in zip(h.buckets, h.counts):
+                        le = labels + (("le", _number(bound)),)
+                        lines.append(f"{name}_bucket{_format_labels(le)} {count}")
+                    inf = labels + (("le", "+Inf"),)
+                    lines.append(f"{name}_bucket{_format_labels(inf)} {h.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_number(h.sum)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {h.count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def to_json(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": _json_series(self.counters, lambda v: v),
+                "gauges": _json_series(self.gauges, lambda v: v),
+                "histograms": _json_series(self.histograms, lambda h: {
+                    "count": h.count,
+                    "sum": h.sum,
+                    "mean": h.sum / h.count if h.count else 0.0,
+                    "max": h.max,
+                    "buckets": {_number(b): c for b, c in zip(h.buckets, h.counts)},
+                }),
+            }
+
+    def write(self, directory: Path, job: str, **summary: Any) -> tuple[Path, Path]:
+        """Write ``<job>.prom`` and a per-run JSON summary. Returns both paths."""
+        directory.mkdir(parents=True, exist_ok=True)
+        prom_path = directory / f"{job}.prom"
+        _atomic_write(prom_path, self.to_prometheus())
+
+        now = datetime.now(timezone.utc)
+        json_path = directory / "runs" / f"{job}-{now:%Y%m%dT%H%M%SZ}.json"
+        json_path.parent.mkdir(exist_ok=True)
+        data = {"job": job, "finished_at": now.isoformat(), **summary, **self.to_json()}
+        _atomic_write(json_path, json.dumps(data, indent=2, ensure_ascii=False) + "\n")
+        return prom_path, json_path
+
+
+def _labels(labels: dict[str, str]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _header(lines: list[str], name: str, kind: str) -> None:
+    if name in HELP:
+        lines.append(f"# HELP {name} {HELP[name]}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _json_series(family: dict[str, dict[Labels, Any]], render) -> dict[str, list[dict]]:
+    return {
+        name: [{"labels": dict(labels), "value": render(value)} for labels, value in series.items()]
+        for name, series in sorted(family.items())
+    }
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    # The temp name must not end in .prom, or the collector may read it half-written.
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+# Process-wide registry; instrumented code looks it up on each use, so tests
+# can swap it out.
+registry = Registry()
+
+
+def inc(name: str, amount: float = 1.0, **labels: str) -> None:
+    registry.inc(name, amount, **labels)
+
+
+def observe(name: str, value: float, **labels: str) -> None:
+    registry.observe(name, value, **labels)
+
+
+@contextmanager
+def timer(name: str, **labels: str) -> Iterator[None]:
+    """Observe the wall time of the block in histogram ``name``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.observe(name, time.perf_counter() - start, **labels)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Add the wall time of the block to ``publish_phase_duration_seconds{phase=name}``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.add("publish_phase_duration_seconds", time.perf_counter() - start, phase=name)
+
+
+# ---------------------------------------------------------------------------
+# HTTP transports
+# ---------------------------------------------------------------------------
+
+# Request extension holding the previous attempt's outcome (status or error).
+_LAST_OUTCOME = "publish_metrics_outcome"
+
+_GRAPHQL_OPERATION_RE = re.compile(rb"\b(?:query|mutation)\s+(\w+)")
+# Path segments that are IDs: numbers, or long hex / base62 tokens.
+_ID_SEGMENT_RE = re.compile(r"^(?:\d+|[0-9a-f]{12,}|[0-9A-Za-z]{20,})$")
+
+
+def endpoint(platform: str, request: httpx.Request) -> str:
+    """Low-cardinality endpoint label: method and path with IDs replaced.
+
+    GraphQL requests all go to one URL, so Hashnode's are labelled by
+    operation name instead.
+    """
+    if platform == "hashnode":
+        match = _GRAPHQL_OPERATION_RE.search(_content(request))
+        return match.group(1).decode() if match else "graphql"
+    segments = ["{id}" if _ID_SEGMENT_RE.match(s) else s for s in request.url.path.split("/")]
+    return f"{request.method} {'/'.join(segments)}"
+
+
+def _content(request: httpx.Request) -> bytes:
+    try:
+        return request.content
+    except httpx.RequestNotRead:  # streaming body
+        return b""
+
+
+class _Attempt:
+    """Bookkeeping for one attempt of a request through MetricsTransport."""
+
+    def __init__(self, platform: str, request: httpx.Request) -> None:
+        self.platform = platform
+        self.request = request
+        self.endpoint = endpoint(platform, request)
+        previous = request.extensions.get(_LAST_OUTCOME)
+        if previous is not None:
+            inc("publish_retries_total", platform=platform, endpoint=self.endpoint, reason=previous)
+        inc(
+            "publish_request_bytes_total", len(_content(request)),
+            platform=platform, endpoint=self.endpoint,
+        )
+        self.start = time.perf_counter()
+
+    def done(self, outcome: str) -> None:
+        observe(
+            "publish_request_duration_seconds", time.perf_counter() - self.start,
+            platform=self.platform, endpoint=self.endpoint,
+        )
+        inc("publish_requests_total", platform=self.platform, endpoint=self.endpoint, status=outcome)
+        self.request.extensions = {**self.request.extensions, _LAST_OUTCOME: outcome}
+
+
+class MetricsTransport(httpx.BaseTransport):
+    """Sync transport recording latency, bytes, status and retries per endpoint."""
+
+    def __init__(self, transport: httpx.BaseTransport, platform: str) -> None:
+        self._transport = transport
+        self._platform = platform
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = _Attempt(self._platform, request)
+        try:
+            response = self._transport.handle_request(request)
+        except httpx.TransportError as e:
+            attempt.done(type(e).__name__)
+            raise
+        attempt.done(str(response.status_code))
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncMetricsTransport(httpx.AsyncBaseTransport):
+    """Async transport recording latency, bytes, status and retries per endpoint."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, platform: str) -> None:
+        self._transport = transport
+        self._platform = platform
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = _Attempt(self._platform, request)
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TransportError as e:
+            attempt.done(type(e).__name__)
+            raise
+        attempt.done(str(response.status_code))
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -3,11 +3,19 @@
 Given an ordered list of article slugs (highest priority first) and a start
 date, assigns Tue/Thu publication dates and outputs schedule.json entries.
 
+With ``--solve``, dates come from plan_batch() instead: every slug gets the
+earliest dates that respect per-day caps for Zenn and each cross-post
+platform, counting the entries already in schedule.json. The default cadence
+is then every day, so the caps (not the weekday list) set the pace.
+
 Usage:
     python plan_schedule.py --start 2026-02-25 --slugs "slug1,slug2,slug3"
     python plan_schedule.py --start 2026-02-25 --slugs "slug1,slug2" --cadence mon,wed,fri
     python plan_schedule.py --start 2026-02-25 --input scores.json
     python plan_schedule.py --start 2026-02-25 --slugs "slug1" --crosspost-delay 2
+    python plan_schedule.py --start 2026-02-25 --input scores.json --include-en --solve
+    python plan_schedule.py ... --solve --cap qiita=2 --cap zenn=1
+    python plan_schedule.py ... --profile /tmp/prof   # cProfile + tracemalloc report
 """
 
 from __future__ import annotations
@@ -15,9 +23,14 @@ from __future__ import annotations
 import argparse
 import json
 import sys
+from collections import Counter
+from collections.abc import Callable
 from datetime import date, timedelta
 from pathlib import Path
 
+import profiling
+from schedule_store import ScheduleStore
+
 SCRIPT_DIR = Path(__file__).parent
 REPO_ROOT = SCRIPT_DIR.parent
 SCHEDULE_PATH = SCRIPT_DIR / "schedule.json"
@@ -29,6 +42,10 @@ DAY_MAP = {
 }
 
 DEFAULT_CADENCE = [1, 3]  # Tuesday, Thursday
+EVERY_DAY = list(range(7))
+
+# Posts per day for plan_batch(): Zenn publishes and each cross-post platform.
+DEFAULT_CAPS = {"zenn": 1, "qiita": 1, "devto": 1, "hashnode": 1}
 
 
 def parse_cadence(cadence_str: str) -> list[int]:
@@ -122,6 +139,185 @@ def generate_schedule(
     return entries
 
 
+class _Calendar:
+    """Per-day capacity of one resource, with first-free-day lookup.
+
+    Days are date ordinals. A full (or disallowed) day points at a later
+    day, and lookups compress those chains (union-find), so finding the
+    first free day at or after ``day`` is amortized near O(1).
+    """
+
+    def __init__(
+        self, cap: int, load: Counter[int], allowed: Callable[[int], bool] = lambda day: True,
+    ) -> None:
+        self.cap = cap
+        self.load = load
+        self.allowed = allowed
+        self._next: dict[int, int] = {}
+
+    def find(self, day: int) -> int:
+        path = []
+        while True:
+            if day in self._next:
+                path.append(day)
+                day = self._next[day]
+            elif self.load[day] >= self.cap or not self.allowed(day):
+                self._next[day] = day + 1
+                path.append(day)
+                day += 1
+            else:
+                break
+        for visited in path:
+            self._next[visited] = day
+        return day
+
+    def take(self, day: int) -> None:
+        self.load[day] += 1
+        if self.load[day] >= self.cap:
+            self._next[day] = day + 1
+
+
+def _first_common(calendars: list[_Calendar], day: int) -> int:
+    """First day at or after ``day`` free in every calendar."""
+    while True:
+        found = max(calendar.find(day) for calendar in calendars)
+        if found == day:
+            return day
+        day = found
+
+
+def _existing_load(schedule: dict) -> dict[str, Counter[int]]:
+    """Posts per day already in the schedule, per resource."""
+    load: dict[str, Counter[int]] = {name: Counter() for name in DEFAULT_CAPS}
+    for entry in schedule.get("articles", []):
+        if entry.get("zenn_date"):
+            load["zenn"][date.fromisoformat(entry["zenn_date"]).toordinal()] += 1
+        day = date.fromisoformat(entry["date"]).toordinal()
+        for platform in ("qiita", "devto", "hashnode"):
+            if platform in entry and entry[platform] != "n/a":
+                load[platform][day] += 1
+    return load
+
+
+def plan_batch(
+    slugs: list[str],
+    start: date,
+    existing: dict | None = None,
+    publish_days: list[int] | None = None,
+    caps: dict[str, int] | None = None,
+    crosspost_delay: int = 1,
+    scores: dict[str, dict] | None = None,
+    include_en_translation: bool = False,
+    en_same_day: bool = True,
+    en_gap: int | None = None,
+) -> list[dict]:
+    """Plan entries for ``slugs`` around an existing schedule, under per-day caps.
+
+    Slugs are placed in priority order, each at its earliest feasible dates:
+    the Zenn date on a publish day with Zenn capacity, the Qiita cross-post
+    ``crosspost_delay`` or more days later, and the EN entry (Dev.to and
+    Hashnode) on the Zenn date or the first day after it with room on both.
+    Caps count the entries already in ``existing``. Slugs it already has are
+    skipped. Runs in O(n log n) for n slugs plus existing entries.
+
+    By default an EN entry may share its day with its JP cross-post: the
+    pair goes to different platforms, so no cap is shared, and the EN copy
+    is meant to follow the Zenn original as closely as the caps allow.
+    ``en_gap`` keeps the two apart instead.
+
+    Args:
+        existing: Current schedule.json contents (default: empty).
+        publish_days: Weekdays allowed for Zenn. Default: every day.
+        caps: Posts per day by resource (see DEFAULT_CAPS); merged over it.
+        en_gap: Minimum days between an EN entry and the Qiita cross-post
+            of its JP article (1: not the same day). Default: no minimum.
+        Others as for generate_schedule().
+
+    Returns:
+        List of new schedule entry dicts, in slug order.
+    """
+    existing = existing or {"articles": []}
+    days = set(EVERY_DAY if publish_days is None else publish_days)
+    caps = {**DEFAULT_CAPS, **(caps or {})}
+    load = _existing_load(existing)
+    # date(1, 1, 1) (ordinal 1) is a Monday.
+    calendars = {
+        name: _Calendar(
+            caps[name], load[name],
+            (lambda day: (day - 1) % 7 in days) if name == "zenn" else (lambda day: True),
+        )
+        for name in DEFAULT_CAPS
+    }
+    known = {entry["file"] for entry in existing.get("articles", [])}
+
+    entries = []
+    earliest = start.toordinal()
+    for slug in slugs:
+        if f"articles/{slug}.md" in known:
+            print(f"  Skip (already scheduled): {slug}", file=sys.stderr)
+            continue
+        zenn_day = calendars["zenn"].find(earliest)
+        calendars["zenn"].take(zenn_day)
+        crosspost_day = calendars["qiita"].find(zenn_day + crosspost_delay)
+        calendars["qiita"].take(crosspost_day)
+
+        entry: dict = {
+            "file": f"articles/{slug}.md",
+            "canonical_url": f"{ZENN_BASE_URL}/{slug}",
+            "zenn_date": date.fromordinal(zenn_day).isoformat(),
+            "date": date.fromordinal(crosspost_day).isoformat(),
+            "qiita": None,
+            "devto": "n/a",
+            "hashnode": "n/a",
+        }
+        if scores and slug in scores:
+            entry["score"] = scores[slug]
+        entries.append(entry)
+
+        if include_en_translation and f"articles-en/{slug}.md" not in known:
+            en_calendars = [calendars["devto"], calendars["hashnode"]]
+            en_day = _first_common(
+                en_calendars, zenn_day if en_same_day else zenn_day + crosspost_delay,
+            )
+            if en_gap is not None and abs(en_day - crosspost_day) < en_gap:
+                # Every day from crosspost_day + en_gap on is far enough.
+                en_day = _first_common(en_calendars, crosspost_day + en_gap)
+            for calendar in en_calendars:
+                calendar.take(en_day)
+            en_entry: dict = {
+                "file": f"articles-en/{slug}.md",
+                "canonical_url": f"{ZENN_BASE_URL}/{slug}",
+                "date": date.fromordinal(en_day).isoformat(),
+                "devto": "pending",
+                "hashnode": "pending",
+                "depends_on": f"articles/{slug}.md",
+            }
+            if scores and slug in scores:
+                en_entry["score"] = scores[slug]
+            entries.append(en_entry)
+
+        # Keep priority order: a later slug never publishes before this one.
+        earliest = zenn_day
+
+    return entries
+
+
+def parse_caps(values: list[str]) -> dict[str, int]:
+    """Parse ``NAME=N`` cap options (NAME from DEFAULT_CAPS, N >= 1)."""
+    caps = {}
+    for value in values:
+        name, _, count = value.partition("=")
+        if name not in DEFAULT_CAPS or not count.isdigit() or int(count) < 1:
+            print(
+                f"Error: Bad cap '{value}'. Use NAME=N with N >= 1, NAME one of: "
+                f"{', '.join(DEFAULT_CAPS)}",
+                file=sys.stderr,
+            )
+            raise SystemExit(1)
+        caps[name] = int(count)
+    return caps
+
+
 def load_scores(path: Path) -> tuple[list[str], dict[str, dict]]:
     """Load scored articles from JSON file.
 
@@ -150,7 +346,7 @@ def load_scores(path: Path) -> tuple[list[str], dict[str, dict]]:
 def merge_into_schedule(new_entries: list[dict]) -> dict:
     """Merge new entries into existing schedule.json."""
     if SCHEDULE_PATH.exists():
-        schedule = json.loads(SCHEDULE_PATH.read_text())
+        schedule = ScheduleStore(SCHEDULE_PATH).load()
     else:
         schedule = {"post_time_utc": "23:00", "articles": []}
 
@@ -185,8 +381,8 @@ def main() -> int:
         help="JSON file with scored articles (auto-sorted by total score).",
     )
     parser.add_argument(
-        "--cadence", default="tue,thu",
-        help="Comma-separated publish days (default: tue,thu).",
+        "--cadence",
+        help="Comma-separated publish days (default: tue,thu; every day with --solve).",
     )
     parser.add_argument(
         "--crosspost-delay", type=int, default=1,
@@ -200,6 +396,20 @@ def main() -> int:
         "--en-same-day", action="store_true", default=True,
         help="Schedule EN translation on same day as Zenn (default: True).",
     )
+    parser.add_argument(
+        "--en-gap", type=int, metavar="DAYS",
+        help="With --solve, keep each EN entry at least DAYS days from its Qiita "
+        "cross-post (1: not the same day). Default: no minimum.",
+    )
+    parser.add_argument(
+        "--solve", action="store_true",
+        help="Plan around schedule.json under per-day caps (see plan_batch).",
+    )
+    parser.add_argument(
+        "--cap", action="append", default=[], metavar="NAME=N",
+        help=f"Per-day cap for --solve; NAME is one of {', '.join(DEFAULT_CAPS)} "
+        "(default: 1 each). Repeatable.",
+    )
     parser.add_argument(
         "--merge", action="store_true",
         help="Merge into existing schedule.json instead of just printing.",
@@ -208,25 +418,44 @@ def main() -> int:
         "--dry-run", action="store_true",
         help="Show schedule without writing to file.",
     )
+    profiling.add_argument(parser)
 
     args = parser.parse_args()
-    publish_days = parse_cadence(args.cadence)
+    with profiling.profiled(args.profile, "plan_schedule"):
+        return _run(args)
 
+
+def _run(args: argparse.Namespace) -> int:
     scores: dict[str, dict] | None = None
     if args.input:
         slugs, scores = load_scores(args.input)
     else:
         slugs = [s.strip() for s in args.slugs.split(",")]
 
-    entries = generate_schedule(
-        slugs=slugs,
-        start=args.start,
-        publish_days=publish_days,
-        crosspost_delay=args.crosspost_delay,
-        scores=scores,
-        include_en_translation=args.include_en,
-        en_same_day=args.en_same_day,
-    )
+    if args.solve:
+        existing = ScheduleStore(SCHEDULE_PATH).load() if SCHEDULE_PATH.exists() else None
+        entries = plan_batch(
+            slugs=slugs,
+            start=args.start,
+            existing=existing,
+            publish_days=parse_cadence(args.cadence) if args.cadence else None,
+            caps=parse_caps(args.cap),
+            crosspost_delay=args.crosspost_delay,
+            scores=scores,
+            include_en_translation=args.include_en,
+            en_same_day=args.en_same_day,
+            en_gap=args.en_gap,
+        )
+    else:
+        entries = generate_schedule(
+            slugs=slugs,
+            start=args.start,
+            publish_days=parse_cadence(args.cadence or "tue,thu"),
+            crosspost_delay=args.crosspost_delay,
+            scores=scores,
+            include_en_translation=args.include_en,
+            en_same_day=args.en_same_day,
+        )
 
     # Display schedule
     print(f"\n{'Type':<5} {'Date':<14} {'Cross-post':<14} {'Slug':<40} {'Score':>5}")
@@ -240,9 +469,7 @@ def main() -> int:
 
     if args.merge and not args.dry_run:
         schedule = merge_into_schedule(entries)
-        SCHEDULE_PATH.write_text(
-            json.dumps(schedule, indent=2, ensure_ascii=False) + "\n",
-        )
+        ScheduleStore(SCHEDULE_PATH).save(schedule)
         print(f"Written to {SCHEDULE_PATH}", file=sys.stderr)
     elif args.merge and args.dry_run:
         print("[DRY-RUN] Would merge into schedule.json", file=sys.stderr)
@@ -0,0 +1,126 @@
+"""``--profile DIR`` support shared by the command-line scripts.
+
+With the option set, the run is profiled with cProfile and tracemalloc,
+and two files are written to DIR:
+
+- ``<script>-<timestamp>.pstats``, a cProfile dump. Open it with
+  ``python -m pstats`` or snakeviz.
+- ``<script>-<timestamp>.txt``, a report with three parts: time per category
+  (YAML, regex, JSON, HTTP waits, file I/O, git), the top functions by
+  cumulative time, and the top allocation sites.
+
+zenn_publish.py also takes ``--profile`` and runs outside the venv, so the
+profilers used are the standard library's cProfile and tracemalloc.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import re
+import sys
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # imported by profiled(), so runs without --profile skip them
+    import pstats
+    import tracemalloc
+
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 25
+TRACEMALLOC_FRAMES = 10
+
+# Where self time is attributed, matched against "file:function" of each
+# profiled function. Earlier categories win.
+CATEGORIES: tuple[tuple[str, str], ...] = (
+    ("yaml", r"yaml"),
+    ("regex", r"re\.Pattern|_sre|/re/|sre_"),
+    ("json", r"json"),
+    ("http (incl. waits)", r"httpx|httpcore|h11|/h2/|ssl|socket|select"),
+    ("git / subprocess", r"subprocess|waitpid|posix\.read"),
+    ("file i/o", r"_io\.|io\.open|pathlib|os\.replace|fsync|tempfile"),
+)
+
+
+def add_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile", type=Path, metavar="DIR",
+        help="Write a cProfile dump and a CPU/memory report for this run to DIR",
+    )
+
+
+def categorize(stats: pstats.Stats) -> Counter[str]:
+    """Sum self time (seconds) per category."""
+    totals: Counter[str] = Counter()
+    for (filename, _, function), (_, _, self_time, _, _) in stats.stats.items():  # type: ignore[attr-defined]
+        where = f"{filename}:{function}"
+        for name, pattern in CATEGORIES:
+            if re.search(pattern, where):
+                totals[name] += self_time
+                break
+        else:
+            totals["other"] += self_time
+    return totals
+
+
+def report(stats: pstats.Stats, snapshot: tracemalloc.Snapshot, peak: int) -> str:
+    import pstats
+
+    out = io.StringIO()
+    total = stats.total_tt  # type: ignore[attr-defined]
+    out.write(f"Total CPU time: {total:.3f}s   Peak traced memory: {peak / 1024:.1f} KiB\n\n")
+
+    out.write("== Time by category (self time) ==\n")
+    for name, seconds in categorize(stats).most_common():
+        share = seconds / total * 100 if total else 0.0
+        out.write(f"  {name:<20} {seconds:9.3f}s  {share:5.1f}%\n")
+
+    out.write(f"\n== Top {TOP_FUNCTIONS} functions by cumulative time ==\n")
+    stats.stream = out  # type: ignore[attr-defined]
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_FUNCTIONS)
+
+    out.write(f"== Top {TOP_ALLOCATIONS} allocation sites (live at exit) ==\n")
+    for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+        frame = stat.traceback[0]
+        out.write(
+            f"  {stat.size / 1024:9.1f} KiB  {stat.count:7d} blocks  "
+            f"{frame.filename}:{frame.lineno}\n"
+        )
+    return out.getvalue()
+
+
+@contextmanager
+def profiled(directory: Path | None, name: str) -> Iterator[None]:
+    """Profile the block when ``directory`` is set; otherwise do nothing."""
+    if directory is None:
+        yield
+        return
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = directory / f"{name}-{datetime.now():%Y%m%dT%H%M%S}"
+    tracemalloc.start(TRACEMALLOC_FRAMES)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        pstats_path = stem.with_suffix(".pstats")
+        report_path = stem.with_suffix(".txt")
+        profiler.dump_stats(pstats_path)
+        report_path.write_text(report(pstats.Stats(profiler), snapshot, peak), encoding="utf-8")
+        print(f"Profile written: {pstats_path}, {report_path}", file=sys.stderr)
@@ -5,28 +5,67 @@ Usage:
     python publish.py articles/xxx.md --platform devto --canonical-url URL
     python publish.py articles/xxx.md --platform devto --update auto
     python publish.py articles-en/xxx.md --platform hashnode --canonical-url URL
+    python publish.py 'articles-en/*.md' --platform devto,hashnode \
+        --canonical-url 'https://zenn.dev/shimo4228/articles/{slug}' --concurrency 4
+    python publish.py articles/xxx.md --platform qiita --dry-run --profile /tmp/prof
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
+import atexit
+import functools
+import glob
+import hashlib
 import json
 import os
 import re
 import sys
-from dataclasses import dataclass
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Generator, Iterator
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
 
-import frontmatter
 import httpx
 
+import metrics
+import profiling
+import retry
+from article_index import ArticleIndex, image_refs, split_body
+from conversion_cache import cache_key, default_cache
+from images import DEFAULT_HASH_INDEX, GITHUB_RAW_BASE, ImageStore
+from metrics import AsyncMetricsTransport, MetricsTransport
+from ratelimit import AsyncRateLimitedTransport, RateLimitedTransport
+from retry import IDEMPOTENT, AsyncRetryTransport, RetryTransport
+
 # ---------------------------------------------------------------------------
 # Env
 # ---------------------------------------------------------------------------
 
 
+# API endpoints, overridable through the environment or .env (e.g. to point
+# at fake_api.py). The module attributes of the same names hold the values.
+_ENDPOINT_DEFAULTS = {
+    "QIITA_API_BASE": "https://qiita.com/api/v2",
+    "DEVTO_API_BASE": "https://dev.to/api",
+    "HASHNODE_API_URL": "https://gql.hashnode.com",
+}
+
+
+def _endpoint(name: str) -> str:
+    """The endpoint ``name`` from the environment, else its default."""
+    return os.environ.get(name, _ENDPOINT_DEFAULTS[name])
+
+
 def _load_env(env_path: Path) -> None:
-    """Load KEY=VALUE pairs from a .env file into os.environ."""
+    """Load KEY=VALUE pairs from a .env file into os.environ.
+
+    Variables already set in the environment win over the file. Endpoint
+    attributes are refreshed for the variables the file sets, as they were
+    read at import, before any .env file was loaded.
+    """
     if not env_path.exists():
         return
     for line in env_path.read_text().splitlines():
@@ -35,7 +74,101 @@ def _load_env(env_path: Path) -> None:
             continue
         if "=" in line:
             key, _, value = line.partition("=")
-            os.environ.setdefault(key.strip(), value.strip())
+            key, value = key.strip(), value.strip()
+            if key in os.environ:
+                continue
+            os.environ[key] = value
+            if key in _ENDPOINT_DEFAULTS:
+                globals()[key] = _endpoint(key)
+
+
+# ---------------------------------------------------------------------------
+# HTTP clients
+# ---------------------------------------------------------------------------
+
+# Platforms whose API hosts negotiate HTTP/2 over TLS (h2 comes with the
+# httpx[http2] dependency). Plain-HTTP endpoints such as fake_api.py's are
+# still spoken to over HTTP/1.1.
+_HTTP2_PLATFORMS = frozenset({"qiita", "devto", "hashnode"})
+
+_CLIENT_LIMITS = httpx.Limits(
+    max_connections=10,
+    max_keepalive_connections=5,
+    keepalive_expiry=60,
+)
+
+_clients: dict[str, httpx.Client] = {}
+
+
+def get_client(platform: str) -> httpx.Client:
+    """Return the shared keep-alive client for a platform.
+
+    One client per platform is created on first use and reused for every
+    request in the process, so DNS, TCP and TLS setup is paid once per run.
+    Requests are paced by the per-platform rate limiter (see ratelimit.py),
+    and idempotent ones are retried on transient failures (see retry.py).
+    """
+    client = _clients.get(platform)
+    if client is None or client.is_closed:
+        transport = httpx.HTTPTransport(
+            http2=platform in _HTTP2_PLATFORMS,
+            limits=_CLIENT_LIMITS,
+        )
+        client = httpx.Client(
+            transport=RetryTransport(
+                RateLimitedTransport(MetricsTransport(transport, platform), platform),
+            ),
+            timeout=retry.policy.timeout,
+        )
+        _clients[platform] = client
+    return client
+
+
+def close_clients() -> None:
+    """Close all shared clients and drop their pooled connections."""
+    for client in _clients.values():
+        client.close()
+    _clients.clear()
+
+
+# Async clients are bound to the event loop that first used them, so each
+# one is cached together with its loop and replaced when the loop changes.
+_async_clients: dict[str, tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+
+
+def get_async_client(platform: str) -> httpx.AsyncClient:
+    """Return the shared keep-alive async client for a platform.
+
+    Must be called from a running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    cached = _async_clients.get(platform)
+    if cached is not None and cached[0] is loop and not cached[1].is_closed:
+        return cached[1]
+    transport = httpx.AsyncHTTPTransport(
+        http2=platform in _HTTP2_PLATFORMS,
+        limits=_CLIENT_LIMITS,
+    )
+    client = httpx.AsyncClient(
+        transport=AsyncRetryTransport(
+            AsyncRateLimitedTransport(AsyncMetricsTransport(transport, platform), platform),
+        ),
+        timeout=retry.policy.timeout,
+    )
+    _async_clients[platform] = (loop, client)
+    return client
+
+
+async def aclose_clients() -> None:
+    """Close the async clients owned by the running event loop."""
+    loop = asyncio.get_running_loop()
+    for platform, (owner, client) in list(_async_clients.items()):
+        if owner is loop:
+            await client.aclose()
+            del _async_clients[platform]
+
+
+atexit.register(close_clients)
 
 
 # ---------------------------------------------------------------------------
@@ -43,11 +176,45 @@ def _load_env(env_path: Path) -> None:
 # ---------------------------------------------------------------------------
 
 
-@dataclass(frozen=True)
 class Article:
-    title: str
-    body: str
-    topics: tuple[str, ...]
+    """A Zenn article: title, markdown body and topics.
+
+    Either ``body`` is given, or ``path`` is, and the body is read from the
+    file on first access (see parse_zenn_article()). Equality compares the
+    body too, so it reads a lazy body.
+    """
+
+    def __init__(
+        self,
+        title: str,
+        body: str | None = None,
+        topics: tuple[str, ...] = (),
+        *,
+        path: Path | None = None,
+    ) -> None:
+        if body is None and path is None:
+            raise ValueError("Article needs a body or a path to read it from")
+        self.title = title
+        self.topics = tuple(topics)
+        self.path = path
+        if body is not None:
+            self.__dict__["body"] = body  # fills the cached_property
+
+    @functools.cached_property
+    def body(self) -> str:
+        assert self.path is not None
+        return split_body(self.path.read_text(encoding="utf-8"))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Article):
+            return NotImplemented
+        return (self.title, self.topics, self.body) == (other.title, other.topics, other.body)
+
+    def __hash__(self) -> int:
+        return hash((self.title, self.topics))
+
+    def __repr__(self) -> str:
+        return f"Article(title={self.title!r}, topics={self.topics!r}, path={self.path!r})"
 
 
 @dataclass(frozen=True)
@@ -56,6 +223,13 @@ class PublishResult:
     success: bool
     url: str | None
     error: str | None
+    # Platform post ID (Qiita item ID, Dev.to article ID, Hashnode post ID)
+    remote_id: str | int | None = field(default=None, compare=False)
+    # True when the update was skipped because the payload had not changed
+    unchanged: bool = field(default=False, compare=False)
+    # True when the platform says the post does not exist (REST 404, or a
+    # GraphQL NOT_FOUND error / null post)
+    not_found: bool = field(default=False, compare=False)
 
 
 # ---------------------------------------------------------------------------
@@ -63,60 +237,196 @@ class PublishResult:
 # ---------------------------------------------------------------------------
 
 
+# Bump whenever parser or converter output changes; invalidates cached results.
+CONVERTER_VERSION = 2
+
+_cache = default_cache()
+
+
+_articles: ArticleIndex | None = None
+
+
+def _article_index() -> ArticleIndex:
+    """The shared article metadata index, created on first use, saved at exit."""
+    global _articles
+    if _articles is None:
+        _articles = ArticleIndex()
+        atexit.register(_articles.save)
+    return _articles
+
+
 def parse_zenn_article(path: Path) -> Article:
-    """Parse a Zenn article markdown file into an Article object."""
-    post = frontmatter.load(path)
-    return Article(
-        title=post.metadata.get("title", ""),
-        body=post.content,
-        topics=tuple(post.metadata.get("topics", [])),
+    """Parse a Zenn article markdown file into an Article object.
+
+    Title and topics come from the article index, which re-reads the file
+    only if it changed since it was indexed. The body is read when a
+    converter first needs it, so title lookups and dry runs skip it.
+    """
+    meta = _article_index().get(Path(path))
+    if meta is None:
+        raise FileNotFoundError(path)
+    return Article(meta.title, topics=meta.topics, path=Path(path))
+
+
+def _cached_conversion(
+    platform: str, article: Article, options: tuple, build: Callable[[], dict],
+) -> dict:
+    """Return build()'s payload, cached by article content, options and version.
+
+    The image URLs are part of the key: they change when an image is edited
+    or its derivative is pushed, with the article itself unchanged.
+    """
+    start = time.perf_counter()
+    store = _image_store()
+    key = cache_key(
+        "payload", platform, CONVERTER_VERSION, options,
+        article.title, article.topics, article.body,
+        tuple(store.url(name) for name in image_refs(article.body)),
+    )
+    cached = _cache.get(key)
+    if cached is None:
+        cached = build()
+        _cache.put(key, cached)
+        outcome = "miss"
+    else:
+        outcome = "hit"
+    metrics.observe(
+        "publish_conversion_seconds", time.perf_counter() - start,
+        platform=platform, cache=outcome,
     )
+    return cached
 
 
 # ---------------------------------------------------------------------------
 # Converter (shared)
 # ---------------------------------------------------------------------------
 
-_ZENN_MESSAGE_RE = re.compile(
-    r"^:::message\s*\n(.*?)\n^:::\s*$",
-    re.MULTILINE | re.DOTALL,
-)
-
-_ZENN_DETAILS_RE = re.compile(
-    r"^:::details\s+(.*?)\s*\n(.*?)\n^:::\s*$",
-    re.MULTILINE | re.DOTALL,
-)
-
 _ZENN_IMAGE_RE = re.compile(
     r"!\[([^\]]*)\]\(/images/([^)]+)\)",
 )
 
-GITHUB_RAW_BASE = "https://raw.githubusercontent.com/shimo4228/zenn-content/main/images"
+# Opening code fence: up to 3 spaces, then 3+ backticks or tildes.
+_FENCE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+
+_images: ImageStore | None = None
+
+
+def _image_store() -> ImageStore:
+    """The shared image store, created on first use, saved at exit (see images.py)."""
+    global _images
+    if _images is None:
+        _images = ImageStore(raw_base=GITHUB_RAW_BASE, index_path=DEFAULT_HASH_INDEX)
+        atexit.register(_images.save)
+    return _images
+
+
+def _image_url(match: re.Match[str]) -> str:
+    # "name.png =250x" -> URL of name.png, size hint kept
+    name, _, rest = match.group(2).partition(" ")
+    url = _image_store().url(name)
+    return f"![{match.group(1)}]({url}{' ' + rest if rest else ''})"
+
+
+@dataclass
+class _Block:
+    """An open ``:::message`` / ``:::details`` container."""
+
+    kind: str
+    opener: str
+    summary: str
+    parts: list[str]
 
 
 def _strip_zenn_syntax(content: str) -> str:
-    """Replace Zenn-specific syntax with standard Markdown equivalents."""
-    # /images/xxx → GitHub raw URL
-    content = _ZENN_IMAGE_RE.sub(
-        rf"![\1]({GITHUB_RAW_BASE}/\2)",
-        content,
-    )
-    # :::message → blockquote
-    content = _ZENN_MESSAGE_RE.sub(_message_to_blockquote, content)
-    # :::details title → <details>
-    content = _ZENN_DETAILS_RE.sub(_details_to_html, content)
-    return content
+    """Replace Zenn-specific syntax with standard Markdown equivalents.
+
+    Single pass over the lines:
+    - ``/images/xxx`` → GitHub raw URL (hashed derivative once committed)
+    - ``:::message`` → blockquote
+    - ``:::details title`` → ``<details>``
+
+    Lines inside fenced code blocks are copied verbatim. Containers nest, and
+    an unclosed container is emitted unchanged. Blank lines after a closing
+    ``:::`` are dropped, matching the regex-based converter this replaced.
+    """
+    out: list[str] = []
+    parts = out  # buffer of the innermost open container, or the output
+    stack: list[_Block] = []
+    fence: str | None = None
+    # Set after a container closes: its rendering still needs a line break,
+    # emitted only once a non-blank line follows.
+    pending_break = False
+
+    for line in content.splitlines(keepends=True):
+        if fence is not None:
+            stripped = line.strip()
+            if stripped.startswith(fence) and not stripped.lstrip(fence[0]):
+                fence = None
+            parts.append(line)
+            continue
+
+        stripped = line.rstrip()
+        if pending_break:
+            if not stripped.strip():
+                continue
+            parts.append("\n")
+            pending_break = False
+
+        if stripped == ":::" and stack:
+            block = stack.pop()
+            rendered = _render_block(block)
+            parts = stack[-1].parts if stack else out
+            parts.append(rendered)
+            pending_break = True
+            continue
+
+        if stripped == ":::message":
+            stack.append(_Block("message", line, "", []))
+            parts = stack[-1].parts
+            continue
+        if stripped.startswith(":::details") and stripped[10:11].isspace():
+            stack.append(_Block("details", line, stripped[10:].strip(), []))
+            parts = stack[-1].parts
+            continue
+
+        fence_match = _FENCE_RE.match(line)
+        if fence_match:
+            fence = fence_match.group(1)
+        elif "](/images/" in line:
+            line = _ZENN_IMAGE_RE.sub(_image_url, line)
+        parts.append(line)
+
+    # Unclosed containers are left as written
+    for block in stack:
+        out.append(block.opener)
+        out.extend(block.parts)
+    return "".join(out)
+
+
+def _render_block(block: _Block) -> str:
+    body = "".join(block.parts)
+    if block.kind == "message":
+        return _message_to_blockquote(body)
+    return _details_to_html(block.summary, body)
+
 
+def payload_hash(payload: dict) -> str:
+    """Return a stable SHA-256 digest of a converted platform payload.
 
-def _message_to_blockquote(m: re.Match) -> str:
-    lines = m.group(1).strip().splitlines()
+    Covers everything the converters emit (title, body, tags, canonical URL),
+    so two payloads hash equal exactly when the remote post would not change.
+    """
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _message_to_blockquote(body: str) -> str:
+    lines = body.strip().splitlines()
     return "\n".join(f"> {line}" for line in lines)
 
 
-def _details_to_html(m: re.Match) -> str:
-    summary = m.group(1).strip()
-    body = m.group(2).strip()
-    return f"<details><summary>{summary}</summary>\n\n{body}\n\n</details>"
+def _details_to_html(summary: str, body: str) -> str:
+    return f"<details><summary>{summary}</summary>\n\n{body.strip()}\n\n</details>"
 
 
 # ---------------------------------------------------------------------------
@@ -126,6 +436,10 @@ def _details_to_html(m: re.Match) -> str:
 
 def convert_to_qiita(article: Article) -> dict:
     """Convert an Article to a Qiita API v2 request body."""
+    return _cached_conversion("qiita", article, (), lambda: _build_qiita(article))
+
+
+def _build_qiita(article: Article) -> dict:
     body = _strip_zenn_syntax(article.body)
     tags = [{"name": t} for t in article.topics[:5]]
     return {
@@ -143,6 +457,12 @@ def convert_to_qiita(article: Article) -> dict:
 
 def convert_to_devto(article: Article, canonical_url: str | None = None) -> dict:
     """Convert an Article to a Dev.to API request body."""
+    return _cached_conversion(
+        "devto", article, (canonical_url,), lambda: _build_devto(article, canonical_url),
+    )
+
+
+def _build_devto(article: Article, canonical_url: str | None) -> dict:
     body = _strip_zenn_syntax(article.body)
     payload: dict = {
         "article": {
@@ -192,6 +512,15 @@ def convert_to_hashnode(
     canonical_url: str | None = None,
 ) -> dict:
     """Convert an Article to a Hashnode GraphQL request body."""
+    return _cached_conversion(
+        "hashnode", article, (publication_id, canonical_url),
+        lambda: _build_hashnode(article, publication_id, canonical_url),
+    )
+
+
+def _build_hashnode(
+    article: Article, publication_id: str, canonical_url: str | None,
+) -> dict:
     body = _strip_zenn_syntax(article.body)
     input_data: dict = {
         "title": article.title,
@@ -206,60 +535,79 @@ def convert_to_hashnode(
     }
 
 
+# ---------------------------------------------------------------------------
+# Publisher — shared response handling
+# ---------------------------------------------------------------------------
+
+
+def _rest_result(platform: str, resp: httpx.Response, ok_status: int) -> PublishResult:
+    """Build a PublishResult from a REST create/update response."""
+    if resp.status_code == ok_status:
+        data = resp.json()
+        return PublishResult(platform, True, data.get("url"), None, data.get("id"))
+    return PublishResult(
+        platform, False, None, f"{resp.status_code}: {resp.text}",
+        not_found=resp.status_code == 404,
+    )
+
+
+# Listing pages searched for a post by title, and posts per page.
+_LISTING_PAGES = {"qiita": 5, "devto": 5, "hashnode": 3}
+_LISTING_PER_PAGE = {"qiita": 20, "devto": 30}
+
+
 # ---------------------------------------------------------------------------
 # Publisher — Qiita
 # ---------------------------------------------------------------------------
 
-QIITA_API_BASE = "https://qiita.com/api/v2"
+QIITA_API_BASE = _endpoint("QIITA_API_BASE")
+
+
+def _qiita_headers(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
 
 
 def publish_to_qiita(payload: dict, token: str) -> PublishResult:
     """Publish an article to Qiita via API v2."""
-    resp = httpx.post(
-        f"{QIITA_API_BASE}/items",
-        headers={"Authorization": f"Bearer {token}"},
-        json=payload,
-        timeout=30,
-    )
-    if resp.status_code == 201:
-        data = resp.json()
-        return PublishResult("qiita", True, data.get("url"), None)
-    return PublishResult("qiita", False, None, f"{resp.status_code}: {resp.text}")
+
+    def send() -> PublishResult:
+        resp = get_client("qiita").post(
+            f"{QIITA_API_BASE}/items",
+            headers=_qiita_headers(token),
+            json=payload,
+            timeout=retry.policy.timeout,
+        )
+        return _rest_result("qiita", resp, 201)
+
+    return _guarded_create("qiita", payload, token, send)
 
 
 def update_on_qiita(item_id: str, payload: dict, token: str) -> PublishResult:
     """Update an existing Qiita article via API v2."""
-    resp = httpx.patch(
+    resp = get_client("qiita").patch(
         f"{QIITA_API_BASE}/items/{item_id}",
-        headers={"Authorization": f"Bearer {token}"},
+        headers=_qiita_headers(token),
         json=payload,
-        timeout=30,
+        timeout=retry.policy.timeout,
     )
-    if resp.status_code == 200:
-        data = resp.json()
-        return PublishResult("qiita", True, data.get("url"), None)
-    return PublishResult("qiita", False, None, f"{resp.status_code}: {resp.text}")
+    return _rest_result("qiita", resp, 200)
+
+
+def iter_qiita_items(
+    token: str,
+    *,
+    max_pages: int = _LISTING_PAGES["qiita"],
+    per_page: int = _LISTING_PER_PAGE["qiita"],
+) -> Iterator[dict]:
+    """Yield authenticated user's items page by page, stopping on error."""
+    yield from _iter_listing("qiita", token, max_pages=max_pages, per_page=per_page)
 
 
 def find_qiita_item_by_title(title: str, token: str) -> str | None:
     """Search authenticated user's items for a matching title."""
-    page = 1
-    while page <= 5:
-        resp = httpx.get(
-            f"{QIITA_API_BASE}/authenticated_user/items",
-            headers={"Authorization": f"Bearer {token}"},
-            params={"page": page, "per_page": 20},
-            timeout=30,
-        )
-        if resp.status_code != 200:
-            return None
-        items = resp.json()
-        if not items:
-            return None
-        for item in items:
-            if item.get("title") == title:
-                return item["id"]
-        page += 1
+    for item in iter_qiita_items(token):
+        if item.get("title") == title:
+            return item["id"]
     return None
 
 
@@ -267,7 +615,7 @@ def find_qiita_item_by_title(title: str, token: str) -> str | None:
 # Publisher — Dev.to
 # ---------------------------------------------------------------------------
 
-DEVTO_API_BASE = "https://dev.to/api"
+DEVTO_API_BASE = _endpoint("DEVTO_API_BASE")
 _DEVTO_HEADERS_BASE = {"Accept": "application/vnd.forem.api-v1+json"}
 
 
@@ -277,51 +625,45 @@ def _devto_headers(api_key: str) -> dict:
 
 def publish_to_devto(payload: dict, api_key: str) -> PublishResult:
     """Publish an article to Dev.to via API v1."""
-    resp = httpx.post(
-        f"{DEVTO_API_BASE}/articles",
-        headers=_devto_headers(api_key),
-        json=payload,
-        timeout=30,
-    )
-    if resp.status_code == 201:
-        data = resp.json()
-        return PublishResult("devto", True, data.get("url"), None)
-    return PublishResult("devto", False, None, f"{resp.status_code}: {resp.text}")
+
+    def send() -> PublishResult:
+        resp = get_client("devto").post(
+            f"{DEVTO_API_BASE}/articles",
+            headers=_devto_headers(api_key),
+            json=payload,
+            timeout=retry.policy.timeout,
+        )
+        return _rest_result("devto", resp, 201)
+
+    return _guarded_create("devto", payload, api_key, send)
 
 
 def update_on_devto(article_id: int, payload: dict, api_key: str) -> PublishResult:
     """Update an existing Dev.to article via API v1."""
-    resp = httpx.put(
+    resp = get_client("devto").put(
         f"{DEVTO_API_BASE}/articles/{article_id}",
         headers=_devto_headers(api_key),
         json=payload,
-        timeout=30,
+        timeout=retry.policy.timeout,
     )
-    if resp.status_code == 200:
-        data = resp.json()
-        return PublishResult("devto", True, data.get("url"), None)
-    return PublishResult("devto", False, None, f"{resp.status_code}: {resp.text}")
+    return _rest_result("devto", resp, 200)
+
+
+def iter_devto_articles(
+    api_key: str,
+    *,
+    max_pages: int = _LISTING_PAGES["devto"],
+    per_page: int = _LISTING_PER_PAGE["devto"],
+) -> Iterator[dict]:
+    """Yield authenticated user's published articles page by page, stopping on error."""
+    yield from _iter_listing("devto", api_key, max_pages=max_pages, per_page=per_page)
 
 
 def find_devto_article_by_title(title: str, api_key: str) -> int | None:
     """Search authenticated user's published articles for a matching title."""
-    page = 1
-    while page <= 5:
-        resp = httpx.get(
-            f"{DEVTO_API_BASE}/articles/me/published",
-            headers=_devto_headers(api_key),
-            params={"page": page, "per_page": 30},
-            timeout=30,
-        )
-        if resp.status_code != 200:
-            return None
-        items = resp.json()
-        if not items:
-            return None
-        for item in items:
-            if item.get("title") == title:
-                return item["id"]
-        page += 1
+    for item in iter_devto_articles(api_key):
+        if item.get("title") == title:
+            return item["id"]
     return None
 
 
@@ -329,30 +671,44 @@ def find_devto_article_by_title(title: str, api_key: str) -> int | None:
 # Publisher — Hashnode
 # ---------------------------------------------------------------------------
 
-HASHNODE_API_URL = "https://gql.hashnode.com"
+HASHNODE_API_URL = _endpoint("HASHNODE_API_URL")
 
 
-def publish_to_hashnode(payload: dict, token: str) -> PublishResult:
-    """Publish an article to Hashnode via GraphQL API."""
-    resp = httpx.post(
-        HASHNODE_API_URL,
-        headers={"Authorization": token, "Content-Type": "application/json"},
-        json=payload,
-        timeout=30,
-    )
+def _hashnode_headers(token: str) -> dict:
+    return {"Authorization": token, "Content-Type": "application/json"}
+
+
+def _hashnode_result(resp: httpx.Response, operation: str) -> PublishResult:
+    """Build a PublishResult from a publishPost/updatePost response."""
     if resp.status_code != 200:
         return PublishResult("hashnode", False, None, f"{resp.status_code}: {resp.text}")
     data = resp.json()
     if "errors" in data:
-        return PublishResult("hashnode", False, None, json.dumps(data["errors"]))
-    post = data.get("data", {}).get("publishPost", {}).get("post", {})
-    return PublishResult("hashnode", True, post.get("url"), None)
+        return PublishResult(
+            "hashnode", False, None, json.dumps(data["errors"]),
+            not_found=hashnode_not_found(data["errors"]),
+        )
+    post = ((data.get("data") or {}).get(operation) or {}).get("post")
+    if not post:
+        return PublishResult("hashnode", False, None, "no post returned", not_found=True)
+    return PublishResult("hashnode", True, post.get("url"), None, post.get("id"))
 
 
-def update_on_hashnode(post_id: str, article: Article, token: str) -> PublishResult:
-    """Update an existing Hashnode article via GraphQL API."""
+def hashnode_not_found(errors: list[dict]) -> bool:
+    """Whether GraphQL ``errors`` say the post does not exist.
+
+    Hashnode answers 200 with an error: code NOT_FOUND, or only a message.
+    """
+    return any(
+        (error.get("extensions") or {}).get("code") == "NOT_FOUND"
+        or "not found" in str(error.get("message", "")).lower()
+        for error in errors
+    )
+
+
+def _hashnode_update_payload(post_id: str, article: Article) -> dict:
     body = _strip_zenn_syntax(article.body)
-    payload = {
+    return {
         "query": _HASHNODE_UPDATE_MUTATION,
         "variables": {
             "input": {
@@ -362,19 +718,33 @@ def update_on_hashnode(post_id: str, article: Article, token: str) -> PublishRes
             }
         },
     }
-    resp = httpx.post(
+
+
+def publish_to_hashnode(payload: dict, token: str) -> PublishResult:
+    """Publish an article to Hashnode via GraphQL API."""
+
+    def send() -> PublishResult:
+        resp = get_client("hashnode").post(
+            HASHNODE_API_URL,
+            headers=_hashnode_headers(token),
+            json=payload,
+            timeout=retry.policy.timeout,
+        )
+        return _hashnode_result(resp, "publishPost")
+
+    return _guarded_create("hashnode", payload, token, send)
+
+
+def update_on_hashnode(post_id: str, article: Article, token: str) -> PublishResult:
+    """Update an existing Hashnode article via GraphQL API."""
+    resp = get_client("hashnode").post(
         HASHNODE_API_URL,
-        headers={"Authorization": token, "Content-Type": "application/json"},
-        json=payload,
-        timeout=30,
+        headers=_hashnode_headers(token),
+        json=_hashnode_update_payload(post_id, article),
+        timeout=retry.policy.timeout,
+        extensions={IDEMPOTENT: True},
     )
-    if resp.status_code != 200:
-        return PublishResult("hashnode", False, None, f"{resp.status_code}: {resp.text}")
-    data = resp.json()
-    if "errors" in data:
-        return PublishResult("hashnode", False, None, json.dumps(data["errors"]))
-    post = data.get("data", {}).get("updatePost", {}).get("post", {})
-    return PublishResult("hashnode", True, post.get("url"), None)
+    return _hashnode_result(resp, "updatePost")
 
 
 _HASHNODE_FIND_POSTS_QUERY = """\
@@ -385,6 +755,7 @@ query GetPublicationPosts($publicationId: ObjectId!, $first: Int!, $after: Strin
         node {
           id
           title
+          url
         }
       }
       pageInfo {
@@ -396,43 +767,456 @@ query GetPublicationPosts($publicationId: ObjectId!, $first: Int!, $after: Strin
 }"""
 
 
+def _hashnode_posts_request(publication_id: str, after: str | None) -> dict:
+    variables: dict = {"publicationId": publication_id, "first": 50}
+    if after:
+        variables["after"] = after
+    return {"query": _HASHNODE_FIND_POSTS_QUERY, "variables": variables}
+
+
+def _hashnode_posts_page(resp: httpx.Response) -> dict | None:
+    """Extract the ``posts`` connection from a response, or None on error."""
+    if resp.status_code != 200:
+        return None
+    data = resp.json()
+    if "errors" in data:
+        return None
+    return data.get("data", {}).get("publication", {}).get("posts", {})
+
+
+def iter_hashnode_posts(
+    publication_id: str, token: str, *, max_pages: int = _LISTING_PAGES["hashnode"],
+) -> Iterator[dict]:
+    """Yield publication's posts (id, title, url) page by page, stopping on error."""
+    # 50 posts per page
+    yield from _iter_listing(
+        "hashnode", token, max_pages=max_pages, publication_id=publication_id,
+    )
+
+
 def find_hashnode_post_by_title(
     title: str, publication_id: str, token: str,
 ) -> str | None:
     """Search publication's posts for a matching title. Returns post ID."""
-    after: str | None = None
-    for _ in range(3):  # max 3 pages (150 posts)
-        variables: dict = {"publicationId": publication_id, "first": 50}
-        if after:
-            variables["after"] = after
-        resp = httpx.post(
-            HASHNODE_API_URL,
-            headers={"Authorization": token, "Content-Type": "application/json"},
-            json={"query": _HASHNODE_FIND_POSTS_QUERY, "variables": variables},
-            timeout=30,
-        )
-        if resp.status_code != 200:
-            return None
-        data = resp.json()
-        if "errors" in data:
-            return None
-        posts_data = data.get("data", {}).get("publication", {}).get("posts", {})
-        for edge in posts_data.get("edges", []):
-            node = edge.get("node", {})
-            if node.get("title") == title:
-                return node["id"]
+    for node in iter_hashnode_posts(publication_id, token):
+        if node.get("title") == title:
+            return node["id"]
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Publisher — post listings
+# ---------------------------------------------------------------------------
+#
+# A user's posts are listed a page at a time: by page number on Qiita and
+# Dev.to, by cursor on Hashnode. The sync iterators above and the async
+# finders below share the request and page parsing here.
+
+def _listing_request(
+    platform: str,
+    credential: str,
+    cursor: Any,
+    *,
+    per_page: int | None = None,
+    publication_id: str | None = None,
+) -> dict:
+    """Keyword arguments for Client.request fetching the listing page at ``cursor``."""
+    if platform == "hashnode":
+        return {
+            "method": "POST",
+            "url": HASHNODE_API_URL,
+            "headers": _hashnode_headers(credential),
+            "json": _hashnode_posts_request(publication_id, cursor),
+            "timeout": retry.policy.timeout,
+            "extensions": {IDEMPOTENT: True},
+        }
+    if platform == "qiita":
+        url, headers = f"{QIITA_API_BASE}/authenticated_user/items", _qiita_headers(credential)
+    else:
+        url, headers = f"{DEVTO_API_BASE}/articles/me/published", _devto_headers(credential)
+    return {
+        "method": "GET",
+        "url": url,
+        "headers": headers,
+        "params": {"page": cursor, "per_page": per_page or _LISTING_PER_PAGE[platform]},
+        "timeout": retry.policy.timeout,
+    }
+
+
+def _listing_page(platform: str, resp: httpx.Response, cursor: Any) -> tuple[list[dict], Any]:
+    """The posts on a listing page and the next page's cursor (None after the last).
+
+    A failed request has no posts and no next page.
+    """
+    metrics.inc("publish_find_pages_total", platform=platform)
+    if platform == "hashnode":
+        posts_data = _hashnode_posts_page(resp)
+        if posts_data is None:
+            return [], None
+        nodes = [edge.get("node", {}) for edge in posts_data.get("edges", [])]
         page_info = posts_data.get("pageInfo", {})
-        if not page_info.get("hasNextPage"):
-            break
-        after = page_info.get("endCursor")
+        return nodes, page_info.get("endCursor") if page_info.get("hasNextPage") else None
+    if resp.status_code != 200:
+        return [], None
+    items = resp.json()
+    return items, cursor + 1 if items else None
+
+
+def _first_cursor(platform: str) -> Any:
+    return None if platform == "hashnode" else 1
+
+
+def _iter_listing(
+    platform: str, credential: str, *, max_pages: int, **request: Any,
+) -> Iterator[dict]:
+    """Yield the listed posts page by page, stopping on error or after ``max_pages``."""
+    cursor = _first_cursor(platform)
+    for _ in range(max_pages):
+        resp = get_client(platform).request(
+            **_listing_request(platform, credential, cursor, **request),
+        )
+        posts, cursor = _listing_page(platform, resp, cursor)
+        yield from posts
+        if cursor is None:
+            return
+
+
+async def _aiter_listing(
+    platform: str, credential: str, *, max_pages: int, **request: Any,
+) -> AsyncIterator[dict]:
+    """Async variant of _iter_listing."""
+    cursor = _first_cursor(platform)
+    for _ in range(max_pages):
+        resp = await get_async_client(platform).request(
+            **_listing_request(platform, credential, cursor, **request),
+        )
+        posts, cursor = _listing_page(platform, resp, cursor)
+        for post in posts:
+            yield post
+        if cursor is None:
+            return
+
+
+async def _find_by_title_async(
+    platform: str, title: str, credential: str, **request: Any,
+) -> Any | None:
+    async for post in _aiter_listing(
+        platform, credential, max_pages=_LISTING_PAGES[platform], **request,
+    ):
+        if post.get("title") == title:
+            return post["id"]
     return None
 
 
+# ---------------------------------------------------------------------------
+# Publisher — create retries
+# ---------------------------------------------------------------------------
+#
+# Creates are not idempotent: one that timed out or got a 5xx may still have
+# landed. Before sending it again, the newest posts are listed and a post
+# with the same title is taken as the earlier attempt's result. If that check
+# fails too, the create is not retried — a missing post is easier to fix than
+# a duplicate one.
+
+
+def _payload_title(platform: str, payload: dict) -> str | None:
+    if platform == "devto":
+        return payload.get("article", {}).get("title")
+    if platform == "hashnode":
+        return payload.get("variables", {}).get("input", {}).get("title")
+    return payload.get("title")
+
+
+def _recent_posts_request(platform: str, payload: dict, credential: str) -> dict:
+    """Keyword arguments for Client.request listing the newest posts, drafts included."""
+    if platform == "qiita":
+        return {
+            "method": "GET",
+            "url": f"{QIITA_API_BASE}/authenticated_user/items",
+            "headers": _qiita_headers(credential),
+            "params": {"page": 1, "per_page": 20},
+        }
+    if platform == "devto":
+        return {
+            "method": "GET",
+            "url": f"{DEVTO_API_BASE}/articles/me/all",
+            "headers": _devto_headers(credential),
+            "params": {"page": 1, "per_page": 30},
+        }
+    publication_id = payload.get("variables", {}).get("input", {}).get("publicationId")
+    return {
+        "method": "POST",
+        "url": HASHNODE_API_URL,
+        "headers": _hashnode_headers(credential),
+        "json": _hashnode_posts_request(publication_id, None),
+        "extensions": {IDEMPOTENT: True},
+    }
+
+
+def _landed_post(platform: str, resp: httpx.Response, title: str | None) -> PublishResult | None:
+    """Return the listed post titled ``title``; raise if the listing failed."""
+    resp.raise_for_status()
+    if platform == "hashnode":
+        posts_data = _hashnode_posts_page(resp)
+        if posts_data is None:
+            raise httpx.HTTPError(f"Hashnode posts query failed: {resp.text}")
+        items = [edge.get("node", {}) for edge in posts_data.get("edges", [])]
+    else:
+        items = resp.json()
+    for item in items:
+        if item.get("title") == title:
+            return PublishResult(platform, True, item.get("url"), None, item.get("id"))
+    return None
+
+
+def _transport_failure(platform: str, exc: httpx.TransportError) -> PublishResult:
+    return PublishResult(platform, False, None, f"{type(exc).__name__}: {exc}")
+
+
+def _failure_reason(result: PublishResult) -> str:
+    """Status code or exception name that a failed result's error starts with."""
+    return (result.error or "").split(":", 1)[0]
+
+
+def _create_steps(
+    platform: str, payload: dict, credential: str,
+) -> Generator[tuple[str, Any], Any, PublishResult]:
+    """The decisions of a guarded create, for a sync or an async driver.
+
+    Yields ``("sleep", seconds)``, ``("list", request kwargs)`` and
+    ``("send", None)``. A list step is answered with the response, or the
+    httpx.HTTPError raised. A send step is answered with the PublishResult,
+    or the httpx.TransportError raised. Returns the final result.
+    """
+    policy = retry.policy
+    title = _payload_title(platform, payload)
+    result: PublishResult | None = None
+    for attempt in range(1, policy.attempts + 1):
+        if result is not None:
+            yield "sleep", policy.backoff(attempt - 1)
+            resp = yield "list", {
+                **_recent_posts_request(platform, payload, credential), "timeout": policy.timeout,
+            }
+            if isinstance(resp, httpx.HTTPError):
+                return result
+            try:
+                landed = _landed_post(platform, resp, title)
+            except (httpx.HTTPError, ValueError):
+                return result
+            if landed is not None:
+                return landed
+            metrics.inc(
+                "publish_retries_total",
+                platform=platform, endpoint="create", reason=_failure_reason(result),
+            )
+        sent = yield "send", None
+        result = _transport_failure(platform, sent) if isinstance(sent, Exception) else sent
+        if not retry.is_transient_error(result.error):
+            return result
+    assert result is not None
+    return result
+
+
+def _guarded_create(
+    platform: str, payload: dict, credential: str, send: Callable[[], PublishResult],
+) -> PublishResult:
+    """Run ``send``, retrying transient failures unless the post already landed."""
+    steps = _create_steps(platform, payload, credential)
+    reply: Any = None
+    while True:
+        try:
+            action, arg = steps.send(reply)
+        except StopIteration as done:
+            return done.value
+        reply = None
+        if action == "sleep":
+            time.sleep(arg)
+        elif action == "list":
+            try:
+                reply = get_client(platform).request(**arg)
+            except httpx.HTTPError as e:
+                reply = e
+        else:
+            try:
+                reply = send()
+            except httpx.TransportError as e:
+                reply = e
+
+
+async def _guarded_create_async(
+    platform: str,
+    payload: dict,
+    credential: str,
+    send: Callable[[], Awaitable[PublishResult]],
+) -> PublishResult:
+    """Async variant of _guarded_create."""
+    steps = _create_steps(platform, payload, credential)
+    reply: Any = None
+    while True:
+        try:
+            action, arg = steps.send(reply)
+        except StopIteration as done:
+            return done.value
+        reply = None
+        if action == "sleep":
+            await asyncio.sleep(arg)
+        elif action == "list":
+            try:
+                reply = await get_async_client(platform).request(**arg)
+            except httpx.HTTPError as e:
+                reply = e
+        else:
+            try:
+                reply = await send()
+            except httpx.TransportError as e:
+                reply = e
+
+
+# ---------------------------------------------------------------------------
+# Publisher — async variants
+# ---------------------------------------------------------------------------
+#
+# Same requests and results as the sync publishers above, for callers that
+# fan out to several platforms at once (see scheduled_publish._process_entry).
+
+
+async def publish_to_qiita_async(payload: dict, token: str) -> PublishResult:
+    """Async variant of publish_to_qiita."""
+
+    async def send() -> PublishResult:
+        resp = await get_async_client("qiita").post(
+            f"{QIITA_API_BASE}/items",
+            headers=_qiita_headers(token),
+            json=payload,
+            timeout=retry.policy.timeout,
+        )
+        return _rest_result("qiita", resp, 201)
+
+    return await _guarded_create_async("qiita", payload, token, send)
+
+
+async def update_on_qiita_async(item_id: str, payload: dict, token: str) -> PublishResult:
+    """Async variant of update_on_qiita."""
+    resp = await get_async_client("qiita").patch(
+        f"{QIITA_API_BASE}/items/{item_id}",
+        headers=_qiita_headers(token),
+        json=payload,
+        timeout=retry.policy.timeout,
+    )
+    return _rest_result("qiita", resp, 200)
+
+
+async def find_qiita_item_by_title_async(title: str, token: str) -> str | None:
+    """Async variant of find_qiita_item_by_title."""
+    return await _find_by_title_async("qiita", title, token)
+
+
+async def publish_to_devto_async(payload: dict, api_key: str) -> PublishResult:
+    """Async variant of publish_to_devto."""
+
+    async def send() -> PublishResult:
+        resp = await get_async_client("devto").post(
+            f"{DEVTO_API_BASE}/articles",
+            headers=_devto_headers(api_key),
+            json=payload,
+            timeout=retry.policy.timeout,
+        )
+        return _rest_result("devto", resp, 201)
+
+    return await _guarded_create_async("devto", payload, api_key, send)
+
+
+async def update_on_devto_async(article_id: int, payload: dict, api_key: str) -> PublishResult:
+    """Async variant of update_on_devto."""
+    resp = await get_async_client("devto").put(
+        f"{DEVTO_API_BASE}/articles/{article_id}",
+        headers=_devto_headers(api_key),
+        json=payload,
+        timeout=retry.policy.timeout,
+    )
+    return _rest_result("devto", resp, 200)
+
+
+async def find_devto_article_by_title_async(title: str, api_key: str) -> int | None:
+    """Async variant of find_devto_article_by_title."""
+    return await _find_by_title_async("devto", title, api_key)
+
+
+async def publish_to_hashnode_async(payload: dict, token: str) -> PublishResult:
+    """Async variant of publish_to_hashnode."""
+
+    async def send() -> PublishResult:
+        resp = await get_async_client("hashnode").post(
+            HASHNODE_API_URL,
+            headers=_hashnode_headers(token),
+            json=payload,
+            timeout=retry.policy.timeout,
+        )
+        return _hashnode_result(resp, "publishPost")
+
+    return await _guarded_create_async("hashnode", payload, token, send)
+
+
+async def update_on_hashnode_async(post_id: str, article: Article, token: str) -> PublishResult:
+    """Async variant of update_on_hashnode."""
+    resp = await get_async_client("hashnode").post(
+        HASHNODE_API_URL,
+        headers=_hashnode_headers(token),
+        json=_hashnode_update_payload(post_id, article),
+        timeout=retry.policy.timeout,
+        extensions={IDEMPOTENT: True},
+    )
+    return _hashnode_result(resp, "updatePost")
+
+
+async def find_hashnode_post_by_title_async(
+    title: str, publication_id: str, token: str,
+) -> str | None:
+    """Async variant of find_hashnode_post_by_title."""
+    return await _find_by_title_async(
+        "hashnode", title, token, publication_id=publication_id,
+    )
+
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
 
 
+PLATFORMS = ("qiita", "devto", "hashnode")
+
+
+def _platform_arg(value: str) -> str:
+    """argparse type: a platform name, a comma-separated list, or 'all'."""
+    names = [name.strip().lower() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name != "all" and name not in PLATFORMS]
+    if not names or unknown:
+        raise argparse.ArgumentTypeError(
+            f"invalid platform: {value!r} (choose from {', '.join(PLATFORMS)} or all)"
+        )
+    return ",".join(names)
+
+
+def _expand_platforms(value: str) -> list[str]:
+    """Expand a validated --platform value into platform names."""
+    names = value.split(",")
+    if "all" in names:
+        return list(PLATFORMS)
+    return list(dict.fromkeys(names))
+
+
+def _expand_article_paths(patterns: list[Path]) -> list[Path]:
+    """Expand glob patterns; plain paths are kept even if missing."""
+    paths: list[Path] = []
+    for pattern in patterns:
+        text = str(pattern)
+        if glob.has_magic(text):
+            paths.extend(Path(match) for match in sorted(glob.glob(text)))
+        else:
+            paths.append(pattern)
+    return list(dict.fromkeys(paths))
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Cross-post Zenn articles to other platforms",
@@ -440,13 +1224,14 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "article",
         type=Path,
-        help="Path to the Zenn article markdown file",
+        nargs="+",
+        help="Path(s) or glob pattern(s) of Zenn article markdown files",
     )
     parser.add_argument(
         "--platform",
-        choices=["qiita", "devto", "hashnode"],
+        type=_platform_arg,
         required=True,
-        help="Target platform",
+        help="Target platform: qiita, devto, hashnode, a comma-separated list, or all",
     )
     parser.add_argument(
         "--dry-run",
@@ -460,13 +1245,31 @@ def build_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument(
         "--canonical-url",
-        help="Canonical URL of the original article (e.g. Zenn URL)",
+        help="Canonical URL of the original article (e.g. Zenn URL). "
+        "'{slug}' is replaced by each article's file name stem.",
     )
     parser.add_argument(
         "--force",
         action="store_true",
         help="Skip English translation check for devto/hashnode",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Maximum concurrent publish requests in batch mode (default: 4)",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        help="Retries after a timeout or 5xx (default: PUBLISH_RETRIES or 2)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="Per-request timeout in seconds (default: PUBLISH_TIMEOUT or 30)",
+    )
+    profiling.add_argument(parser)
     return parser
 
 
@@ -634,7 +1437,7 @@ def _check_english_translation(article_path: Path, args: argparse.Namespace) ->
         return None
 
     en_path = article_path.parent.parent / "articles-en" / article_path.name
-    if en_path.exists():
+    if _article_index().pair(article_path) == en_path:
         print(
             f"Warning: English version exists at {en_path}\n"
             f"Use the English version for {args.platform}, or pass --force to skip this check.",
@@ -649,13 +1452,158 @@ def _check_english_translation(article_path: Path, args: argparse.Namespace) ->
     return 1
 
 
+# ---------------------------------------------------------------------------
+# CLI — batch mode
+# ---------------------------------------------------------------------------
+
+
+def _failure(platform: str, error: str) -> PublishResult:
+    return PublishResult(platform, False, None, error)
+
+
+async def _publish_job(
+    article: Article, platform: str, canonical_url: str | None, update: str | None,
+) -> PublishResult:
+    """Publish (or update, with update='auto') one article on one platform."""
+    if platform == "qiita":
+        token = os.environ.get("QIITA_ACCESS_TOKEN")
+        if not token:
+            return _failure(platform, "QIITA_ACCESS_TOKEN is not set")
+        payload = convert_to_qiita(article)
+        if update:
+            item_id = await find_qiita_item_by_title_async(article.title, token)
+            if not item_id:
+                return _failure(platform, "article not found on Qiita")
+            return await update_on_qiita_async(item_id, payload, token)
+        return await publish_to_qiita_async(payload, token)
+
+    if platform == "devto":
+        api_key = os.environ.get("DEVTO_API_KEY")
+        if not api_key:
+            return _failure(platform, "DEVTO_API_KEY is not set")
+        payload = convert_to_devto(article, canonical_url=canonical_url)
+        if update:
+            article_id = await find_devto_article_by_title_async(article.title, api_key)
+            if not article_id:
+                return _failure(platform, "article not found on Dev.to")
+            return await update_on_devto_async(article_id, payload, api_key)
+        return await publish_to_devto_async(payload, api_key)
+
+    token = os.environ.get("HASHNODE_API_TOKEN")
+    publication_id = os.environ.get("HASHNODE_PUBLICATION_ID")
+    if not token:
+        return _failure(platform, "HASHNODE_API_TOKEN is not set")
+    if not publication_id or publication_id == "PLACEHOLDER":
+        return _failure(platform, "HASHNODE_PUBLICATION_ID is not set")
+    if update:
+        return _failure(platform, "auto-search not supported for Hashnode")
+    payload = convert_to_hashnode(article, publication_id, canonical_url=canonical_url)
+    return await publish_to_hashnode_async(payload, token)
+
+
+def _dry_run_payload(article: Article, platform: str, canonical_url: str | None) -> dict:
+    """The payload a batch job would send, converted as in single-article mode."""
+    if platform == "qiita":
+        return convert_to_qiita(article)
+    if platform == "devto":
+        return convert_to_devto(article, canonical_url=canonical_url)
+    publication_id = os.environ.get("HASHNODE_PUBLICATION_ID", "PLACEHOLDER")
+    return convert_to_hashnode(article, publication_id, canonical_url=canonical_url)
+
+
+async def _run_batch_jobs(
+    paths: list[Path], platforms: list[str], args: argparse.Namespace,
+) -> list[tuple[Path, PublishResult]]:
+    semaphore = asyncio.Semaphore(max(1, args.concurrency))
+
+    async def _job(path: Path, platform: str) -> PublishResult:
+        if not path.exists():
+            return _failure(platform, "file not found")
+        job_args = argparse.Namespace(**{**vars(args), "platform": platform})
+        if _check_english_translation(path, job_args) is not None:
+            return _failure(platform, "Japanese article (pass --force to publish anyway)")
+        canonical = (
+            args.canonical_url.replace("{slug}", path.stem) if args.canonical_url else None
+        )
+        try:
+            article = parse_zenn_article(path)
+            payload = _dry_run_payload(article, platform, canonical) if args.dry_run else None
+        except (OSError, ValueError) as e:  # unreadable or undecodable article
+            return _failure(platform, f"conversion failed: {type(e).__name__}: {e}")
+        if payload is not None:
+            print(f"\n=== {path} ===")
+            _print_dry_run(platform, payload)
+            return PublishResult(platform, True, None, None)
+        async with semaphore:
+            try:
+                return await _publish_job(article, platform, canonical, args.update)
+            except httpx.HTTPError as e:
+                return _failure(platform, f"{type(e).__name__}: {e}")
+
+    jobs = [(path, platform) for path in paths for platform in platforms]
+    try:
+        results = await asyncio.gather(*(_job(path, platform) for path, platform in jobs))
+    finally:
+        await aclose_clients()
+    return [(path, result) for (path, _), result in zip(jobs, results)]
+
+
+def _print_batch_table(results: list[tuple[Path, PublishResult]], *, dry_run: bool) -> None:
+    width = max([len(str(path)) for path, _ in results] + [7])
+    print(f"\n{'Article':<{width}}  {'Platform':<9} {'Result':<8} Detail")
+    print("-" * (width + 40))
+    for path, result in results:
+        if not result.success:
+            status, detail = "FAIL", f"{result.error or ''}"[:200]
+        elif dry_run:
+            status, detail = "dry-run", ""
+        else:
+            status, detail = "OK", result.url or ""
+        print(f"{str(path):<{width}}  {result.platform:<9} {status:<8} {detail}")
+
+
+def _run_batch(paths: list[Path], platforms: list[str], args: argparse.Namespace) -> int:
+    """Publish every article to every platform concurrently in one process."""
+    if args.update and args.update != "auto":
+        print("Error: batch mode only supports --update auto", file=sys.stderr)
+        return 1
+    if args.canonical_url and "{slug}" not in args.canonical_url and len(paths) > 1:
+        print(
+            "Error: --canonical-url must contain {slug} when publishing several articles",
+            file=sys.stderr,
+        )
+        return 1
+
+    results = asyncio.run(_run_batch_jobs(paths, platforms, args))
+    _print_batch_table(results, dry_run=args.dry_run)
+    failures = sum(1 for _, result in results if not result.success)
+    print(f"\n{len(results) - failures} succeeded, {failures} failed.")
+    return 1 if failures else 0
+
+
 def main() -> int:
     _load_env(Path(__file__).parent / ".env")
 
     parser = build_parser()
     args = parser.parse_args()
+    retry.configure(retries=args.retries, timeout=args.timeout)
+    with profiling.profiled(args.profile, "publish"):
+        return _run(args)
+
+
+def _run(args: argparse.Namespace) -> int:
+    paths = _expand_article_paths(args.article)
+    platforms = _expand_platforms(args.platform)
+    if not paths:
+        print("Error: no articles matched", file=sys.stderr)
+        return 1
+    if len(paths) > 1 or len(platforms) > 1:
+        return _run_batch(paths, platforms, args)
 
-    article_path: Path = args.article
+    article_path = args.article = paths[0]
+    args.platform = platforms[0]
+    if args.canonical_url:
+        args.canonical_url = args.canonical_url.replace("{slug}", article_path.stem)
     if not article_path.exists():
         print(f"Error: file not found: {article_path}", file=sys.stderr)
         return 1
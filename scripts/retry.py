@@ -0,0 +1,174 @@
+"""Retries with jittered exponential backoff for transient publisher failures.
+
+Transient means a transport error (timeout, connection reset, DNS) or a
+500/502/503/504 response. Idempotent requests (GET/PUT/PATCH, and POSTs sent
+with ``extensions={IDEMPOTENT: True}`` such as GraphQL queries) are retried
+transparently by RetryTransport. Creates are not idempotent; publish.py
+retries them itself, after checking that the failed attempt did not land.
+
+configure() sets the policy from PUBLISH_RETRIES / PUBLISH_TIMEOUT and the
+CLIs' --retries / --timeout options. The environment is read there rather
+than at import, so values from a .env file loaded by the CLI apply too.
+Until then the defaults below are in effect.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+
+import httpx
+
+TRANSIENT_STATUS = frozenset({500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "PATCH", "DELETE"})
+
+# Request extension marking a POST as safe to resend.
+IDEMPOTENT = "publish_idempotent"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int = 3  # total tries, including the first
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    timeout: float = 30.0  # per request
+
+    def backoff(self, retry: int) -> float:
+        """Full-jitter delay before retry number ``retry`` (1-based)."""
+        cap = min(self.max_delay, self.base_delay * 2 ** (retry - 1))
+        return random.uniform(0, cap)
+
+    @classmethod
+    def from_env(cls, base: RetryPolicy | None = None) -> RetryPolicy:
+        """``base`` (default: the defaults) with PUBLISH_RETRIES / PUBLISH_TIMEOUT applied.
+
+        An invalid value is ignored with a warning.
+        """
+        policy = base or cls()
+        if (retries := _env_number("PUBLISH_RETRIES", int)) is not None:
+            policy = replace(policy, attempts=retries + 1)
+        if (timeout := _env_number("PUBLISH_TIMEOUT", float)) is not None and timeout > 0:
+            policy = replace(policy, timeout=timeout)
+        elif timeout is not None:
+            logger.warning("Ignoring PUBLISH_TIMEOUT=%s: must be positive", timeout)
+        return policy
+
+
+def _env_number(name: str, convert: Callable[[str], float]) -> float | None:
+    """The non-negative number in ``name``, or None if unset or invalid."""
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return None
+    try:
+        value = convert(raw)
+    except ValueError:
+        value = -1
+    if value < 0:
+        logger.warning("Ignoring %s=%r: not a non-negative number", name, raw)
+        return None
+    return value
+
+
+policy = RetryPolicy()
+
+
+def configure(
+    *, retries: int | None = None, timeout: float | None = None,
+) -> RetryPolicy:
+    """Set the process-wide policy from the environment and the overrides.
+
+    ``retries`` excludes the first try. Calling it again is harmless: the
+    environment only ever sets the attempt count and timeout.
+    """
+    global policy
+    policy = RetryPolicy.from_env(policy)
+    if retries is not None:
+        policy = replace(policy, attempts=max(1, retries + 1))
+    if timeout is not None:
+        policy = replace(policy, timeout=timeout)
+    return policy
+
+
+def is_idempotent(request: httpx.Request) -> bool:
+    return request.method in IDEMPOTENT_METHODS or bool(request.extensions.get(IDEMPOTENT))
+
+
+def is_transient_error(error: str | None) -> bool:
+    """True for a PublishResult error string from a transient failure.
+
+    Errors are ``"<status>: <body>"`` for HTTP failures, or
+    ``"<ExceptionName>: <message>"`` for transport errors.
+    """
+    if not error:
+        return False
+    head = error.split(":", 1)[0]
+    if head.isdigit():
+        return int(head) in TRANSIENT_STATUS
+    exc_type = getattr(httpx, head, None)
+    return isinstance(exc_type, type) and issubclass(exc_type, httpx.TransportError)
+
+
+class RetryTransport(httpx.BaseTransport):
+    """Sync transport retrying idempotent requests on transient failures."""
+
+    def __init__(
+        self, transport: httpx.BaseTransport, *, sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._transport = transport
+        self._sleep = sleep
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if not is_idempotent(request):
+            return self._transport.handle_request(request)
+        current = policy
+        for attempt in range(1, current.attempts + 1):
+            last = attempt == current.attempts
+            try:
+                response = self._transport.handle_request(request)
+            except httpx.TransportError:
+                if last:
+                    raise
+            else:
+                if last or response.status_code not in TRANSIENT_STATUS:
+                    return response
+                response.close()
+            self._sleep(current.backoff(attempt))
+        raise AssertionError("unreachable")
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncRetryTransport(httpx.AsyncBaseTransport):
+    """Async transport retrying idempotent requests on transient failures."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not is_idempotent(request):
+            return await self._transport.handle_async_request(request)
+        current = policy
+        for attempt in range(1, current.attempts + 1):
+            last = attempt == current.attempts
+            try:
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError:
+                if last:
+                    raise
+            else:
+                if last or response.status_code not in TRANSIENT_STATUS:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(current.backoff(attempt))
+        raise AssertionError("unreachable")
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,133 @@
+"""schedule.json storage with a per-entry append-only journal.
+
+schedule.json stays the human-readable, git-tracked copy of the schedule.
+During a run, each changed entry is appended as one JSON line to
+schedule.journal and fsynced. This replaces rewriting the whole file after
+every entry. load() replays the journal over schedule.json, matching
+entries by ``file``, so a crash loses at most the line being written.
+
+save() writes a full snapshot atomically (temp file + rename) and drops the
+journal. compact() does the same for the current state. Scripts call it at
+the end of a run, and put_entry() calls it once the journal grows past
+COMPACT_BYTES.
+
+zenn_publish.py, which runs outside the venv, reads and writes the schedule
+through this module, so it must not import third-party packages.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import stat
+import tempfile
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+SCHEDULE_PATH = Path(__file__).parent / "schedule.json"
+
+# Fold the journal into schedule.json once it grows past this size.
+COMPACT_BYTES = 256 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduleStore:
+    """schedule.json plus its journal of entry updates."""
+
+    def __init__(self, path: Path = SCHEDULE_PATH) -> None:
+        self.path = path
+        self.journal_path = path.with_suffix(".journal")
+
+    def load(self) -> dict[str, Any]:
+        """Return the schedule with journaled updates applied.
+
+        Raises FileNotFoundError / json.JSONDecodeError for a missing or
+        broken schedule.json, like json.loads(path.read_text()) did.
+        """
+        schedule = json.loads(self.path.read_text())
+        return _replay(schedule, self._journal_entries())
+
+    def put_entry(self, entry: dict[str, Any]) -> None:
+        """Durably record one entry's new state."""
+        self.put_entries([entry])
+
+    def put_entries(self, entries: Iterable[dict[str, Any]]) -> None:
+        """Durably record several entries' new state in one append."""
+        lines = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+        if not lines:
+            return
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        if self.journal_path.stat().st_size > COMPACT_BYTES:
+            self.compact()
+
+    def save(self, schedule: dict[str, Any]) -> None:
+        """Atomically replace schedule.json with ``schedule`` and drop the journal."""
+        data = json.dumps(schedule, indent=2, ensure_ascii=False) + "\n"
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".schedule-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp creates 0600 files; keep the tracked file's mode.
+            os.chmod(tmp, _file_mode(self.path))
+            os.replace(tmp, self.path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        # A crash before this unlink only means the (idempotent) journal is
+        # replayed once more on the next load.
+        self.journal_path.unlink(missing_ok=True)
+
+    def compact(self) -> None:
+        """Fold the journal into schedule.json."""
+        if self.journal_path.exists():
+            self.save(self.load())
+
+    def _journal_entries(self) -> list[dict[str, Any]]:
+        try:
+            text = self.journal_path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return []
+        entries = []
+        for lineno, line in enumerate(text.splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Torn write from a crash; everything before it is intact.
+                logger.warning("Ignoring corrupt journal line %d in %s", lineno, self.journal_path)
+        return entries
+
+
+def _file_mode(path: Path) -> int:
+    """Permission bits of ``path``; for a new file, what open() would give."""
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def _replay(schedule: dict[str, Any], entries: list[dict[str, Any]]) -> dict[str, Any]:
+    """Apply journaled entries: replace the entry with the same file, else append."""
+    if not entries:
+        return schedule
+    articles = list(schedule.get("articles", []))
+    index = {entry.get("file"): i for i, entry in enumerate(articles)}
+    for entry in entries:
+        i = index.get(entry.get("file"))
+        if i is None:
+            index[entry.get("file")] = len(articles)
+            articles.append(entry)
+        else:
+            articles[i] = entry
+    return {**schedule, "articles": articles}
@@ -3,49 +3,72 @@
 Run daily via launchd at 09:00 JST (00:00 UTC).
 Publishes articles whose date <= today and haven't been posted yet.
 Zenn articles are published first (frontmatter + git push), then cross-posted.
+daemon.py runs the same steps as a long-lived process, at each entry's
+exact due time (date plus ``post_time_utc``).
 
 Usage:
     python scheduled_publish.py              # Post due articles
     python scheduled_publish.py --dry-run    # Preview without posting
     python scheduled_publish.py --status     # Show schedule status
+    python scheduled_publish.py --reconcile  # Import remote post IDs
+    python scheduled_publish.py --verify     # Compare live posts with local articles
+    python scheduled_publish.py --check-links  # Hold back entries with broken links
+    python scheduled_publish.py --metrics-dir /var/lib/node_exporter/textfile
+    python scheduled_publish.py --profile /tmp/prof  # Also write a CPU/memory profile
 """
 
 from __future__ import annotations
 
 import argparse
+import heapq
 import json
 import logging
 import os
-import subprocess
-from collections.abc import Callable
-from datetime import date
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from datetime import UTC, date, datetime
 from pathlib import Path
-from typing import Any, NamedTuple
-
-import frontmatter
-
-from publish import (
-    PublishResult,
-    _load_env,
-    convert_to_devto,
-    convert_to_hashnode,
-    convert_to_qiita,
-    find_devto_article_by_title,
-    find_hashnode_post_by_title,
-    find_qiita_item_by_title,
-    parse_zenn_article,
-    publish_to_devto,
-    publish_to_hashnode,
-    publish_to_qiita,
-    update_on_devto,
-    update_on_hashnode,
-    update_on_qiita,
-)
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import profiling
+from article_index import read_frontmatter
+from git_ops import GitError, commit_and_push
+from lazy import lazy_import
+from schedule_store import ScheduleStore
+
+# Loaded on first use, so --status starts without httpx/asyncio (see lazy.py).
+if TYPE_CHECKING:
+    import asyncio
+
+    import drift
+    import frontmatter
+    import httpx
+
+    import hashnode_batch
+    import linkcheck
+    import metrics
+    import publish
+    import retry
+    from publish import PublishResult
+else:
+    asyncio = lazy_import("asyncio")
+    drift = lazy_import("drift")
+    frontmatter = lazy_import("frontmatter")
+    hashnode_batch = lazy_import("hashnode_batch")
+    httpx = lazy_import("httpx")
+    linkcheck = lazy_import("linkcheck")
+    metrics = lazy_import("metrics")
+    publish = lazy_import("publish")
+    retry = lazy_import("retry")
 
 SCRIPT_DIR = Path(__file__).parent
 REPO_ROOT = SCRIPT_DIR.parent
 SCHEDULE_PATH = SCRIPT_DIR / "schedule.json"
 LOG_PATH = SCRIPT_DIR / "publish.log"
+# Point at node exporter's textfile collector directory on the scheduler host.
+METRICS_DIR = Path(os.environ.get("PUBLISH_METRICS_DIR", SCRIPT_DIR / "metrics"))
+CONCURRENCY = 4  # entries cross-posted at once
 
 logger = logging.getLogger(__name__)
 
@@ -63,9 +86,13 @@ def _setup_logging() -> None:
     logger.setLevel(logging.INFO)
 
 
+def _store() -> ScheduleStore:
+    return ScheduleStore(SCHEDULE_PATH)
+
+
 def load_schedule() -> dict[str, Any]:
     try:
-        return json.loads(SCHEDULE_PATH.read_text())
+        return _store().load()
     except FileNotFoundError:
         logger.error("Schedule file not found: %s", SCHEDULE_PATH)
         raise SystemExit(1)
@@ -75,7 +102,14 @@ def load_schedule() -> dict[str, Any]:
 
 
 def save_schedule(schedule: dict[str, Any]) -> None:
-    SCHEDULE_PATH.write_text(json.dumps(schedule, indent=2, ensure_ascii=False) + "\n")
+    with metrics.phase("save"):
+        _store().save(schedule)
+
+
+def save_entry(entry: dict[str, Any]) -> None:
+    """Persist one updated entry without rewriting schedule.json."""
+    with metrics.phase("save"):
+        _store().put_entry(entry)
 
 
 def _needs_posting(value: str | None) -> bool:
@@ -157,9 +191,9 @@ def show_status(schedule: dict[str, Any]) -> None:
         )
 
 
-def _try_publish(
+async def _try_publish(
     platform: str,
-    publish_fn: Callable[[], PublishResult],
+    publish_fn: Callable[[], Awaitable[PublishResult]],
     *,
     dry_run: bool,
     title: str,
@@ -168,7 +202,14 @@ def _try_publish(
     if dry_run:
         logger.info("  [DRY-RUN] Would publish to %s: %s", platform, title)
         return None, False
-    result = publish_fn()
+    try:
+        result = await publish_fn()
+    except httpx.TransportError as e:  # still failing after retries
+        logger.warning("  %s FAIL: %s: %s", platform, type(e).__name__, e)
+        return None, True
+    if result.unchanged:
+        logger.info("  %s unchanged, skipped: %s", platform, result.url)
+        return result.url, False
     if result.success:
         logger.info("  %s OK: %s", platform, result.url)
         return result.url, False
@@ -189,60 +230,72 @@ def _validate_article_path(file_path: str) -> Path | None:
 
 
 # ---------------------------------------------------------------------------
-# Zenn publishing (frontmatter + git push)
+# Due times
 # ---------------------------------------------------------------------------
 
 
-def _publish_zenn_article(article_path: Path, *, dry_run: bool) -> bool:
-    """Set published: true in frontmatter and git push.
+def _post_time(entry: dict[str, Any], schedule: dict[str, Any]) -> str | None:
+    """``post_time_utc`` (HH:MM) of an entry, else of the schedule, else None."""
+    return entry.get("post_time_utc", schedule.get("post_time_utc"))
+
+
+def due_at(day: str, post_time: str | None) -> datetime:
+    """When an entry dated ``day`` becomes due.
 
-    Returns True on success, False on error.
+    ``post_time`` (HH:MM, UTC) on that day; local midnight without one.
     """
-    post = frontmatter.load(str(article_path))
-    if post.metadata.get("published") is True:
+    start = date.fromisoformat(day)
+    if post_time is None:
+        return datetime.combine(start, datetime.min.time()).astimezone()
+    return datetime.combine(start, datetime.strptime(post_time, "%H:%M").time(), tzinfo=UTC)
+
+
+def _reached(day: str, post_time: str | None, now: datetime | None) -> bool:
+    """Whether ``day`` has come: by date when ``now`` is None (the daily
+    run), to the minute otherwise (the daemon, see daemon.py)."""
+    if now is None:
+        return date.fromisoformat(day) <= date.today()
+    return due_at(day, post_time) <= now
+
+
+def _is_due(entry: dict[str, Any], schedule: dict[str, Any], now: datetime | None) -> bool:
+    return _reached(entry["date"], _post_time(entry, schedule), now) and not _is_entry_done(entry)
+
+
+# ---------------------------------------------------------------------------
+# Zenn publishing (frontmatter + git push)
+# ---------------------------------------------------------------------------
+
+
+def _set_zenn_published(article_path: Path, *, dry_run: bool) -> bool:
+    """Set published: true in frontmatter. Returns True if the file changed."""
+    if read_frontmatter(article_path).get("published") is True:
         logger.info("  Zenn: already published (frontmatter)")
-        return True
+        return False
 
     if dry_run:
         logger.info("  [DRY-RUN] Would set published: true in %s", article_path.name)
         return True
 
+    post = frontmatter.load(str(article_path))
     post.metadata["published"] = True
     article_path.write_text(frontmatter.dumps(post) + "\n")
     logger.info("  Zenn: set published: true in %s", article_path.name)
-
-    # Git add only this specific file, commit, and push
-    rel_path = article_path.relative_to(REPO_ROOT)
-    try:
-        subprocess.run(
-            ["git", "add", str(rel_path)],
-            cwd=REPO_ROOT, check=True, capture_output=True,
-        )
-        subprocess.run(
-            ["git", "commit", "-m", f"feat: Zenn 自動公開 ({date.today()})"],
-            cwd=REPO_ROOT, check=True, capture_output=True,
-        )
-        subprocess.run(
-            ["git", "push"],
-            cwd=REPO_ROOT, check=True, capture_output=True, timeout=60,
-        )
-        logger.info("  Zenn: git push completed")
-        return True
-    except subprocess.CalledProcessError as e:
-        logger.error("  Zenn: git operation failed: %s", e.stderr.decode().strip())
-        return False
-    except subprocess.TimeoutExpired:
-        logger.error("  Zenn: git push timed out")
-        return False
+    return True
 
 
 def _process_zenn_entries(
-    schedule: dict[str, Any], *, dry_run: bool,
+    schedule: dict[str, Any], *, dry_run: bool, now: datetime | None = None,
 ) -> tuple[dict[str, Any], int, int]:
-    """Publish due Zenn articles. Returns (updated_schedule, publish_count, error_count)."""
+    """Publish due Zenn articles. Returns (updated_schedule, publish_count, error_count).
+
+    All due articles go out in one commit and one push. Entries are marked
+    zenn_published only once the push has succeeded. ``now`` is as for
+    publish_due().
+    """
     today = date.today()
     updated_articles = list(schedule["articles"])
-    published = 0
+    due: list[int] = []
     errors = 0
 
     for i, entry in enumerate(updated_articles):
@@ -252,7 +305,7 @@ def _process_zenn_entries(
             continue
         if entry.get("zenn_published") is not False:
             continue
-        if date.fromisoformat(zenn_date_str) > today:
+        if not _reached(zenn_date_str, _post_time(entry, schedule), now):
             continue
 
         article_path = _validate_article_path(entry["file"])
@@ -261,17 +314,32 @@ def _process_zenn_entries(
             continue
 
         logger.info("Zenn publishing: %s", entry["file"])
-        if _publish_zenn_article(article_path, dry_run=dry_run):
-            if not dry_run:
-                updated_articles[i] = {**entry, "zenn_published": True}
-            published += 1
-        else:
+        try:
+            _set_zenn_published(article_path, dry_run=dry_run)
+        except OSError as e:
+            logger.error("  Zenn: could not update %s: %s", entry["file"], e)
             errors += 1
+            continue
+        due.append(i)
 
+    if not due or dry_run:
+        return {**schedule, "articles": updated_articles}, len(due), errors
+
+    # Every due file is staged, not only those flipped now: one flipped by an
+    # earlier run whose commit or push failed must reach the remote as well.
+    paths = [updated_articles[i]["file"] for i in due]
+    try:
+        commit_and_push(REPO_ROOT, paths, f"feat: Zenn 自動公開 ({today})")
+    except GitError as e:
+        logger.error("  Zenn: git operation failed: %s", e)
+        return {**schedule, "articles": updated_articles}, 0, errors + 1
+    logger.info("  Zenn: git push completed (%d article(s))", len(due))
+
+    for i in due:
+        updated_articles[i] = {**updated_articles[i], "zenn_published": True}
     updated_schedule = {**schedule, "articles": updated_articles}
-    if published > 0 and not dry_run:
-        save_schedule(updated_schedule)
-    return updated_schedule, published, errors
+    save_schedule(updated_schedule)
+    return updated_schedule, len(due), errors
 
 
 class _Credentials(NamedTuple):
@@ -283,7 +351,7 @@ class _Credentials(NamedTuple):
 
 def _load_credentials() -> _Credentials | None:
     """Load and validate API credentials from environment."""
-    _load_env(SCRIPT_DIR / ".env")
+    publish._load_env(SCRIPT_DIR / ".env")
 
     qiita_token = os.environ.get("QIITA_ACCESS_TOKEN")
     devto_key = os.environ.get("DEVTO_API_KEY")
@@ -309,153 +377,565 @@ def _load_credentials() -> _Credentials | None:
     )
 
 
-def _process_entry(
-    entry: dict[str, Any], creds: _Credentials, *, dry_run: bool,
+def _remote_record(entry: dict[str, Any], key: str) -> dict[str, Any]:
+    """Return the recorded remote post for a platform: {"id", "url", "hash"}."""
+    return entry.get("remote", {}).get(key, {})
+
+
+async def _upsert(
+    key: str,
+    label: str,
+    record: dict[str, Any],
+    content_hash: str,
+    find: Callable[[], Awaitable[str | int | None]],
+    update: Callable[[str | int], Awaitable[PublishResult]],
+    create: Callable[[], Awaitable[PublishResult]],
+) -> PublishResult:
+    """Update the known remote post, or create one if none exists.
+
+    The ID recorded in the schedule is used directly; the title scan via
+    ``find`` is only a fallback for entries that have no recorded ID yet, or
+    whose recorded post no longer exists (``result.not_found``: a REST 404
+    or a Hashnode NOT_FOUND error). When the recorded payload hash matches
+    ``content_hash`` no request is sent at all.
+    """
+    existing_id = record.get("id")
+    if existing_id is not None:
+        if record.get("hash") == content_hash:
+            return publish.PublishResult(
+                key, True, record.get("url"), None, existing_id, unchanged=True,
+            )
+        result = await update(existing_id)
+        if result.success or not result.not_found:
+            return result
+        logger.info("  %s: recorded post %s not found, searching by title", label, existing_id)
+    existing_id = await find()
+    if existing_id:
+        logger.info("  %s: existing post found (%s), updating", label, existing_id)
+        return await update(existing_id)
+    return await create()
+
+
+async def _process_entry(
+    entry: dict[str, Any],
+    creds: _Credentials,
+    *,
+    dry_run: bool,
+    stats: Counter[str] | None = None,
+    hashnode: hashnode_batch.HashnodeBatcher | None = None,
 ) -> tuple[dict[str, Any], int]:
-    """Process a single schedule entry. Returns (updated_entry, error_count)."""
+    """Process a single schedule entry. Returns (updated_entry, error_count).
+
+    All pending platforms are posted concurrently, so an entry takes as long
+    as its slowest platform rather than the sum of all of them. Platforms
+    whose payload is unchanged since the last sync are counted in
+    ``stats["unchanged"]``. Hashnode calls go through ``hashnode`` when
+    given, so entries processed together share GraphQL requests.
+    """
     article_path = _validate_article_path(entry["file"])
     if article_path is None:
         return entry, 1
 
-    article = parse_zenn_article(article_path)
+    article = publish.parse_zenn_article(article_path)
     canonical = entry["canonical_url"]
     logger.info("Processing: %s (date=%s)", article.title, entry["date"])
-    updates: dict[str, Any] = {}
-    errors = 0
+    remote: dict[str, Any] = dict(entry.get("remote", {}))
+    jobs: list[tuple[str, Awaitable[tuple[str | None, bool]]]] = []
+
+    async def _record(
+        key: str, content_hash: str, pending: Awaitable[PublishResult],
+    ) -> PublishResult:
+        result = await pending
+        if result.unchanged and stats is not None:
+            stats["unchanged"] += 1
+        if result.success and result.remote_id is not None:
+            remote[key] = {"id": result.remote_id, "url": result.url, "hash": content_hash}
+        return result
 
     if "qiita" in entry and _needs_posting(entry.get("qiita")):
-        def _qiita_upsert() -> PublishResult:
-            payload = convert_to_qiita(article)
-            existing_id = find_qiita_item_by_title(article.title, creds.qiita_token)
-            if existing_id:
-                logger.info("  Qiita: existing article found (%s), updating", existing_id)
-                return update_on_qiita(existing_id, payload, creds.qiita_token)
-            return publish_to_qiita(payload, creds.qiita_token)
-        url, failed = _try_publish(
+        def _qiita_upsert() -> Awaitable[PublishResult]:
+            payload = publish.convert_to_qiita(article)
+            content_hash = publish.payload_hash(payload)
+            return _record("qiita", content_hash, _upsert(
+                "qiita", "Qiita", _remote_record(entry, "qiita"), content_hash,
+                find=lambda: publish.find_qiita_item_by_title_async(
+                    article.title, creds.qiita_token,
+                ),
+                update=lambda item_id: publish.update_on_qiita_async(
+                    item_id, payload, creds.qiita_token,
+                ),
+                create=lambda: publish.publish_to_qiita_async(payload, creds.qiita_token),
+            ))
+        jobs.append(("qiita", _try_publish(
             "Qiita", _qiita_upsert,
             dry_run=dry_run, title=article.title,
-        )
-        if url:
-            updates["qiita"] = url
-        errors += failed
+        )))
 
     if _needs_posting(entry.get("devto")):
-        def _devto_upsert() -> PublishResult:
-            payload = convert_to_devto(article, canonical_url=canonical)
-            existing_id = find_devto_article_by_title(article.title, creds.devto_key)
-            if existing_id:
-                logger.info("  Dev.to: existing article found (%s), updating", existing_id)
-                return update_on_devto(existing_id, payload, creds.devto_key)
-            return publish_to_devto(payload, creds.devto_key)
-        url, failed = _try_publish(
+        def _devto_upsert() -> Awaitable[PublishResult]:
+            payload = publish.convert_to_devto(article, canonical_url=canonical)
+            content_hash = publish.payload_hash(payload)
+            return _record("devto", content_hash, _upsert(
+                "devto", "Dev.to", _remote_record(entry, "devto"), content_hash,
+                find=lambda: publish.find_devto_article_by_title_async(
+                    article.title, creds.devto_key,
+                ),
+                update=lambda article_id: publish.update_on_devto_async(
+                    article_id, payload, creds.devto_key,
+                ),
+                create=lambda: publish.publish_to_devto_async(payload, creds.devto_key),
+            ))
+        jobs.append(("devto", _try_publish(
             "Dev.to", _devto_upsert,
             dry_run=dry_run, title=article.title,
-        )
-        if url:
-            updates["devto"] = url
-        errors += failed
+        )))
 
     if _needs_posting(entry.get("hashnode")):
-        def _hashnode_upsert() -> PublishResult:
-            existing_id = find_hashnode_post_by_title(
-                article.title, creds.hashnode_pub_id, creds.hashnode_token,
+        def _hashnode_upsert() -> Awaitable[PublishResult]:
+            payload = publish.convert_to_hashnode(
+                article, creds.hashnode_pub_id, canonical_url=canonical,
             )
-            if existing_id:
-                logger.info("  Hashnode: existing post found (%s), updating", existing_id)
-                return update_on_hashnode(existing_id, article, creds.hashnode_token)
-            payload = convert_to_hashnode(article, creds.hashnode_pub_id, canonical_url=canonical)
-            return publish_to_hashnode(payload, creds.hashnode_token)
-        url, failed = _try_publish(
+            content_hash = publish.payload_hash(payload)
+            if hashnode is not None:
+                return _record("hashnode", content_hash, _upsert(
+                    "hashnode", "Hashnode", _remote_record(entry, "hashnode"), content_hash,
+                    find=lambda: hashnode.find(article.title),
+                    update=lambda post_id: hashnode.update(post_id, article),
+                    create=lambda: hashnode.publish(payload),
+                ))
+            return _record("hashnode", content_hash, _upsert(
+                "hashnode", "Hashnode", _remote_record(entry, "hashnode"), content_hash,
+                find=lambda: publish.find_hashnode_post_by_title_async(
+                    article.title, creds.hashnode_pub_id, creds.hashnode_token,
+                ),
+                update=lambda post_id: publish.update_on_hashnode_async(
+                    post_id, article, creds.hashnode_token,
+                ),
+                create=lambda: publish.publish_to_hashnode_async(payload, creds.hashnode_token),
+            ))
+        jobs.append(("hashnode", _try_publish(
             "Hashnode", _hashnode_upsert,
             dry_run=dry_run, title=article.title,
-        )
+        )))
+
+    outcomes = await asyncio.gather(*(job for _, job in jobs))
+    updates: dict[str, Any] = {}
+    errors = 0
+    for (key, _), (url, failed) in zip(jobs, outcomes):
         if url:
-            updates["hashnode"] = url
+            updates[key] = url
         errors += failed
+    if remote != entry.get("remote", {}):
+        updates["remote"] = remote
 
     return {**entry, **updates} if updates else entry, errors
 
 
-def _is_dependency_satisfied(entry: dict[str, Any], all_entries: list[dict[str, Any]]) -> tuple[bool, str]:
-    """Check if entry's dependency (e.g., JP article for EN translation) is satisfied.
-    
-    Returns (is_satisfied, reason_message).
+# ---------------------------------------------------------------------------
+# Remote ID reconcile
+# ---------------------------------------------------------------------------
+
+# Upper bound on listing pages per platform when importing remote posts.
+_RECONCILE_MAX_PAGES = 50
+
+
+def _entry_platforms(entry: dict[str, Any]) -> list[str]:
+    """Return the cross-post platforms configured for an entry (not "n/a")."""
+    return [
+        key for key in ("qiita", "devto", "hashnode")
+        if key in entry and entry[key] != "n/a"
+    ]
+
+
+def reconcile_remote_posts(schedule: dict[str, Any], creds: _Credentials) -> dict[str, Any]:
+    """Import remote post IDs and URLs into every entry's ``remote`` records.
+
+    Each platform's post listing is fetched once and matched against the
+    entries by article title, so later runs can update posts by ID instead
+    of scanning titles.
     """
-    depends_on = entry.get("depends_on")
-    if not depends_on:
-        return True, ""
-    
-    # Find the dependency entry
-    for dep_entry in all_entries:
-        if dep_entry["file"] == depends_on:
-            if _is_entry_done(dep_entry):
-                return True, ""
+    listings: dict[str, dict[str, dict[str, Any]]] = {
+        "qiita": {
+            item["title"]: {"id": item["id"], "url": item.get("url")}
+            for item in publish.iter_qiita_items(
+                creds.qiita_token, max_pages=_RECONCILE_MAX_PAGES, per_page=100,
+            )
+        },
+        "devto": {
+            item["title"]: {"id": item["id"], "url": item.get("url")}
+            for item in publish.iter_devto_articles(
+                creds.devto_key, max_pages=_RECONCILE_MAX_PAGES, per_page=100,
+            )
+        },
+        "hashnode": {
+            node["title"]: {"id": node["id"], "url": node.get("url")}
+            for node in publish.iter_hashnode_posts(
+                creds.hashnode_pub_id, creds.hashnode_token,
+                max_pages=_RECONCILE_MAX_PAGES,
+            )
+        },
+    }
+    for key, posts in listings.items():
+        logger.info("Reconcile: %d %s post(s) listed", len(posts), key)
+
+    updated_articles: list[dict[str, Any]] = []
+    matched = 0
+    for entry in schedule["articles"]:
+        platforms = _entry_platforms(entry)
+        article_path = _validate_article_path(entry["file"]) if platforms else None
+        if article_path is None:
+            updated_articles.append(entry)
+            continue
+        title = publish.parse_zenn_article(article_path).title
+        remote = dict(entry.get("remote", {}))
+        for key in platforms:
+            listed = listings[key].get(title)
+            if listed is None:
+                continue
+            if remote.get(key, {}).get("id") != listed["id"]:
+                # A different post: the recorded payload hash no longer applies
+                remote[key] = listed
             else:
-                return False, f"Waiting for dependency: {depends_on}"
-    
-    # Dependency not found in schedule - assume external/satisfied
-    logger.warning("Dependency %s not found in schedule for %s", depends_on, entry["file"])
-    return True, ""
+                remote[key] = {**remote[key], **listed}
+            matched += 1
+        if remote:
+            entry = {**entry, "remote": remote}
+        updated_articles.append(entry)
 
+    logger.info("Reconcile: %d remote post(s) matched to schedule entries", matched)
+    return {**schedule, "articles": updated_articles}
 
-def publish_due(schedule: dict[str, Any], *, dry_run: bool = False) -> int:
-    # Phase 1: Publish due Zenn articles first (git push)
-    schedule, zenn_count, zenn_errors = _process_zenn_entries(
-        schedule, dry_run=dry_run,
+
+# ---------------------------------------------------------------------------
+# Remote drift audit
+# ---------------------------------------------------------------------------
+
+
+def verify_remote_posts(schedule: dict[str, Any], creds: _Credentials) -> int:
+    """Compare every posted copy with its local article (see drift.py).
+
+    Returns 1 if any post drifted, is missing, has the wrong canonical URL
+    or could not be checked, else 0.
+    """
+    jobs: list[tuple[drift.Target, publish.Article]] = []
+    problems = 0
+    for entry in schedule["articles"]:
+        entry_targets = drift.targets(entry)
+        if not entry_targets:
+            continue
+        article_path = _validate_article_path(entry["file"])
+        if article_path is None:
+            problems += 1
+            continue
+        article = publish.parse_zenn_article(article_path)
+        jobs.extend((target, article) for target in entry_targets)
+
+    auditor = drift.Auditor(
+        creds.qiita_token, creds.devto_key, creds.hashnode_token, creds.hashnode_pub_id,
     )
+
+    async def _audit() -> list[drift.Verdict]:
+        try:
+            return await auditor.audit(jobs)
+        finally:
+            await publish.aclose_clients()
+
+    verdicts = asyncio.run(_audit())
+    counts = Counter(verdict.status for verdict in verdicts)
+    for verdict in verdicts:
+        if verdict.status != drift.OK:
+            logger.error("  %s: %s", verdict.status.upper(), drift.describe(verdict))
+    logger.info(
+        "Verify: %d post(s) checked: %d ok, %d drifted, %d canonical mismatch(es), "
+        "%d missing, %d unknown.",
+        len(verdicts), counts[drift.OK], counts[drift.DRIFT], counts[drift.CANONICAL],
+        counts[drift.MISSING], counts[drift.UNKNOWN],
+    )
+    problems += len(verdicts) - counts[drift.OK]
+    return 1 if problems else 0
+
+
+# ---------------------------------------------------------------------------
+# Dependencies between entries
+# ---------------------------------------------------------------------------
+
+
+class DependencyGraph(NamedTuple):
+    """``depends_on`` edges between schedule entries, keyed by ``file``."""
+
+    order: list[int]  # entry indices, parents before dependents, else schedule order
+    parents: dict[int, int]  # entry index -> index of the entry it depends on
+    missing: dict[str, str]  # file -> depends_on that is not in the schedule
+    cycles: list[str]  # files whose dependencies form a cycle
+
+
+def build_dependency_graph(entries: list[dict[str, Any]]) -> DependencyGraph:
+    """Index dependencies and order entries topologically (Kahn, stable)."""
+    index = {entry["file"]: i for i, entry in enumerate(entries)}
+    parents: dict[int, int] = {}
+    children: dict[int, list[int]] = {}
+    missing: dict[str, str] = {}
+    for i, entry in enumerate(entries):
+        depends_on = entry.get("depends_on")
+        if not depends_on:
+            continue
+        parent = index.get(depends_on)
+        if parent is None:
+            missing[entry["file"]] = depends_on
+            continue
+        parents[i] = parent
+        children.setdefault(parent, []).append(i)
+
+    ready = [i for i in range(len(entries)) if i not in parents]
+    heapq.heapify(ready)
+    order: list[int] = []
+    while ready:
+        i = heapq.heappop(ready)
+        order.append(i)
+        for child in children.get(i, ()):
+            heapq.heappush(ready, child)  # one parent per entry: now ready
+    ordered = set(order)
+    cycles = [entries[i]["file"] for i in range(len(entries)) if i not in ordered]
+    return DependencyGraph(order, parents, missing, cycles)
+
+
+def _log_dependency_problems(graph: DependencyGraph) -> None:
+    for file, depends_on in graph.missing.items():
+        # Not in the schedule — assume external/satisfied
+        logger.warning("Dependency %s not found in schedule for %s", depends_on, file)
+    if graph.cycles:
+        logger.error("Dependency cycle, not processed: %s", ", ".join(graph.cycles))
+
+
+def publish_due(
+    schedule: dict[str, Any],
+    *,
+    dry_run: bool = False,
+    check_links: bool = False,
+    now: datetime | None = None,
+    concurrency: int = CONCURRENCY,
+) -> int:
+    """Publish and cross-post the due entries; return the exit code.
+
+    Entries are due by date, or with ``now`` set, at their exact due time
+    (see due_at()). At most ``concurrency`` entries are cross-posted at once.
+    """
+    return asyncio.run(publish_due_async(
+        schedule, dry_run=dry_run, check_links=check_links, now=now, concurrency=concurrency,
+    ))
+
+
+async def publish_due_async(
+    schedule: dict[str, Any],
+    *,
+    dry_run: bool = False,
+    check_links: bool = False,
+    now: datetime | None = None,
+    keep_clients: bool = False,
+    concurrency: int = CONCURRENCY,
+) -> int:
+    """publish_due() in a running event loop.
+
+    With ``keep_clients`` the HTTP clients stay open for the next run.
+    """
+    # Phase 1: Publish due Zenn articles first (git push)
+    with metrics.phase("zenn"):
+        schedule, zenn_count, zenn_errors = _process_zenn_entries(
+            schedule, dry_run=dry_run, now=now,
+        )
     if zenn_count > 0:
         logger.info("Zenn: %d article(s) published, %d error(s)", zenn_count, zenn_errors)
 
-    # Phase 2: Cross-post to other platforms (API calls)
+    # Phase 2: Cross-post to other platforms (API calls); includes the saves
     creds = _load_credentials()
     if creds is None:
+        metrics.registry.set("publish_run_errors", zenn_errors + 1)
         return 1
 
-    today = date.today()
+    with metrics.phase("crosspost"):
+        errors = await _crosspost_due(
+            schedule, creds,
+            dry_run=dry_run, check_links=check_links, now=now, keep_clients=keep_clients,
+            concurrency=concurrency,
+        )
+    metrics.registry.set("publish_run_errors", zenn_errors + errors)
+    if zenn_errors + errors > 0:
+        logger.info(
+            "Run finished with %d error(s): %d Zenn, %d cross-post.",
+            zenn_errors + errors, zenn_errors, errors,
+        )
+    return 1 if zenn_errors + errors > 0 else 0
+
+
+def write_metrics(directory: Path, *, started: float, exit_code: int) -> None:
+    """Write the run's metrics as ``publish_due.prom`` plus a JSON summary."""
+    duration = time.monotonic() - started
+    metrics.registry.set("publish_run_duration_seconds", duration)
+    metrics.registry.set("publish_run_timestamp_seconds", time.time())
+    try:
+        prom_path, json_path = metrics.registry.write(
+            directory, "publish_due", duration_seconds=duration, exit_code=exit_code,
+        )
+    except OSError as e:  # metrics must never fail the run
+        logger.warning("Could not write metrics to %s: %s", directory, e)
+        return
+    logger.info("Metrics written: %s, %s", prom_path, json_path)
+
+
+async def _broken_link_gate(
+    schedule: dict[str, Any], now: datetime | None = None,
+) -> frozenset[str]:
+    """Files of due entries whose article links to something broken."""
+    paths: dict[Path, str] = {}
+    for entry in schedule["articles"]:
+        if _is_due(entry, schedule, now):
+            article_path = _validate_article_path(entry["file"])
+            if article_path is not None:
+                paths[article_path] = entry["file"]
+    if not paths:
+        return frozenset()
+
+    checker = linkcheck.LinkChecker(
+        linkcheck.ResultCache(linkcheck.DEFAULT_CACHE_PATH),
+        ignore=linkcheck.load_ignore_patterns(),
+    )
+    try:
+        broken = await linkcheck.check_articles(paths, checker)
+    finally:
+        checker.cache.save()
+    for path, links in broken.items():
+        for link in links:
+            logger.error(
+                "  Broken link in %s: %s (%s)",
+                paths[path], link.url, link.status or link.error,
+            )
+    return frozenset(paths[path] for path in broken)
+
+
+async def _crosspost_due(
+    schedule: dict[str, Any],
+    creds: _Credentials,
+    *,
+    dry_run: bool,
+    check_links: bool = False,
+    now: datetime | None = None,
+    keep_clients: bool = False,
+    concurrency: int = CONCURRENCY,
+) -> int:
+    """Cross-post every due entry. Returns the number of errors.
+
+    With ``check_links``, entries whose article has a broken link are held
+    back, each counted as an error.
+    """
+    try:
+        blocked = await _broken_link_gate(schedule, now) if check_links else frozenset()
+        return await _crosspost_entries(
+            schedule, creds, dry_run=dry_run, blocked=blocked, now=now,
+            concurrency=concurrency,
+        )
+    finally:
+        if not keep_clients:
+            await publish.aclose_clients()
+
+
+async def _crosspost_entries(
+    schedule: dict[str, Any],
+    creds: _Credentials,
+    *,
+    dry_run: bool,
+    blocked: frozenset[str] = frozenset(),
+    now: datetime | None = None,
+    concurrency: int = CONCURRENCY,
+) -> int:
+    """Process due entries parents-first, journaling each updated entry.
+
+    Entries run concurrently in waves: each wave holds every due entry whose
+    parent is done, so their Hashnode calls are batched (see
+    hashnode_batch.py). At most ``concurrency`` entries of a wave are in
+    flight. An entry whose parent completes in one wave is processed in the
+    next (in dry-run mode, once the parent would have been posted).
+    """
     posted_count = 0
-    errors = zenn_errors
+    errors = 0
     skipped_count = 0
-    updated_articles: list[dict[str, Any]] = []
+    stats: Counter[str] = Counter()
+    updated_articles = list(schedule["articles"])
+    completed: set[int] = set()  # processed this run without errors
 
-    remaining = list(schedule["articles"])
-    for i, entry in enumerate(remaining):
-        entry_date = date.fromisoformat(entry["date"])
-        if entry_date > today or _is_entry_done(entry):
-            updated_articles.append(entry)
-            continue
-        
-        # Check dependency satisfaction (e.g., EN article needs JP article done first)
-        dep_satisfied, dep_reason = _is_dependency_satisfied(entry, schedule["articles"])
-        if not dep_satisfied:
-            logger.info("Skipping %s: %s", entry["file"], dep_reason)
-            updated_articles.append(entry)
-            skipped_count += 1
-            continue
+    graph = build_dependency_graph(updated_articles)
+    _log_dependency_problems(graph)
+    if graph.cycles:
+        errors += 1
+
+    hashnode = None if dry_run else hashnode_batch.HashnodeBatcher(
+        creds.hashnode_token, creds.hashnode_pub_id,
+    )
+
+    limit = asyncio.Semaphore(max(1, concurrency))
 
-        updated_entry, entry_errors = _process_entry(entry, creds, dry_run=dry_run)
-        updated_articles.append(updated_entry)
+    async def _process(i: int) -> None:
+        nonlocal errors
+        entry = updated_articles[i]
+        async with limit:
+            updated_entry, entry_errors = await _process_entry(
+                entry, creds, dry_run=dry_run, stats=stats, hashnode=hashnode,
+            )
+        updated_articles[i] = updated_entry
         errors += entry_errors
-        posted_count += 1
+        if entry_errors == 0:
+            completed.add(i)
 
         # Persist immediately after each entry so a mid-run process kill
         # does not lose progress for already-completed entries.
         if updated_entry is not entry and not dry_run:
-            all_articles = updated_articles + remaining[i + 1:]
-            save_schedule({**schedule, "articles": all_articles})
+            save_entry(updated_entry)
+
+    pending = [i for i in graph.order if _is_due(updated_articles[i], schedule, now)]
+    while pending:
+        wave: list[int] = []
+        deferred: list[int] = []
+        unresolved: set[int] = set()  # in this wave or deferred
+        for i in pending:
+            entry = updated_articles[i]
+            # Check dependency satisfaction (e.g., EN article needs JP article done first)
+            parent = graph.parents.get(i)
+            if parent is not None and parent not in completed and not _is_entry_done(
+                updated_articles[parent]
+            ):
+                if parent in unresolved:
+                    deferred.append(i)
+                    unresolved.add(i)
+                    continue
+                logger.info(
+                    "Skipping %s: Waiting for dependency: %s", entry["file"], entry["depends_on"],
+                )
+                skipped_count += 1
+                continue
+            if entry["file"] in blocked:
+                logger.error("Skipping %s: broken links (see above)", entry["file"])
+                errors += 1
+                continue
+            wave.append(i)
+            unresolved.add(i)
+
+        await asyncio.gather(*(_process(i) for i in wave))
+        posted_count += len(wave)
+        pending = deferred
 
     if posted_count == 0 and skipped_count == 0:
         logger.info("Nothing due today.")
     elif not dry_run:
         save_schedule({**schedule, "articles": updated_articles})
         logger.info(
-            "Schedule updated. %d article(s) processed, %d skipped (dependencies), %d error(s).",
-            posted_count, skipped_count, errors,
+            "Schedule updated. %d article(s) processed, %d skipped (dependencies), "
+            "%d unchanged (no update sent), %d cross-post error(s).",
+            posted_count, skipped_count, stats["unchanged"], errors,
         )
     else:
         logger.info("[DRY-RUN] %d article(s) would be posted, %d skipped (dependencies).", 
                     posted_count, skipped_count)
 
-    return 1 if errors > 0 else 0
+    return errors
 
 
 def main() -> int:
@@ -465,15 +945,71 @@ def main() -> int:
         "--dry-run", action="store_true", help="Preview without posting",
     )
     parser.add_argument("--status", action="store_true", help="Show schedule status")
+    parser.add_argument(
+        "--reconcile", action="store_true",
+        help="Import remote post IDs/URLs into schedule.json by listing each platform",
+    )
+    parser.add_argument(
+        "--verify", action="store_true",
+        help="Fetch every posted copy and report drift from the local articles",
+    )
+    parser.add_argument(
+        "--check-links", action="store_true",
+        help="Do not cross-post entries whose article has a broken link (see linkcheck.py)",
+    )
+    parser.add_argument(
+        "--retries", type=int,
+        help="Retries after a timeout or 5xx (default: PUBLISH_RETRIES or 2)",
+    )
+    parser.add_argument(
+        "--timeout", type=float,
+        help="Per-request timeout in seconds (default: PUBLISH_TIMEOUT or 30)",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=CONCURRENCY,
+        help=f"Maximum entries cross-posted at once (default: {CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--metrics-dir", type=Path, default=METRICS_DIR,
+        help="Where to write publish_due.prom and runs/*.json "
+        "(default: PUBLISH_METRICS_DIR or scripts/metrics)",
+    )
+    profiling.add_argument(parser)
     args = parser.parse_args()
+    with profiling.profiled(args.profile, "scheduled_publish"):
+        return _run(args)
+
 
+def _run(args: argparse.Namespace) -> int:
     schedule = load_schedule()
 
     if args.status:
         show_status(schedule)
         return 0
 
-    return publish_due(schedule, dry_run=args.dry_run)
+    retry.configure(retries=args.retries, timeout=args.timeout)
+
+    if args.reconcile:
+        creds = _load_credentials()
+        if creds is None:
+            return 1
+        save_schedule(reconcile_remote_posts(schedule, creds))
+        return 0
+
+    if args.verify:
+        creds = _load_credentials()
+        if creds is None:
+            return 1
+        return verify_remote_posts(schedule, creds)
+
+    started = time.monotonic()
+    exit_code = publish_due(
+        schedule, dry_run=args.dry_run, check_links=args.check_links,
+        concurrency=args.concurrency,
+    )
+    if not args.dry_run:
+        write_metrics(args.metrics_dir, started=started, exit_code=exit_code)
+    return exit_code
 
 
 if __name__ == "__main__":
@@ -0,0 +1,68 @@
+"""Shared fixtures for the publish script tests."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+import metrics
+import publish
+import ratelimit
+import retry
+from article_index import ArticleIndex
+from conversion_cache import ConversionCache
+from images import GITHUB_RAW_BASE, ImageStore
+from ratelimit import RateLimit, RateLimiter
+
+
+@pytest.fixture(autouse=True)
+def _isolated_conversion_cache(tmp_path: Path) -> Iterator[ConversionCache]:
+    """Point the conversion cache at a per-test directory."""
+    cache = ConversionCache(tmp_path / "convert-cache")
+    original = publish._cache
+    publish._cache = cache
+    yield cache
+    publish._cache = original
+
+
+@pytest.fixture(autouse=True)
+def _isolated_article_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> ArticleIndex:
+    """Point the shared article index at a per-test file."""
+    index = ArticleIndex(tmp_path / "article-index.json")
+    monkeypatch.setattr(publish, "_articles", index)
+    return index
+
+
+@pytest.fixture(autouse=True)
+def _isolated_image_store(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> ImageStore:
+    """Keep the shared image store's hash index in a per-test file."""
+    store = ImageStore(raw_base=GITHUB_RAW_BASE, index_path=tmp_path / "image-hashes.json")
+    monkeypatch.setattr(publish, "_images", store)
+    return store
+
+
+@pytest.fixture(autouse=True)
+def _unthrottled_rate_limiter(monkeypatch: pytest.MonkeyPatch) -> RateLimiter:
+    """Give each test a fresh limiter whose default pacing never waits."""
+    fast = RateLimit(rate=1e6, burst=1000)
+    limiter = RateLimiter({name: fast for name in ("qiita", "devto", "hashnode")})
+    monkeypatch.setattr(ratelimit, "limiter", limiter)
+    return limiter
+
+
+@pytest.fixture(autouse=True)
+def _no_retry_backoff(monkeypatch: pytest.MonkeyPatch) -> retry.RetryPolicy:
+    """Keep the default retry count but never sleep between attempts."""
+    policy = retry.RetryPolicy(base_delay=0.0, max_delay=0.0)
+    monkeypatch.setattr(retry, "policy", policy)
+    return policy
+
+
+@pytest.fixture(autouse=True)
+def _fresh_metrics(monkeypatch: pytest.MonkeyPatch) -> metrics.Registry:
+    """Give each test an empty metrics registry."""
+    registry = metrics.Registry()
+    monkeypatch.setattr(metrics, "registry", registry)
+    return registry
@@ -0,0 +1,138 @@
+"""Tests for article_index.py — mtime/size-validated article metadata."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import article_index
+from article_index import (
+    ArticleIndex,
+    image_refs,
+    pair_path,
+    read_frontmatter,
+    read_header,
+    split_body,
+)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+SAMPLE_ARTICLE = FIXTURES_DIR / "sample-article.md"
+
+
+class TestReadHeader:
+    def test_sample_article(self) -> None:
+        fields, body = read_header(SAMPLE_ARTICLE.read_text())
+        assert fields["title"] == "テスト用記事タイトル"
+        assert fields["topics"] == ["python", "testing", "pytest", "ci", "automation"]
+        assert not body.startswith("---")
+
+    def test_scalars(self) -> None:
+        fields, body = read_header(
+            "---\ntitle: \"A: B\"\npublished: false\ntopics: ['x', 'y']\n---\nBody\n"
+        )
+        assert fields == {"title": "A: B", "published": False, "topics": ["x", "y"]}
+        assert body == "Body"
+
+    def test_flat_reader_without_yaml(self) -> None:
+        header = 'title: "A: B"\npublished: false\ntopics: ["x", "y"]\n'
+        with patch.object(article_index, "_yaml", lambda: None):
+            assert article_index.parse_header(header) == {
+                "title": "A: B", "published": False, "topics": ["x", "y"],
+            }
+
+    def test_no_header(self) -> None:
+        assert read_header("# Title\n") == ({}, "# Title")
+
+
+class TestReadFrontmatter:
+    def test_matches_read_header(self) -> None:
+        fields, _ = read_header(SAMPLE_ARTICLE.read_text())
+        assert read_frontmatter(SAMPLE_ARTICLE) == fields
+
+    def test_stops_at_closing_delimiter(self, tmp_path: Path) -> None:
+        path = tmp_path / "a.md"
+        # Undecodable bytes after the header are never read.
+        path.write_bytes(b"---\npublished: false\n---\npublished: true\n\xff\xfe")
+        assert read_frontmatter(path) == {"published": False}
+
+    def test_no_frontmatter(self, tmp_path: Path) -> None:
+        path = tmp_path / "a.md"
+        path.write_text("# Title\n---\n")
+        assert read_frontmatter(path) == {}
+
+    def test_split_body(self) -> None:
+        assert split_body("---\ntitle: A\n---\n\nBody\n") == "Body"
+
+
+class TestImageRefs:
+    def test_unique_in_order_outside_fences(self) -> None:
+        body = (
+            "![a](/images/b.png)\n![x](/images/a.png =250x)\n"
+            "```\n![c](/images/c.png)\n```\n![again](/images/b.png)\n"
+            "![ext](https://example.com/d.png)\n"
+        )
+        assert image_refs(body) == ("b.png", "a.png")
+
+
+class TestArticleIndex:
+    def _article(self, tmp_path: Path, published: str = "false") -> Path:
+        path = tmp_path / "articles" / "a.md"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(f'---\ntitle: "A"\ntopics: ["x"]\npublished: {published}\n---\nBody\n')
+        return path
+
+    def test_unchanged_file_is_not_reread(self, tmp_path: Path) -> None:
+        path = self._article(tmp_path)
+        index_path = tmp_path / "index.json"
+        first = ArticleIndex(index_path)
+        meta = first.get(path)
+        assert meta is not None
+        assert meta.title == "A"
+        assert meta.published is False
+        first.save()
+
+        with patch.object(article_index, "_read_meta") as read_meta:
+            assert ArticleIndex(index_path).get(path) == meta
+        read_meta.assert_not_called()
+
+    def test_changed_file_is_reread(self, tmp_path: Path) -> None:
+        path = self._article(tmp_path)
+        index = ArticleIndex(tmp_path / "index.json")
+        before = index.get(path)
+        stat = path.stat()
+        self._article(tmp_path, published="true")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        after = index.get(path)
+        assert after is not None and before is not None
+        assert after.published is True
+        assert after.body_hash == before.body_hash
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        assert ArticleIndex(tmp_path / "index.json").get(tmp_path / "nope.md") is None
+
+    def test_version_mismatch_discards_index(self, tmp_path: Path) -> None:
+        index_path = tmp_path / "index.json"
+        index_path.write_text('{"version": 0, "entries": {"x": {}}}')
+        assert ArticleIndex(index_path)._entries == {}
+
+    def test_pair(self, tmp_path: Path) -> None:
+        jp = self._article(tmp_path)
+        en = tmp_path / "articles-en" / "a.md"
+        index = ArticleIndex(tmp_path / "index.json")
+        assert pair_path(jp) == en
+        assert index.pair(jp) is None
+        en.parent.mkdir()
+        en.write_text("---\ntitle: A\n---\n")
+        assert index.pair(jp) == en
+        assert index.pair(en) == jp
+
+    def test_images_survive_the_index(self, tmp_path: Path) -> None:
+        path = tmp_path / "articles" / "img.md"
+        path.parent.mkdir()
+        path.write_text("---\ntitle: I\n---\n![a](/images/x/y.png)\n")
+        index_path = tmp_path / "index.json"
+        first = ArticleIndex(index_path)
+        assert first.get(path).images == ("x/y.png",)  # type: ignore[union-attr]
+        first.save()
+        assert ArticleIndex(index_path).get(path).images == ("x/y.png",)  # type: ignore[union-attr]
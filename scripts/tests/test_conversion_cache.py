@@ -0,0 +1,89 @@
+"""Tests for conversion_cache.py and its use by publish.py converters."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import publish
+from conversion_cache import ConversionCache, cache_key
+from publish import Article, convert_to_devto, convert_to_qiita, parse_zenn_article
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+SAMPLE_ARTICLE = FIXTURES_DIR / "sample-article.md"
+
+
+class TestCacheKey:
+    def test_deterministic(self) -> None:
+        assert cache_key("a", 1, None) == cache_key("a", 1, None)
+
+    def test_parts_are_separated(self) -> None:
+        assert cache_key("ab", "c") != cache_key("a", "bc")
+
+
+class TestConversionCache:
+    def test_round_trip(self, tmp_path: Path) -> None:
+        cache = ConversionCache(tmp_path)
+        cache.put("k", {"title": "タイトル", "tags": ["a"]})
+        assert cache.get("k") == {"title": "タイトル", "tags": ["a"]}
+
+    def test_miss(self, tmp_path: Path) -> None:
+        assert ConversionCache(tmp_path).get("missing") is None
+
+    def test_disabled(self, tmp_path: Path) -> None:
+        cache = ConversionCache(tmp_path, enabled=False)
+        cache.put("k", {"x": 1})
+        assert cache.get("k") is None
+        assert not list(tmp_path.iterdir())
+
+    def test_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        cache = ConversionCache(tmp_path, max_bytes=300)
+        for i, key in enumerate(("old", "used", "new")):
+            cache.put(key, {"data": "x" * 80})
+            os.utime(tmp_path / f"{key}.json", ns=(i * 10**9, i * 10**9))
+        cache.get("old")  # refreshes "old", leaving "used" as the LRU entry
+        cache.put("newest", {"data": "x" * 80})
+
+        assert cache.get("used") is None
+        assert cache.get("old") is not None
+        assert cache.get("newest") is not None
+        total = sum(p.stat().st_size for p in tmp_path.glob("*.json"))
+        assert total <= 300
+
+
+class TestCachedConversion:
+    def test_repeated_conversion_skips_strip(self) -> None:
+        article = Article(title="t", body=":::message\nx\n:::", topics=("a",))
+        first = convert_to_qiita(article)
+        with patch("publish._strip_zenn_syntax") as mock_strip:
+            second = convert_to_qiita(article)
+        mock_strip.assert_not_called()
+        assert first == second
+
+    def test_options_are_part_of_key(self) -> None:
+        article = Article(title="t", body="b", topics=())
+        a = convert_to_devto(article, canonical_url="https://zenn.dev/a")
+        b = convert_to_devto(article, canonical_url="https://zenn.dev/b")
+        assert a["article"]["canonical_url"] == "https://zenn.dev/a"
+        assert b["article"]["canonical_url"] == "https://zenn.dev/b"
+
+    def test_converter_version_invalidates(self) -> None:
+        article = Article(title="t", body="b", topics=())
+        convert_to_qiita(article)
+        with (
+            patch.object(publish, "CONVERTER_VERSION", publish.CONVERTER_VERSION + 1),
+            patch("publish._strip_zenn_syntax", return_value="fresh") as mock_strip,
+        ):
+            payload = convert_to_qiita(article)
+        mock_strip.assert_called_once()
+        assert payload["body"] == "fresh"
+
+    def test_converted_payload_follows_file_content(self, tmp_path: Path) -> None:
+        path = tmp_path / "a.md"
+        path.write_bytes(SAMPLE_ARTICLE.read_bytes())
+        first = convert_to_qiita(parse_zenn_article(path))
+        path.write_text(path.read_text().replace("テスト用の記事", "変更後の本文"))
+        second = convert_to_qiita(parse_zenn_article(path))
+        assert "変更後の本文" in second["body"]
+        assert first["body"] != second["body"]
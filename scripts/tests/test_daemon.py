@@ -0,0 +1,145 @@
+"""Tests for daemon.py — the due-time queue and the serve loop."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import daemon
+import metrics
+import scheduled_publish
+from daemon import DueItem, Scheduler, due_items
+
+NOON = datetime(2026, 3, 3, 12, 0, tzinfo=UTC)
+
+
+def _entry(file: str, day: str = "2026-03-03", **fields: Any) -> dict[str, Any]:
+    return {"file": file, "date": day, "devto": "pending", **fields}
+
+
+@pytest.fixture
+def schedule_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "schedule.json"
+    monkeypatch.setattr(scheduled_publish, "SCHEDULE_PATH", path)
+    return path
+
+
+def _write(path: Path, schedule: dict[str, Any]) -> None:
+    path.write_text(json.dumps(schedule))
+    # Filesystems with coarse timestamps: make every write visible.
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+class TestDueItems:
+    def test_zenn_and_crosspost_items_at_post_time(self) -> None:
+        schedule = {"post_time_utc": "23:00", "articles": [
+            _entry("a.md", zenn_date="2026-03-02", zenn_published=False),
+            _entry("b.md", post_time_utc="12:30"),
+            _entry("done.md", devto="https://dev.to/x", hashnode="n/a"),
+        ]}
+        assert sorted(due_items(schedule)) == [
+            DueItem(datetime(2026, 3, 2, 23, 0, tzinfo=UTC), "zenn", "a.md"),
+            DueItem(datetime(2026, 3, 3, 12, 30, tzinfo=UTC), "crosspost", "b.md"),
+            DueItem(datetime(2026, 3, 3, 23, 0, tzinfo=UTC), "crosspost", "a.md"),
+        ]
+
+
+class TestScheduler:
+    def test_reloads_only_when_the_file_changes(self, schedule_path: Path) -> None:
+        _write(schedule_path, {"post_time_utc": "13:00", "articles": [_entry("a.md")]})
+        scheduler = Scheduler(clock=lambda: NOON)
+        assert scheduler.reload_if_changed()
+        assert not scheduler.reload_if_changed()
+        assert scheduler.next_due() == NOON + timedelta(hours=1)
+
+        _write(schedule_path, {"post_time_utc": "12:15", "articles": [_entry("a.md")]})
+        assert scheduler.reload_if_changed()
+        assert scheduler.next_due() == NOON + timedelta(minutes=15)
+
+    def test_broken_file_keeps_last_schedule(self, schedule_path: Path) -> None:
+        _write(schedule_path, {"post_time_utc": "13:00", "articles": [_entry("a.md")]})
+        scheduler = Scheduler(clock=lambda: NOON)
+        scheduler.reload_if_changed()
+        schedule_path.write_text("{")
+        assert not scheduler.reload_if_changed()
+        assert [item.file for item in scheduler.pending()] == ["a.md"]
+
+    def test_item_left_due_is_held(
+        self, schedule_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        _write(schedule_path, {"post_time_utc": "11:00", "articles": [
+            _entry("fails.md"), _entry("later.md", post_time_utc="18:00"),
+        ]})
+        calls: list[datetime | None] = []
+
+        async def publish_due_async(schedule: dict, **kwargs: Any) -> int:
+            calls.append(kwargs["now"])
+            return 1
+
+        monkeypatch.setattr(scheduled_publish, "publish_due_async", publish_due_async)
+        scheduler = Scheduler(clock=lambda: NOON)
+        scheduler.reload_if_changed()
+        assert asyncio.run(scheduler.run_due()) == 1
+        assert calls == [NOON]
+        assert scheduler.pending() == [
+            DueItem(NOON + daemon.RETRY_DELAY, "crosspost", "fails.md"),
+            DueItem(NOON + timedelta(hours=6), "crosspost", "later.md"),
+        ]
+
+    def test_each_run_has_its_own_metrics(
+        self, schedule_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        _write(schedule_path, {"post_time_utc": "11:00", "articles": [_entry("a.md")]})
+
+        async def publish_due_async(schedule: dict, **kwargs: Any) -> int:
+            with metrics.phase("crosspost"):
+                metrics.inc("publish_requests_total", platform="devto", status="500")
+            return 1
+
+        monkeypatch.setattr(scheduled_publish, "publish_due_async", publish_due_async)
+        clock = [NOON]
+        scheduler = Scheduler(metrics_dir=tmp_path / "metrics", clock=lambda: clock[0])
+        scheduler.reload_if_changed()
+        for _ in range(2):
+            asyncio.run(scheduler.run_due())
+            clock[0] += daemon.RETRY_DELAY
+            prom = (tmp_path / "metrics" / "publish_due.prom").read_text()
+            assert 'publish_requests_total{platform="devto",status="500"} 1\n' in prom
+
+
+class TestServe:
+    def test_wakes_at_due_time_and_stops(
+        self, schedule_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        due = datetime.now(UTC) + timedelta(milliseconds=50)
+        _write(schedule_path, {"articles": [_entry("a.md")]})
+        # post_time_utc has minute resolution; put the item 50ms ahead instead.
+        monkeypatch.setattr(
+            daemon, "due_items",
+            lambda schedule: [DueItem(due, "crosspost", e["file"]) for e in schedule["articles"]
+                              if e["devto"] == "pending"],
+        )
+        ran_at: list[datetime] = []
+
+        async def scenario() -> None:
+            stop = asyncio.Event()
+
+            async def publish_due_async(schedule: dict, **kwargs: Any) -> int:
+                ran_at.append(datetime.now(UTC))
+                _write(schedule_path, {"articles": [_entry("a.md", devto="https://dev.to/a")]})
+                stop.set()
+                return 0
+
+            monkeypatch.setattr(scheduled_publish, "publish_due_async", publish_due_async)
+            await asyncio.wait_for(Scheduler().serve(stop, poll_interval=5.0), timeout=5.0)
+
+        asyncio.run(scenario())
+        assert len(ran_at) == 1
+        assert due <= ran_at[0] < due + timedelta(seconds=1)
@@ -0,0 +1,132 @@
+"""Tests for drift.py — comparing live cross-posts with the local articles."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import httpx
+import respx
+
+import drift
+import publish
+from drift import Auditor, Target, Verdict, compare, local_fields, targets
+from publish import Article
+
+ARTICLE = Article(title="Title", body="Line one\n\nLine two\n", topics=("Python", "CI"))
+CANONICAL = "https://zenn.dev/u/articles/a"
+
+
+def _target(platform: str, post_id: Any = None, url: str | None = None, **kw: Any) -> Target:
+    fields = {"canonical_url": CANONICAL, "recorded_hash": None, **kw}
+    return Target("articles/a.md", platform, post_id, url, **fields)
+
+
+def _audit(*jobs: Target, concurrency: int = drift.CONCURRENCY) -> list[Verdict]:
+    auditor = Auditor("qt", "dk", "ht", "pub", concurrency=concurrency)
+
+    async def scenario() -> list[Verdict]:
+        try:
+            return await auditor.audit((target, ARTICLE) for target in jobs)
+        finally:
+            await publish.aclose_clients()
+
+    return asyncio.run(scenario())
+
+
+class TestTargets:
+    def test_posted_urls_and_recorded_ids(self) -> None:
+        entry = {
+            "file": "articles/a.md", "canonical_url": CANONICAL,
+            "devto": "https://dev.to/u/a-1", "hashnode": "pending",
+            "remote": {"hashnode": {"id": "h1", "url": None, "hash": "x"}},
+        }
+        assert targets(entry) == [
+            Target("articles/a.md", "devto", None, "https://dev.to/u/a-1", CANONICAL, None),
+            Target("articles/a.md", "hashnode", "h1", None, CANONICAL, "x"),
+        ]
+
+    def test_unposted_and_not_applicable_are_skipped(self) -> None:
+        entry = {"file": "a.md", "qiita": "n/a", "devto": "pending", "hashnode": ""}
+        assert targets(entry) == []
+
+
+class TestCompare:
+    def test_whitespace_and_tag_case_are_ignored(self) -> None:
+        local, _ = local_fields("qiita", ARTICLE, None, "pub")
+        remote = drift.remote_fields("qiita", {
+            "title": "Title", "body": "Line one  \r\n\r\nLine two",
+            "tags": [{"name": "ci", "versions": []}, {"name": "python", "versions": []}],
+        })
+        assert compare(local, remote) == (drift.OK, ())
+
+    def test_differing_fields_are_named(self) -> None:
+        local, _ = local_fields("devto", ARTICLE, CANONICAL, "pub")
+        remote = {**local, "title": "Old", "canonical_url": "https://dev.to/u/a"}
+        assert compare(local, remote) == (drift.DRIFT, ("title", "canonical_url"))
+        assert compare(local, {**local, "canonical_url": None}) == (
+            drift.CANONICAL, ("canonical_url",),
+        )
+
+
+class TestAuditor:
+    @respx.mock
+    def test_verdicts_per_platform(self) -> None:
+        local_body = local_fields("qiita", ARTICLE, None, "pub")[0]["body"]
+        respx.get("https://qiita.com/api/v2/items/q1").respond(200, json={
+            "title": "Title", "body": local_body, "tags": [{"name": "python"}, {"name": "ci"}],
+        })
+        respx.get("https://dev.to/api/articles/u/a-1").respond(200, json={
+            "title": "Title", "body_markdown": "---\ntitle: Title\n---\nEdited",
+            "tags": ["python", "ci"], "canonical_url": CANONICAL,
+        })
+        respx.post("https://gql.hashnode.com").respond(200, json={"data": {"post": None}})
+        respx.get("https://qiita.com/api/v2/items/q2").respond(503)
+
+        verdicts = _audit(
+            _target("qiita", "q1", canonical_url=None),
+            _target("devto", url="https://dev.to/u/a-1"),
+            _target("hashnode", "h1"),
+            _target("qiita", "q2", canonical_url=None),
+        )
+        assert [v.status for v in verdicts] == [
+            drift.OK, drift.DRIFT, drift.MISSING, drift.UNKNOWN,
+        ]
+        assert verdicts[1].fields == ("body",)
+        assert "503" in verdicts[3].error
+
+    @respx.mock
+    def test_hashnode_by_slug_and_local_change(self) -> None:
+        route = respx.post("https://gql.hashnode.com").respond(200, json={"data": {
+            "publication": {"post": {
+                "title": "Title", "content": {"markdown": "Line one\n\nLine two"},
+                "canonicalUrl": "https://elsewhere.test/a",
+            }},
+        }})
+        [verdict] = _audit(
+            _target("hashnode", url="https://blog.hashnode.dev/a-slug", recorded_hash="stale"),
+        )
+        assert json.loads(route.calls[0].request.content)["variables"] == {
+            "publicationId": "pub", "slug": "a-slug",
+        }
+        assert verdict.status == drift.CANONICAL
+        assert verdict.local_changed
+        assert "expected " + CANONICAL in drift.describe(verdict)
+
+    @respx.mock
+    def test_concurrency_is_bounded(self) -> None:
+        in_flight = peak = 0
+
+        async def slow(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(404)
+
+        respx.get(url__regex=r"https://qiita\.com/api/v2/items/\w+").mock(side_effect=slow)
+        verdicts = _audit(*(_target("qiita", f"q{i}") for i in range(12)), concurrency=3)
+        assert {v.status for v in verdicts} == {drift.MISSING}
+        assert peak == 3
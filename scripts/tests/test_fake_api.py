@@ -0,0 +1,103 @@
+"""Tests for fake_api.py — the publishers end to end against the local fake."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+
+import pytest
+
+import publish
+from fake_api import FakeAPIServer, Faults
+from publish import (
+    find_devto_article_by_title,
+    find_hashnode_post_by_title,
+    find_qiita_item_by_title,
+    publish_to_devto,
+    publish_to_hashnode,
+    publish_to_qiita,
+    update_on_devto,
+    update_on_qiita,
+)
+
+
+@pytest.fixture
+def fake_api(monkeypatch: pytest.MonkeyPatch) -> Iterator[Callable[..., FakeAPIServer]]:
+    """Start a fake server (with the given faults) and point publish.py at it."""
+    servers: list[FakeAPIServer] = []
+
+    def start(**faults: object) -> FakeAPIServer:
+        server = FakeAPIServer(faults=Faults(**faults)).start()
+        servers.append(server)
+        for name, value in server.env().items():
+            monkeypatch.setattr(publish, name, value)
+        return server
+
+    yield start
+    publish.close_clients()
+    for server in servers:
+        server.stop()
+
+
+def _hashnode_payload(title: str) -> dict:
+    return {"query": "mutation publishPost", "variables": {"input": {
+        "title": title, "publicationId": "pub", "contentMarkdown": "body",
+    }}}
+
+
+class TestEndToEnd:
+    def test_qiita_publish_find_update(self, fake_api) -> None:
+        server = fake_api()
+        created = publish_to_qiita({"title": "Hello", "body": "x"}, "token")
+        assert created.success
+
+        assert find_qiita_item_by_title("Hello", "token") == created.remote_id
+        updated = update_on_qiita(created.remote_id, {"title": "Hello v2"}, "token")
+        assert updated.success
+        assert [p["title"] for p in server.posts("qiita")] == ["Hello v2"]
+
+    def test_devto_publish_find_update(self, fake_api) -> None:
+        fake_api()
+        created = publish_to_devto({"article": {"title": "Hi", "published": True}}, "key")
+        assert created.success
+
+        assert find_devto_article_by_title("Hi", "key") == created.remote_id
+        assert update_on_devto(created.remote_id, {"article": {"title": "Hi"}}, "key").success
+        assert not update_on_devto(999, {"article": {"title": "Hi"}}, "key").success
+
+    def test_hashnode_find_follows_pagination(self, fake_api) -> None:
+        fake_api(max_per_page=2)
+        first = publish_to_hashnode(_hashnode_payload("Oldest"), "token")
+        for title in ("Second", "Third", "Newest"):
+            assert publish_to_hashnode(_hashnode_payload(title), "token").success
+
+        assert find_hashnode_post_by_title("Oldest", "pub", "token") == first.remote_id
+
+
+class TestFaultInjection:
+    def test_rate_limited_request_is_retried(self, fake_api) -> None:
+        server = fake_api(rate_limit_every=2, retry_after=0)
+        created = publish_to_qiita({"title": "Hello"}, "token")
+
+        assert update_on_qiita(created.remote_id, {"title": "Hello"}, "token").success
+        assert server.request_count == 3  # create, 429, retried update
+
+    def test_5xx_burst_is_retried_for_reads(self, fake_api) -> None:
+        server = fake_api()
+        publish_to_qiita({"title": "Hello"}, "token")
+        server.state.burst_left = 2
+
+        assert find_qiita_item_by_title("Hello", "token") is not None
+
+    def test_create_during_5xx_burst_is_not_duplicated(self, fake_api) -> None:
+        server = fake_api()
+        server.state.burst_left = 1
+
+        result = publish_to_qiita({"title": "Hello"}, "token")
+
+        assert result.success
+        assert len(server.posts("qiita")) == 1
+
+    def test_latency_is_applied(self, fake_api) -> None:
+        server = fake_api(latency=0.05)
+        publish_to_qiita({"title": "Hello"}, "token")
+        assert server.request_count == 1
@@ -0,0 +1,105 @@
+"""Tests for git_ops.py — batched commit + push against a local bare remote."""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from git_ops import GitError, commit_and_push
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], check=True, capture_output=True, text=True,
+    ).stdout.strip()
+
+
+def _clone(remote: Path, path: Path) -> Path:
+    subprocess.run(["git", "clone", "-q", str(remote), str(path)], check=True)
+    _git(path, "config", "user.email", "test@example.com")
+    _git(path, "config", "user.name", "test")
+    return path
+
+
+@pytest.fixture
+def remote(tmp_path: Path) -> Path:
+    remote = tmp_path / "remote.git"
+    subprocess.run(["git", "init", "-q", "--bare", "-b", "main", str(remote)], check=True)
+    seed = _clone(remote, tmp_path / "seed")
+    (seed / "README.md").write_text("seed\n")
+    _git(seed, "add", "README.md")
+    _git(seed, "commit", "-q", "-m", "seed")
+    _git(seed, "push", "-q", "origin", "main")
+    return remote
+
+
+class TestCommitAndPush:
+    def test_one_commit_for_all_paths(self, remote: Path, tmp_path: Path) -> None:
+        repo = _clone(remote, tmp_path / "work")
+        for name in ("a.md", "b.md"):
+            (repo / name).write_text(name)
+
+        assert commit_and_push(repo, ["a.md", "b.md"], "publish") is True
+
+        assert _git(remote, "log", "--format=%s", "main") == "publish\nseed"
+        assert _git(remote, "show", "--name-only", "--format=", "main").split() == ["a.md", "b.md"]
+
+    def test_rejected_push_rebases_and_retries(self, remote: Path, tmp_path: Path) -> None:
+        repo = _clone(remote, tmp_path / "work")
+        other = _clone(remote, tmp_path / "other")
+        (other / "other.md").write_text("x")
+        _git(other, "add", "other.md")
+        _git(other, "commit", "-q", "-m", "concurrent")
+        _git(other, "push", "-q")
+
+        (repo / "a.md").write_text("a")
+        commit_and_push(repo, ["a.md"], "publish")
+
+        assert _git(remote, "log", "--format=%s", "main") == "publish\nconcurrent\nseed"
+
+    def test_rejected_push_with_dirty_tree_keeps_local_changes(
+        self, remote: Path, tmp_path: Path,
+    ) -> None:
+        repo = _clone(remote, tmp_path / "work")
+        other = _clone(remote, tmp_path / "other")
+        (other / "other.md").write_text("x")
+        _git(other, "add", "other.md")
+        _git(other, "commit", "-q", "-m", "concurrent")
+        _git(other, "push", "-q")
+
+        # Like schedule.json after a run: tracked, modified, not committed.
+        (repo / "README.md").write_text("local edit\n")
+        (repo / "a.md").write_text("a")
+        commit_and_push(repo, ["a.md"], "publish")
+
+        assert _git(remote, "log", "--format=%s", "main") == "publish\nconcurrent\nseed"
+        assert (repo / "README.md").read_text() == "local edit\n"
+        assert _git(repo, "status", "--porcelain") == "M README.md"
+
+    def test_nothing_to_commit_still_pushes_earlier_commits(
+        self, remote: Path, tmp_path: Path,
+    ) -> None:
+        repo = _clone(remote, tmp_path / "work")
+        (repo / "a.md").write_text("a")
+        _git(repo, "add", "a.md")
+        _git(repo, "commit", "-q", "-m", "unpushed")
+
+        assert commit_and_push(repo, ["a.md"], "publish") is False
+        assert _git(remote, "log", "-1", "--format=%s", "main") == "unpushed"
+
+    def test_conflicting_rebase_is_aborted(self, remote: Path, tmp_path: Path) -> None:
+        repo = _clone(remote, tmp_path / "work")
+        other = _clone(remote, tmp_path / "other")
+        (other / "README.md").write_text("theirs\n")
+        _git(other, "commit", "-q", "-am", "theirs")
+        _git(other, "push", "-q")
+
+        (repo / "README.md").write_text("ours\n")
+        with pytest.raises(GitError, match="pull --rebase"):
+            commit_and_push(repo, ["README.md"], "ours")
+        assert not (repo / ".git" / "rebase-merge").exists()
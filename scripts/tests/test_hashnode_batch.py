@@ -0,0 +1,168 @@
+"""Tests for hashnode_batch.py — aliased GraphQL batches and the batcher."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Iterator
+from typing import Any
+
+import httpx
+import pytest
+import respx
+
+import publish
+from fake_api import FakeAPIServer
+from hashnode_batch import (
+    HashnodeBatcher,
+    Op,
+    build_request,
+    parse_response,
+    publish_op,
+    split,
+    update_op,
+)
+from publish import Article
+
+GQL = "https://gql.hashnode.com"
+
+
+def _article(title: str = "T") -> Article:
+    return Article(title=title, body="本文", topics=("python",))
+
+
+def _post(post_id: str) -> dict[str, Any]:
+    return {"post": {"id": post_id, "slug": post_id, "title": "t", "url": f"https://h.dev/{post_id}"}}
+
+
+def _payload(title: str) -> dict:
+    return {"query": "mutation publishPost", "variables": {"input": {
+        "title": title, "publicationId": "pub", "contentMarkdown": "body",
+    }}}
+
+
+def _run(coro: Any) -> Any:
+    async def scenario() -> Any:
+        try:
+            return await coro
+        finally:
+            await publish.aclose_clients()
+
+    return asyncio.run(scenario())
+
+
+class TestBuildAndParse:
+    def test_aliases_and_variables(self) -> None:
+        request = build_request([update_op("p1", _article()), update_op("p2", _article())])
+        assert "mutation Batch($i0: UpdatePostInput!, $i1: UpdatePostInput!)" in request["query"]
+        assert "op1: updatePost(input: $i1)" in request["query"]
+        assert [v["id"] for v in request["variables"].values()] == ["p1", "p2"]
+        assert build_request([publish_op(_payload("X"))])["variables"]["i0"]["title"] == "X"
+
+    def test_errors_map_to_their_alias(self) -> None:
+        resp = httpx.Response(200, json={
+            "data": {"op0": _post("p1"), "op1": None},
+            "errors": [{"message": "Post not found", "path": ["op1"]}],
+        })
+        ok, failed = parse_response(resp, 2)
+        assert ok.success and ok.remote_id == "p1"
+        assert not failed.success and "Post not found" in failed.error
+        assert failed.not_found and not ok.not_found
+
+    def test_error_without_path_fails_the_batch(self) -> None:
+        resp = httpx.Response(200, json={"errors": [{"message": "Unauthenticated"}]})
+        assert [(r.success, r.not_found) for r in parse_response(resp, 2)] == [(False, False)] * 2
+        resp = httpx.Response(401, text="no")
+        assert all(r.error.startswith("401") for r in parse_response(resp, 3))
+
+
+class TestSplit:
+    def test_caps_operation_count(self) -> None:
+        ops = [update_op(f"p{i}", _article()) for i in range(7)]
+        assert [len(batch) for batch in split(ops, max_ops=3)] == [3, 3, 1]
+
+    def test_caps_size_but_sends_a_large_op_alone(self) -> None:
+        small, large = Op("updatePost", {"x": "a"}), Op("updatePost", {"x": "a" * 100})
+        batches = split([small, small, large, small], max_bytes=50)
+        assert [len(batch) for batch in batches] == [2, 1, 1]
+
+
+class TestHashnodeBatcher:
+    @respx.mock
+    def test_concurrent_updates_share_a_request(self) -> None:
+        bodies: list[dict] = []
+
+        def reply(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            bodies.append(body)
+            ids = [v["id"] for v in body["variables"].values()]
+            return httpx.Response(200, json={"data": {
+                f"op{i}": _post(post_id) for i, post_id in enumerate(ids)
+            }})
+
+        respx.post(GQL).mock(side_effect=reply)
+        batcher = HashnodeBatcher("token", "pub", max_ops=4)
+
+        async def scenario() -> list:
+            return await asyncio.gather(*(
+                batcher.update(f"p{i}", _article()) for i in range(6)
+            ))
+
+        results = _run(scenario())
+        assert [r.remote_id for r in results] == [f"p{i}" for i in range(6)]
+        assert [len(body["variables"]) for body in bodies] == [4, 2]
+
+    @respx.mock
+    def test_titles_share_one_listing_scan(self) -> None:
+        route = respx.post(GQL).respond(200, json={"data": {"publication": {"posts": {
+            "edges": [{"node": {"id": "h1", "title": "A"}}, {"node": {"id": "h2", "title": "B"}}],
+            "pageInfo": {"hasNextPage": False},
+        }}}})
+        batcher = HashnodeBatcher("token", "pub")
+
+        async def scenario() -> list:
+            return await asyncio.gather(batcher.find("A"), batcher.find("B"), batcher.find("C"))
+
+        assert _run(scenario()) == ["h1", "h2", None]
+        assert route.call_count == 1
+
+    @respx.mock
+    def test_transport_error_reaches_every_caller(self) -> None:
+        respx.post(GQL).mock(side_effect=httpx.ConnectError("refused"))
+        batcher = HashnodeBatcher("token", "pub")
+
+        async def scenario() -> list:
+            return await asyncio.gather(
+                batcher.update("p1", _article()), batcher.update("p2", _article()),
+                return_exceptions=True,
+            )
+
+        assert all(isinstance(r, httpx.ConnectError) for r in _run(scenario()))
+
+
+class TestAgainstFakeAPI:
+    @pytest.fixture
+    def server(self, monkeypatch: pytest.MonkeyPatch) -> Iterator[FakeAPIServer]:
+        server = FakeAPIServer().start()
+        for name, value in server.env().items():
+            monkeypatch.setattr(publish, name, value)
+        yield server
+        server.stop()
+
+    def test_publish_then_update_with_one_missing(self, server: FakeAPIServer) -> None:
+        batcher = HashnodeBatcher("token", "pub")
+
+        async def scenario() -> tuple[list, list]:
+            created = await asyncio.gather(
+                batcher.publish(_payload("One")), batcher.publish(_payload("Two")),
+            )
+            updated = await asyncio.gather(
+                batcher.update(created[0].remote_id, _article("One v2")),
+                batcher.update("missing", _article("Ghost")),
+            )
+            return created, updated
+
+        created, updated = _run(scenario())
+        assert all(r.success for r in created)
+        assert [r.success for r in updated] == [True, False]
+        assert sorted(p["title"] for p in server.posts("hashnode")) == ["One v2", "Two"]
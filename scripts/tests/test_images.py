@@ -0,0 +1,134 @@
+"""Tests for images.py — hashed image derivatives and the image audit."""
+
+from __future__ import annotations
+
+import hashlib
+import shutil
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import images
+from article_index import ArticleIndex
+from images import ImageStore, audit, optimize, references
+
+
+def _store(tmp_path: Path, **kwargs) -> ImageStore:
+    directory = tmp_path / "images"
+    directory.mkdir(exist_ok=True)
+    return ImageStore(directory, raw_base="https://raw.example/images", **kwargs)
+
+
+class TestImageStore:
+    def test_derived_name_is_content_hashed(self, tmp_path: Path) -> None:
+        store = _store(tmp_path)
+        (store.images_dir / "a.png").write_bytes(b"one")
+        digest = hashlib.sha256(b"one").hexdigest()[:12]
+        assert store.derived_name("a.png") == f"derived/a.{digest}.png"
+        assert store.derived_name("missing.png") is None
+
+    def test_url_falls_back_until_derivative_exists(self, tmp_path: Path) -> None:
+        store = _store(tmp_path)
+        (store.images_dir / "a.png").write_bytes(b"one")
+        assert store.url("a.png") == "https://raw.example/images/a.png"
+        assert store.url("missing.png") == "https://raw.example/images/missing.png"
+
+        store.build(["a.png"])
+        assert store.url("a.png") == f"https://raw.example/images/{store.derived_name('a.png')}"
+
+    def test_untracked_derivative_is_not_used_in_a_checkout(self, tmp_path: Path) -> None:
+        store = _store(tmp_path)
+        (store.images_dir / "a.png").write_bytes(b"one")
+        store.build(["a.png"])
+        with patch.object(images, "_git_pushed", return_value=frozenset()):
+            assert store.url("a.png") == "https://raw.example/images/a.png"
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+    def test_derivative_is_used_once_pushed(self, tmp_path: Path) -> None:
+        remote, repo = tmp_path / "remote.git", tmp_path / "work"
+        subprocess.run(["git", "init", "-q", "--bare", "-b", "main", str(remote)], check=True)
+        subprocess.run(["git", "clone", "-q", str(remote), str(repo)], check=True)
+
+        def git(*args: str) -> None:
+            subprocess.run(
+                ["git", "-C", str(repo), "-c", "user.name=t", "-c", "user.email=t@example.com",
+                 *args], check=True, capture_output=True,
+            )
+
+        (repo / "images").mkdir()
+        (repo / "images" / "a.png").write_bytes(b"one")
+        git("add", ".")
+        git("commit", "-q", "-m", "image")
+        git("push", "-q", "origin", "main")
+
+        store = ImageStore(repo / "images", raw_base="https://raw.example/images")
+        store.build(["a.png"])
+        git("add", ".")
+        git("commit", "-q", "-m", "derivative")
+        # Committed but not pushed: the raw URL would be a 404.
+        assert store.url("a.png") == "https://raw.example/images/a.png"
+
+        git("push", "-q", "origin", "main")
+        store = ImageStore(repo / "images", raw_base="https://raw.example/images")
+        assert store.url("a.png") == f"https://raw.example/images/{store.derived_name('a.png')}"
+
+    def test_edited_image_gets_a_new_name(self, tmp_path: Path) -> None:
+        store = _store(tmp_path)
+        path = store.images_dir / "a.png"
+        path.write_bytes(b"one")
+        before = store.derived_name("a.png")
+        path.write_bytes(b"two!")
+        assert store.derived_name("a.png") != before
+
+    def test_hash_cache_skips_unchanged_files(self, tmp_path: Path) -> None:
+        index_path = tmp_path / "hashes.json"
+        store = _store(tmp_path, index_path=index_path)
+        (store.images_dir / "a.png").write_bytes(b"one")
+        expected = store.digest("a.png")
+        store.save()
+        with patch.object(hashlib, "sha256") as sha256:
+            assert _store(tmp_path, index_path=index_path).digest("a.png") == expected
+        sha256.assert_not_called()
+
+    def test_build_is_idempotent(self, tmp_path: Path) -> None:
+        store = _store(tmp_path)
+        (store.images_dir / "a.png").write_bytes(b"one")
+        assert len(store.build(["a.png", "missing.png"])) == 1
+        assert store.build(["a.png"]) == []
+
+    def test_build_downscales_wide_png(self, tmp_path: Path) -> None:
+        image_module = pytest.importorskip("PIL.Image")
+        store = _store(tmp_path)
+        image_module.new("RGB", (400, 100), "white").save(store.images_dir / "wide.png")
+        (created,) = store.build(["wide.png"], max_width=200)
+        with image_module.open(created) as image:
+            assert image.size == (200, 50)
+
+
+class TestOptimize:
+    def test_without_pillow_copies(self, tmp_path: Path) -> None:
+        path = tmp_path / "a.png"
+        path.write_bytes(b"not really a png")
+        with patch.dict("sys.modules", {"PIL": None}):
+            assert optimize(path) == b"not really a png"
+
+
+class TestAudit:
+    def test_missing_and_unused(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(images, "REPO_ROOT", tmp_path)
+        store = _store(tmp_path)
+        (store.images_dir / "used.png").write_bytes(b"1")
+        (store.images_dir / "orphan.png").write_bytes(b"2")
+        store.build(["used.png"])  # derivatives never count as unused
+        article = tmp_path / "articles" / "a.md"
+        article.parent.mkdir()
+        article.write_text(
+            "---\ntitle: A\n---\n![u](/images/used.png)\n![m](/images/gone.png)\n"
+            "```\n![doc](/images/example.png)\n```\n"
+        )
+        refs = references([article], ArticleIndex(tmp_path / "index.json"))
+        result = audit(refs, store)
+        assert result.missing == {"gone.png": ["articles/a.md"]}
+        assert result.unused == ["orphan.png"]
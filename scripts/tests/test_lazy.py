@@ -0,0 +1,51 @@
+"""Tests for lazy.py — deferred imports keep the quick paths light."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from lazy import lazy_import
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+HEAVY = ("httpx", "asyncio", "yaml", "frontmatter", "publish", "cProfile", "tracemalloc")
+
+
+def _loaded_after(code: str) -> list[str]:
+    """Heavy modules actually executed by ``code`` in a fresh interpreter."""
+    probe = (
+        f"{code}; import json, sys; print(json.dumps(sorted(n for n in {HEAVY!r} "
+        "if n in sys.modules and type(sys.modules[n]).__name__ != '_LazyModule')))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=SCRIPTS_DIR, check=True, capture_output=True, text=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestLazyImport:
+    def test_returns_loaded_module(self) -> None:
+        assert lazy_import("json") is json
+
+    def test_missing_module_fails_at_once(self) -> None:
+        with pytest.raises(ModuleNotFoundError):
+            lazy_import("no_such_module_here")
+
+
+class TestQuickPaths:
+    @pytest.mark.parametrize("module", ["zenn_publish", "scheduled_publish", "plan_schedule"])
+    def test_import_loads_no_heavy_modules(self, module: str) -> None:
+        assert _loaded_after(f"import {module}") == []
+
+    def test_scheduled_status_loads_no_heavy_modules(self) -> None:
+        code = "import scheduled_publish as m; m.show_status(m.load_schedule())"
+        assert _loaded_after(code) == []
+
+    def test_first_use_loads_the_module(self) -> None:
+        assert "publish" in _loaded_after("import scheduled_publish as m; m.publish.Article")
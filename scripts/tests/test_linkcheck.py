@@ -0,0 +1,142 @@
+"""Tests for linkcheck.py — concurrent dead-link checking with a result cache."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+
+import linkcheck
+from images import GITHUB_RAW_BASE
+from linkcheck import (
+    LinkChecker,
+    LinkResult,
+    ResultCache,
+    check_articles,
+    extract_urls,
+    is_ignored,
+    load_ignore_patterns,
+)
+
+
+def _checker(tmp_path: Path, **kwargs) -> LinkChecker:
+    return LinkChecker(ResultCache(tmp_path / "links.json"), **kwargs)
+
+
+def _check(checker: LinkChecker, *urls: str) -> dict[str, LinkResult]:
+    return asyncio.run(checker.check(urls))
+
+
+class TestExtractUrls:
+    def test_links_autolinks_and_bare_urls(self) -> None:
+        body = (
+            "See [docs](https://a.test/docs) and <https://b.test/x>.\n"
+            "Bare https://c.test/path?q=1, then text.\n"
+            "@[card](https://a.test/docs)\n"
+        )
+        assert extract_urls(body) == [
+            "https://a.test/docs", "https://b.test/x", "https://c.test/path?q=1",
+        ]
+
+    def test_code_is_skipped(self) -> None:
+        body = "```\nhttps://fenced.test/\n```\nrun `curl https://inline.test/` now\n"
+        assert extract_urls(body) == []
+
+    def test_article_images_are_rewritten(self, tmp_path: Path) -> None:
+        path = tmp_path / "a.md"
+        path.write_text("---\ntitle: A\n---\n![x](/images/nope.png)\n")
+        assert linkcheck.article_urls(path) == [f"{GITHUB_RAW_BASE}/nope.png"]
+
+
+class TestIgnore:
+    def test_textlint_patterns(self) -> None:
+        patterns = load_ignore_patterns()
+        assert is_ignored("https://medium.com/@x/post", patterns)
+        assert not is_ignored("https://zenn.dev/x", patterns)
+
+    def test_reserved_hosts(self) -> None:
+        assert is_ignored("http://localhost:8000/", ())
+        assert is_ignored("https://example.com/a", ())
+
+
+class TestLinkChecker:
+    @respx.mock
+    def test_head_then_get_fallback(self, tmp_path: Path) -> None:
+        respx.head("https://a.test/").respond(405)
+        get = respx.get("https://a.test/").respond(200)
+        respx.head("https://b.test/").respond(200)
+        results = _check(_checker(tmp_path), "https://a.test/", "https://b.test/")
+        assert results["https://a.test/"].ok is True
+        assert results["https://b.test/"].status == 200
+        assert get.call_count == 1
+
+    @respx.mock
+    def test_broken_and_unreachable(self, tmp_path: Path) -> None:
+        respx.head("https://gone.test/").respond(404)
+        respx.get("https://gone.test/").respond(404)
+        respx.head("https://down.test/").mock(side_effect=httpx.ConnectError("refused"))
+        results = _check(_checker(tmp_path), "https://gone.test/", "https://down.test/")
+        assert results["https://gone.test/"] == LinkResult("https://gone.test/", False, 404)
+        assert results["https://down.test/"].ok is False
+        assert "ConnectError" in results["https://down.test/"].error
+
+    @respx.mock
+    def test_rate_limited_is_inconclusive_and_not_cached(self, tmp_path: Path) -> None:
+        route = respx.head("https://busy.test/").respond(429)
+        checker = _checker(tmp_path)
+        assert _check(checker, "https://busy.test/")["https://busy.test/"].ok is None
+        _check(checker, "https://busy.test/")
+        assert route.call_count == 2
+
+    @respx.mock
+    def test_results_are_cached_until_ttl(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        route = respx.head("https://a.test/").respond(200)
+        checker = _checker(tmp_path)
+        _check(checker, "https://a.test/")
+        checker.cache.save()
+
+        again = _checker(tmp_path)
+        assert _check(again, "https://a.test/")["https://a.test/"].cached
+        assert route.call_count == 1
+
+        now = linkcheck.time.time()
+        monkeypatch.setattr(linkcheck.time, "time", lambda: now + linkcheck.OK_TTL + 1)
+        assert not _check(again, "https://a.test/")["https://a.test/"].cached
+        assert route.call_count == 2
+
+    @respx.mock
+    def test_per_host_limit(self, tmp_path: Path) -> None:
+        in_flight: dict[str, int] = {}
+        peak: dict[str, int] = {}
+
+        async def slow(request: httpx.Request) -> httpx.Response:
+            host = request.url.host
+            in_flight[host] = in_flight.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), in_flight[host])
+            await asyncio.sleep(0.01)
+            in_flight[host] -= 1
+            return httpx.Response(200)
+
+        respx.head(url__regex=r"https://(a|b)\.test/\d").mock(side_effect=slow)
+        urls = [f"https://{host}.test/{i}" for host in "ab" for i in range(6)]
+        results = _check(_checker(tmp_path, per_host=2), *urls)
+        assert all(result.ok for result in results.values())
+        assert peak == {"a.test": 2, "b.test": 2}
+
+
+class TestCheckArticles:
+    @respx.mock
+    def test_broken_links_by_article(self, tmp_path: Path) -> None:
+        good, bad = tmp_path / "good.md", tmp_path / "bad.md"
+        good.write_text("---\ntitle: G\n---\nhttps://ok.test/\n")
+        bad.write_text("---\ntitle: B\n---\nhttps://ok.test/ and https://gone.test/\n")
+        respx.head("https://ok.test/").respond(200)
+        respx.head("https://gone.test/").respond(410)
+        broken = asyncio.run(check_articles([good, bad], _checker(tmp_path)))
+        assert list(broken) == [bad]
+        assert [link.url for link in broken[bad]] == ["https://gone.test/"]
@@ -0,0 +1,128 @@
+"""Tests for metrics.py — registry export and request instrumentation."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import httpx
+import respx
+
+import metrics
+from metrics import Registry, endpoint
+from publish import Article, convert_to_qiita, find_qiita_item_by_title, publish_to_qiita
+
+QIITA_ITEMS = "https://qiita.com/api/v2/items"
+QIITA_LIST = "https://qiita.com/api/v2/authenticated_user/items"
+
+
+class TestRegistry:
+    def test_prometheus_text_format(self) -> None:
+        registry = Registry()
+        registry.inc("publish_requests_total", platform="qiita", status="201")
+        registry.inc("publish_requests_total", platform="qiita", status="201")
+        registry.set("publish_run_errors", 0)
+        registry.observe("publish_request_duration_seconds", 0.2, platform="qiita")
+
+        text = registry.to_prometheus()
+
+        assert "# TYPE publish_requests_total counter" in text
+        assert 'publish_requests_total{platform="qiita",status="201"} 2' in text
+        assert "publish_run_errors 0" in text
+        assert "# TYPE publish_request_duration_seconds histogram" in text
+        assert 'publish_request_duration_seconds_bucket{platform="qiita",le="0.1"} 0' in text
+        assert 'publish_request_duration_seconds_bucket{platform="qiita",le="0.25"} 1' in text
+        assert 'publish_request_duration_seconds_bucket{platform="qiita",le="+Inf"} 1' in text
+        assert 'publish_request_duration_seconds_count{platform="qiita"} 1' in text
+
+    def test_label_values_are_escaped(self) -> None:
+        registry = Registry()
+        registry.inc("x_total", reason='a "b"\nc')
+        assert 'x_total{reason="a \\"b\\"\\nc"} 1' in registry.to_prometheus()
+
+    def test_write_prom_and_json_summary(self, tmp_path: Path) -> None:
+        registry = Registry()
+        registry.observe("publish_conversion_seconds", 0.01, platform="devto")
+
+        prom_path, json_path = registry.write(tmp_path, "publish_due", exit_code=0)
+
+        assert prom_path == tmp_path / "publish_due.prom"
+        assert "publish_conversion_seconds_sum" in prom_path.read_text()
+        summary = json.loads(json_path.read_text())
+        assert summary["exit_code"] == 0
+        [series] = summary["histograms"]["publish_conversion_seconds"]
+        assert series["labels"] == {"platform": "devto"}
+        assert series["value"]["count"] == 1
+        assert list(tmp_path.glob(".*.tmp")) == []
+
+    def test_phase_accumulates(self) -> None:
+        with metrics.phase("save"):
+            pass
+        with metrics.phase("save"):
+            pass
+        assert metrics.registry.value("publish_phase_duration_seconds", phase="save") > 0
+
+
+class TestEndpointLabel:
+    def test_ids_are_replaced(self) -> None:
+        request = httpx.Request("PATCH", "https://qiita.com/api/v2/items/c686397e4a0f4f11683d")
+        assert endpoint("qiita", request) == "PATCH /api/v2/items/{id}"
+        request = httpx.Request("PUT", "https://dev.to/api/articles/123")
+        assert endpoint("devto", request) == "PUT /api/articles/{id}"
+
+    def test_graphql_operation_name(self) -> None:
+        request = httpx.Request(
+            "POST", "https://gql.hashnode.com",
+            json={"query": "mutation PublishPost($input: PublishPostInput!) { x }"},
+        )
+        assert endpoint("hashnode", request) == "PublishPost"
+
+
+class TestInstrumentation:
+    @respx.mock
+    def test_request_latency_status_and_bytes(self) -> None:
+        respx.post(QIITA_ITEMS).mock(return_value=httpx.Response(201, json={"id": "a", "url": "u"}))
+
+        publish_to_qiita({"title": "T"}, "token")
+
+        registry = metrics.registry
+        labels = {"platform": "qiita", "endpoint": "POST /api/v2/items"}
+        assert registry.value("publish_requests_total", status="201", **labels) == 1
+        assert registry.value("publish_request_bytes_total", **labels) > 0
+        [histogram] = registry.histograms["publish_request_duration_seconds"].values()
+        assert histogram.count == 1
+
+    @respx.mock
+    def test_transient_retry_is_counted(self) -> None:
+        respx.get(QIITA_LIST).mock(side_effect=[
+            httpx.Response(503),
+            httpx.Response(200, json=[{"id": "a", "title": "T"}]),
+        ])
+
+        assert find_qiita_item_by_title("T", "token") == "a"
+
+        labels = {"platform": "qiita", "endpoint": "GET /api/v2/authenticated_user/items"}
+        assert metrics.registry.value("publish_retries_total", reason="503", **labels) == 1
+        assert metrics.registry.value("publish_find_pages_total", platform="qiita") == 1
+
+    @respx.mock
+    def test_create_resend_is_counted(self) -> None:
+        respx.post(QIITA_ITEMS).mock(side_effect=[
+            httpx.Response(502),
+            httpx.Response(201, json={"id": "a", "url": "u"}),
+        ])
+        respx.get(QIITA_LIST).mock(return_value=httpx.Response(200, json=[]))
+
+        assert publish_to_qiita({"title": "T"}, "token").success
+        assert metrics.registry.value(
+            "publish_retries_total", platform="qiita", endpoint="create", reason="502",
+        ) == 1
+
+    def test_conversion_time_by_cache_outcome(self) -> None:
+        article = Article(title="T", topics=("python",), body="Body")
+        convert_to_qiita(article)
+        convert_to_qiita(article)
+
+        series = metrics.registry.histograms["publish_conversion_seconds"]
+        counts = {dict(labels)["cache"]: h.count for labels, h in series.items()}
+        assert counts == {"miss": 1, "hit": 1}
@@ -0,0 +1,85 @@
+"""Tests for plan_schedule.py — the capped batch planner."""
+
+from __future__ import annotations
+
+from collections import Counter
+from datetime import date
+
+import pytest
+
+from plan_schedule import generate_schedule, parse_caps, plan_batch
+
+MONDAY = date(2026, 3, 2)
+
+
+def _dates(entries: list[dict], key: str = "date") -> list[str]:
+    return [entry[key] for entry in entries if key in entry]
+
+
+class TestPlanBatch:
+    def test_one_zenn_post_per_day_every_day(self) -> None:
+        entries = plan_batch(["a", "b", "c"], MONDAY)
+        assert _dates(entries, "zenn_date") == ["2026-03-02", "2026-03-03", "2026-03-04"]
+        assert _dates(entries) == ["2026-03-03", "2026-03-04", "2026-03-05"]
+
+    def test_cadence_limits_zenn_days(self) -> None:
+        entries = plan_batch(["a", "b"], MONDAY, publish_days=[1, 3])
+        assert _dates(entries, "zenn_date") == ["2026-03-03", "2026-03-05"]
+
+    def test_existing_entries_use_capacity(self) -> None:
+        existing = {"articles": [
+            {"file": "articles/old.md", "zenn_date": "2026-03-02", "date": "2026-03-03",
+             "qiita": None, "devto": "n/a", "hashnode": "n/a"},
+            {"file": "articles-en/x.md", "date": "2026-03-03",
+             "devto": "pending", "hashnode": "pending"},
+        ]}
+        entries = plan_batch(["old", "a"], MONDAY, existing, include_en_translation=True)
+        jp, en = entries
+        assert jp["file"] == "articles/a.md"
+        assert (jp["zenn_date"], jp["date"]) == ("2026-03-03", "2026-03-04")
+        # Dev.to/Hashnode are taken on the Zenn day, so EN moves a day later.
+        assert en["date"] == "2026-03-04"
+        assert en["depends_on"] == "articles/a.md"
+
+    def test_en_gap_keeps_pair_apart(self) -> None:
+        existing = {"articles": [
+            {"file": "articles-en/x.md", "date": "2026-03-02",
+             "devto": "pending", "hashnode": "pending"},
+        ]}
+        # Without a gap, EN moves off the taken Zenn day onto the Qiita day.
+        jp, en = plan_batch(["a"], MONDAY, existing, include_en_translation=True)
+        assert jp["date"] == en["date"] == "2026-03-03"
+        _, en = plan_batch(["a"], MONDAY, existing, include_en_translation=True, en_gap=1)
+        assert en["date"] == "2026-03-04"
+        # Already far enough apart: left where it is.
+        _, en = plan_batch(["a"], MONDAY, include_en_translation=True, en_gap=1)
+        assert en["date"] == "2026-03-02"
+
+    def test_caps_hold_for_thousands_of_slugs(self) -> None:
+        slugs = [f"s{i}" for i in range(3000)]
+        caps = {"zenn": 2, "qiita": 1, "devto": 3, "hashnode": 2}
+        entries = plan_batch(slugs, MONDAY, caps=caps, include_en_translation=True)
+
+        jp = [e for e in entries if e["file"].startswith("articles/")]
+        en = [e for e in entries if e["file"].startswith("articles-en/")]
+        assert max(Counter(_dates(jp, "zenn_date")).values()) == 2
+        assert max(Counter(_dates(jp)).values()) == 1
+        assert max(Counter(_dates(en)).values()) == 2  # both platforms: tighter cap
+        zenn = _dates(jp, "zenn_date")
+        assert zenn == sorted(zenn)  # priority order kept
+        assert all(e["date"] > e["zenn_date"] for e in jp)
+
+    def test_same_entry_shape_as_greedy(self) -> None:
+        planned = plan_batch(["a"], MONDAY, include_en_translation=True)
+        greedy = generate_schedule(["a"], MONDAY, include_en_translation=True)
+        assert [sorted(e) for e in planned] == [sorted(e) for e in greedy]
+
+
+class TestParseCaps:
+    def test_valid(self) -> None:
+        assert parse_caps(["qiita=2", "zenn=1"]) == {"qiita": 2, "zenn": 1}
+
+    @pytest.mark.parametrize("value", ["medium=1", "qiita=0", "qiita"])
+    def test_invalid(self, value: str) -> None:
+        with pytest.raises(SystemExit):
+            parse_caps([value])
@@ -0,0 +1,73 @@
+"""Tests for profiling.py — the --profile switch shared by the CLIs."""
+
+from __future__ import annotations
+
+import json
+import pstats
+import re
+from pathlib import Path
+from unittest.mock import patch
+
+import profiling
+from profiling import profiled
+from publish import main
+
+
+def _work() -> None:
+    json.loads(json.dumps([{"a": i} for i in range(2000)]))
+    re.sub(r"\d+", "n", "x1 y22 z333" * 500)
+
+
+class TestProfiled:
+    def test_disabled_writes_nothing(self, tmp_path: Path) -> None:
+        with profiled(None, "script"):
+            _work()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_writes_pstats_and_report(self, tmp_path: Path) -> None:
+        out = tmp_path / "prof"
+        with profiled(out, "script"):
+            _work()
+
+        [dump] = out.glob("script-*.pstats")
+        [report] = out.glob("script-*.txt")
+        assert pstats.Stats(str(dump)).total_calls > 0
+        text = report.read_text()
+        assert "Time by category" in text
+        assert "json" in text and "regex" in text
+        assert "allocation sites" in text
+
+    def test_report_written_when_run_raises(self, tmp_path: Path) -> None:
+        try:
+            with profiled(tmp_path, "script"):
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+        assert len(list(tmp_path.glob("script-*.txt"))) == 1
+
+
+class TestCategorize:
+    def test_self_time_goes_to_first_matching_category(self) -> None:
+        stats = pstats.Stats.__new__(pstats.Stats)
+        stats.stats = {
+            ("~", 0, "<method 'sub' of 're.Pattern' objects>"): (1, 1, 0.5, 0.5, {}),
+            ("/lib/yaml/constructor.py", 10, "construct"): (1, 1, 0.25, 0.3, {}),
+            ("~", 0, "<method 'poll' of 'select.epoll' objects>"): (1, 1, 2.0, 2.0, {}),
+            ("/repo/publish.py", 1, "main"): (1, 1, 0.1, 3.0, {}),
+        }
+        totals = profiling.categorize(stats)
+        assert totals == {
+            "regex": 0.5, "yaml": 0.25, "http (incl. waits)": 2.0, "other": 0.1,
+        }
+
+
+class TestCliFlag:
+    def test_publish_dry_run_profile(self, tmp_path: Path) -> None:
+        article = Path(__file__).parent / "fixtures" / "sample-article.md"
+        argv = [
+            "publish.py", str(article), "--platform", "qiita", "--dry-run",
+            "--profile", str(tmp_path),
+        ]
+        with patch("sys.argv", argv):
+            assert main() == 0
+        assert len(list(tmp_path.glob("publish-*.pstats"))) == 1
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import json
 import os
 from pathlib import Path
 from unittest.mock import patch
@@ -11,25 +13,44 @@ import httpx
 import pytest
 import respx
 
+import publish
+from images import ImageStore
 from publish import (
     Article,
+    PLATFORMS,
     PublishResult,
+    _expand_article_paths,
+    _expand_platforms,
     _load_env,
     _strip_zenn_syntax,
     build_parser,
+    close_clients,
     convert_to_devto,
     convert_to_hashnode,
     convert_to_qiita,
     find_devto_article_by_title,
+    find_devto_article_by_title_async,
+    find_hashnode_post_by_title,
+    find_hashnode_post_by_title_async,
     find_qiita_item_by_title,
+    find_qiita_item_by_title_async,
+    get_async_client,
+    get_client,
+    iter_qiita_items,
     main,
     parse_zenn_article,
+    payload_hash,
     publish_to_devto,
+    publish_to_devto_async,
     publish_to_hashnode,
+    publish_to_hashnode_async,
     publish_to_qiita,
+    publish_to_qiita_async,
     update_on_devto,
     update_on_hashnode,
+    update_on_hashnode_async,
     update_on_qiita,
+    update_on_qiita_async,
     _run_qiita,
     _run_devto,
     _run_hashnode,
@@ -78,6 +99,19 @@ class TestStripZennSyntax:
         result = _strip_zenn_syntax(md)
         assert result == f"![alt]({GITHUB_RAW_BASE}/screenshot.png)"
 
+    def test_images_use_committed_derivative(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        store = ImageStore(tmp_path, raw_base="https://raw.example/images")
+        (tmp_path / "shot.png").write_bytes(b"png")
+        derived = store.derived_name("shot.png")
+        assert derived is not None
+        (tmp_path / derived).parent.mkdir()
+        (tmp_path / derived).write_bytes(b"png")
+        monkeypatch.setattr(publish, "_images", store)
+        result = _strip_zenn_syntax("![alt](/images/shot.png =250x)")
+        assert result == f"![alt](https://raw.example/images/{derived} =250x)"
+
     def test_message_to_blockquote(self) -> None:
         md = ":::message\n注意してください。\n行2です。\n:::"
         result = _strip_zenn_syntax(md)
@@ -97,6 +131,46 @@ class TestStripZennSyntax:
         md = "普通の Markdown テキスト"
         assert _strip_zenn_syntax(md) == md
 
+    def test_code_fence_left_verbatim(self) -> None:
+        md = (
+            "```markdown\n"
+            ":::message\nnote\n:::\n"
+            "![alt](/images/a.png)\n"
+            "```\n"
+            "![alt](/images/b.png)\n"
+        )
+        result = _strip_zenn_syntax(md)
+        assert ":::message\nnote\n:::\n" in result
+        assert "![alt](/images/a.png)" in result
+        assert f"![alt]({GITHUB_RAW_BASE}/b.png)" in result
+
+    def test_tilde_fence_needs_matching_closer(self) -> None:
+        md = "~~~~\n```\n:::message\nx\n:::\n~~~~\n:::message\ny\n:::"
+        result = _strip_zenn_syntax(md)
+        assert "```\n:::message\nx\n:::\n~~~~\n" in result
+        assert result.endswith("> y")
+
+    def test_nested_details_in_message(self) -> None:
+        md = ":::message\n前置き\n:::details 詳細\n中身\n:::\n:::"
+        result = _strip_zenn_syntax(md)
+        assert result == (
+            "> 前置き\n"
+            "> <details><summary>詳細</summary>\n"
+            "> \n"
+            "> 中身\n"
+            "> \n"
+            "> </details>"
+        )
+
+    def test_unclosed_block_left_as_written(self) -> None:
+        md = "前\n:::details タイトル\n![a](/images/a.png)\n"
+        result = _strip_zenn_syntax(md)
+        assert result == f"前\n:::details タイトル\n![a]({GITHUB_RAW_BASE}/a.png)\n"
+
+    def test_blank_lines_after_block_match_previous_output(self) -> None:
+        md = "前\n:::message\n注意\n:::\n\n後\n"
+        assert _strip_zenn_syntax(md) == "前\n> 注意\n後\n"
+
 
 class TestConvertToQiita:
     def test_basic_conversion(self) -> None:
@@ -157,6 +231,20 @@ class TestConvertToHashnode:
         assert "originalArticleURL" not in payload["variables"]["input"]
 
 
+class TestPayloadHash:
+    def test_stable_across_key_order(self) -> None:
+        assert payload_hash({"a": 1, "b": [1, 2]}) == payload_hash({"b": [1, 2], "a": 1})
+
+    def test_changes_with_content(self) -> None:
+        article = _make_article()
+        base = payload_hash(convert_to_devto(article, canonical_url="https://zenn.dev/x"))
+        assert base == payload_hash(convert_to_devto(article, canonical_url="https://zenn.dev/x"))
+        assert base != payload_hash(convert_to_devto(article, canonical_url="https://zenn.dev/y"))
+        assert base != payload_hash(
+            convert_to_devto(_make_article(body="changed"), canonical_url="https://zenn.dev/x")
+        )
+
+
 # ===========================================================================
 # 2. Parser tests
 # ===========================================================================
@@ -169,6 +257,38 @@ class TestParseZennArticle:
         assert article.topics == ("python", "testing", "pytest", "ci", "automation")
         assert "テスト用の記事" in article.body
 
+    def test_body_read_lazily(self, tmp_path: Path) -> None:
+        path = tmp_path / "a.md"
+        path.write_bytes(SAMPLE_ARTICLE.read_bytes())
+        with patch("publish.split_body", return_value="本文") as mock_split:
+            article = parse_zenn_article(path)
+            assert article.title == "テスト用記事タイトル"
+            mock_split.assert_not_called()
+            assert article.body == "本文"
+            assert article.body == "本文"
+        mock_split.assert_called_once()
+
+    def test_lazy_article_equals_eager_one(self, tmp_path: Path) -> None:
+        path = tmp_path / "a.md"
+        path.write_text("---\ntitle: T\ntopics: [\"x\"]\n---\nBody\n")
+        assert parse_zenn_article(path) == Article("T", "Body", ("x",))
+        assert parse_zenn_article(path) != Article("T", "Other", ("x",))
+        with pytest.raises(ValueError):
+            Article("T")
+
+    def test_metadata_comes_from_the_index(self, tmp_path: Path) -> None:
+        path = tmp_path / "a.md"
+        path.write_bytes(SAMPLE_ARTICLE.read_bytes())
+        parse_zenn_article(path)
+        with patch("article_index._read_meta") as mock_read:
+            assert parse_zenn_article(path).title == "テスト用記事タイトル"
+        mock_read.assert_not_called()
+
+    def test_body_matches_python_frontmatter(self) -> None:
+        import frontmatter
+
+        assert parse_zenn_article(SAMPLE_ARTICLE).body == frontmatter.load(SAMPLE_ARTICLE).content
+
 
 # ===========================================================================
 # 3. Publisher tests (respx mocked HTTP)
@@ -207,6 +327,32 @@ class TestUpdateOnQiita:
         result = update_on_qiita("abc123", {"title": "t"}, "token")
         assert result.success is True
 
+    @respx.mock
+    def test_returns_remote_id(self) -> None:
+        respx.patch("https://qiita.com/api/v2/items/abc123").mock(
+            return_value=httpx.Response(
+                200, json={"id": "abc123", "url": "https://qiita.com/items/abc123"}
+            )
+        )
+        result = update_on_qiita("abc123", {"title": "t"}, "token")
+        assert result.remote_id == "abc123"
+
+
+class TestIterQiitaItems:
+    @respx.mock
+    def test_walks_pages_until_empty(self) -> None:
+        route = respx.get("https://qiita.com/api/v2/authenticated_user/items").mock(
+            side_effect=[
+                httpx.Response(200, json=[{"id": "a", "title": "A"}]),
+                httpx.Response(200, json=[{"id": "b", "title": "B"}]),
+                httpx.Response(200, json=[]),
+            ]
+        )
+        items = list(iter_qiita_items("token", max_pages=10, per_page=100))
+        assert [i["id"] for i in items] == ["a", "b"]
+        assert route.call_count == 3
+        assert route.calls[0].request.url.params["per_page"] == "100"
+
 
 class TestFindQiitaItemByTitle:
     @respx.mock
@@ -370,6 +516,121 @@ class TestUpdateOnHashnode:
         assert "502" in result.error
 
 
+class TestAsyncPublishers:
+    """Async variants hit the same endpoints and return the same results."""
+
+    @respx.mock
+    def test_publish_to_qiita_async(self) -> None:
+        respx.post("https://qiita.com/api/v2/items").mock(
+            return_value=httpx.Response(
+                201, json={"url": "https://qiita.com/items/abc123"}
+            )
+        )
+        result = asyncio.run(
+            publish_to_qiita_async({"title": "t", "body": "b", "tags": []}, "token")
+        )
+        assert result == PublishResult("qiita", True, "https://qiita.com/items/abc123", None)
+
+    @respx.mock
+    def test_update_on_qiita_async_failure(self) -> None:
+        respx.patch("https://qiita.com/api/v2/items/abc123").mock(
+            return_value=httpx.Response(403, text="Forbidden")
+        )
+        result = asyncio.run(update_on_qiita_async("abc123", {"title": "t"}, "token"))
+        assert result.success is False
+        assert "403" in result.error
+
+    @respx.mock
+    def test_find_qiita_item_by_title_async(self) -> None:
+        respx.get("https://qiita.com/api/v2/authenticated_user/items").mock(
+            return_value=httpx.Response(200, json=[{"id": "item2", "title": "Target"}])
+        )
+        assert asyncio.run(find_qiita_item_by_title_async("Target", "token")) == "item2"
+
+    @respx.mock
+    def test_publish_to_devto_async(self) -> None:
+        respx.post("https://dev.to/api/articles").mock(
+            return_value=httpx.Response(
+                201, json={"url": "https://dev.to/user/article"}
+            )
+        )
+        result = asyncio.run(publish_to_devto_async({"article": {"title": "t"}}, "key"))
+        assert result == PublishResult("devto", True, "https://dev.to/user/article", None)
+
+    @respx.mock
+    def test_find_devto_article_by_title_async_not_found(self) -> None:
+        respx.get("https://dev.to/api/articles/me/published").mock(
+            return_value=httpx.Response(200, json=[])
+        )
+        assert asyncio.run(find_devto_article_by_title_async("Missing", "key")) is None
+
+    @respx.mock
+    def test_publish_to_hashnode_async_graphql_error(self) -> None:
+        respx.post("https://gql.hashnode.com").mock(
+            return_value=httpx.Response(
+                200, json={"errors": [{"message": "bad input"}]}
+            )
+        )
+        result = asyncio.run(
+            publish_to_hashnode_async({"query": "...", "variables": {}}, "token")
+        )
+        assert result.success is False
+        assert "bad input" in result.error
+
+    @respx.mock
+    def test_update_on_hashnode_async(self) -> None:
+        respx.post("https://gql.hashnode.com").mock(
+            return_value=httpx.Response(
+                200,
+                json={"data": {"updatePost": {"post": {"url": "https://hashnode.dev/s"}}}},
+            )
+        )
+        result = asyncio.run(update_on_hashnode_async("p1", _make_article(), "token"))
+        assert result == PublishResult("hashnode", True, "https://hashnode.dev/s", None)
+
+    @respx.mock
+    def test_find_hashnode_post_by_title_async_paginates(self) -> None:
+        respx.post("https://gql.hashnode.com").mock(
+            side_effect=[
+                httpx.Response(200, json={"data": {"publication": {"posts": {
+                    "edges": [{"node": {"id": "a", "title": "Other"}}],
+                    "pageInfo": {"hasNextPage": True, "endCursor": "c1"},
+                }}}}),
+                httpx.Response(200, json={"data": {"publication": {"posts": {
+                    "edges": [{"node": {"id": "b", "title": "Target"}}],
+                    "pageInfo": {"hasNextPage": False, "endCursor": None},
+                }}}}),
+            ]
+        )
+        post_id = asyncio.run(find_hashnode_post_by_title_async("Target", "pub", "token"))
+        assert post_id == "b"
+
+    @pytest.mark.parametrize(("sync_find", "async_find", "args"), [
+        (find_qiita_item_by_title, find_qiita_item_by_title_async, ("token",)),
+        (find_devto_article_by_title, find_devto_article_by_title_async, ("key",)),
+        (find_hashnode_post_by_title, find_hashnode_post_by_title_async, ("pub", "token")),
+    ])
+    def test_finders_send_the_same_requests(self, sync_find, async_find, args) -> None:
+        def page(request: httpx.Request) -> httpx.Response:
+            if request.method == "GET":
+                return httpx.Response(200, json=[{"id": 1, "title": "Other"}])
+            return httpx.Response(200, json={"data": {"publication": {"posts": {
+                "edges": [{"node": {"id": "a", "title": "Other"}}],
+                "pageInfo": {"hasNextPage": True, "endCursor": "next"},
+            }}}})
+
+        def requests(find) -> list[tuple]:
+            with respx.mock:
+                route = respx.route().mock(side_effect=page)
+                assert find("Target", *args) is None
+                return [(c.request.method, str(c.request.url), c.request.content)
+                        for c in route.calls]
+
+        sent = requests(sync_find)
+        assert sent == requests(lambda *a: asyncio.run(async_find(*a)))
+        assert len(sent) in (3, 5)  # every page searched
+
+
 # ===========================================================================
 # 4. CLI Runner tests
 # ===========================================================================
@@ -499,6 +760,47 @@ class TestRunHashnode:
 # ===========================================================================
 
 
+class TestGetClient:
+    def test_reuses_client_per_platform(self) -> None:
+        assert get_client("qiita") is get_client("qiita")
+        assert get_client("qiita") is not get_client("devto")
+
+    @pytest.mark.parametrize("platform", PLATFORMS)
+    def test_http2_enabled(self, platform: str) -> None:
+        with patch("publish.httpx.HTTPTransport", wraps=httpx.HTTPTransport) as transport:
+            close_clients()
+            get_client(platform)
+        assert transport.call_args.kwargs["http2"] is True
+
+        async def build() -> None:
+            get_async_client(platform)
+            await publish.aclose_clients()
+
+        with patch("publish.httpx.AsyncHTTPTransport", wraps=httpx.AsyncHTTPTransport) as transport:
+            asyncio.run(build())
+        assert transport.call_args.kwargs["http2"] is True
+
+    def test_recreated_after_close(self) -> None:
+        client = get_client("devto")
+        close_clients()
+        assert client.is_closed
+        assert get_client("devto") is not client
+
+    @respx.mock
+    def test_publishers_share_connection_pool(self) -> None:
+        route = respx.get("https://qiita.com/api/v2/authenticated_user/items").mock(
+            return_value=httpx.Response(200, json=[])
+        )
+        respx.post("https://qiita.com/api/v2/items").mock(
+            return_value=httpx.Response(201, json={"url": "https://qiita.com/items/x"})
+        )
+        client = get_client("qiita")
+        find_qiita_item_by_title("Any", "token")
+        publish_to_qiita({"title": "t", "body": "b", "tags": []}, "token")
+        assert route.called
+        assert get_client("qiita") is client
+
+
 class TestLoadEnv:
     def test_loads_env_file(self, tmp_path: Path) -> None:
         env_file = tmp_path / ".env"
@@ -518,6 +820,21 @@ class TestLoadEnv:
     def test_missing_file(self) -> None:
         _load_env(Path("/nonexistent/.env"))
 
+    def test_endpoint_overrides_apply_after_import(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        env_file = tmp_path / ".env"
+        env_file.write_text(
+            "QIITA_API_BASE=http://127.0.0.1:8765/qiita/api/v2\n"
+            "DEVTO_API_BASE=http://127.0.0.1:8765/devto/api\n"
+        )
+        monkeypatch.setattr(publish, "QIITA_API_BASE", publish.QIITA_API_BASE)
+        monkeypatch.setattr(publish, "DEVTO_API_BASE", "http://from-the-environment/api")
+        with patch.dict(os.environ, {"DEVTO_API_BASE": "http://from-the-environment/api"}, clear=True):
+            _load_env(env_file)
+        assert publish.QIITA_API_BASE == "http://127.0.0.1:8765/qiita/api/v2"
+        assert publish.DEVTO_API_BASE == "http://from-the-environment/api"
+
 
 class TestBuildParser:
     def test_platform_choices(self) -> None:
@@ -545,3 +862,122 @@ class TestMain:
             ret = main()
         assert ret == 1
         assert "not found" in capsys.readouterr().err
+
+
+class TestPlatformArgs:
+    def test_comma_list_and_all(self) -> None:
+        parser = build_parser()
+        args = parser.parse_args(["a.md", "--platform", "devto, hashnode"])
+        assert _expand_platforms(args.platform) == ["devto", "hashnode"]
+        args = parser.parse_args(["a.md", "--platform", "all"])
+        assert _expand_platforms(args.platform) == ["qiita", "devto", "hashnode"]
+
+    def test_unknown_platform_rejected(self) -> None:
+        with pytest.raises(SystemExit):
+            build_parser().parse_args(["a.md", "--platform", "qiita,medium"])
+
+    def test_glob_expansion(self, tmp_path: Path) -> None:
+        for name in ("b.md", "a.md", "c.txt"):
+            (tmp_path / name).write_text("x")
+        paths = _expand_article_paths([tmp_path / "*.md", tmp_path / "a.md"])
+        assert paths == [tmp_path / "a.md", tmp_path / "b.md"]
+
+
+class TestBatchMode:
+    def _articles(self, tmp_path: Path) -> list[str]:
+        en_dir = tmp_path / "articles-en"
+        en_dir.mkdir()
+        paths = []
+        for slug in ("first", "second"):
+            path = en_dir / f"{slug}.md"
+            path.write_text(f"---\ntitle: {slug}\ntopics: [python]\n---\nBody\n")
+            paths.append(str(path))
+        return paths
+
+    @respx.mock
+    @patch.dict(
+        os.environ,
+        {"DEVTO_API_KEY": "key", "HASHNODE_API_TOKEN": "tok", "HASHNODE_PUBLICATION_ID": "pub"},
+        clear=True,
+    )
+    def test_publishes_every_article_to_every_platform(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        devto = respx.post("https://dev.to/api/articles").mock(
+            return_value=httpx.Response(201, json={"id": 1, "url": "https://dev.to/u/a"})
+        )
+        hashnode = respx.post("https://gql.hashnode.com").mock(
+            return_value=httpx.Response(
+                200,
+                json={"data": {"publishPost": {"post": {"url": "https://hashnode.dev/a"}}}},
+            )
+        )
+        argv = [
+            "publish.py", *self._articles(tmp_path), "--platform", "devto,hashnode",
+            "--canonical-url", "https://zenn.dev/u/articles/{slug}",
+        ]
+        with patch("sys.argv", argv):
+            ret = main()
+
+        assert ret == 0
+        assert devto.call_count == 2
+        assert hashnode.call_count == 2
+        canonicals = sorted(
+            json.loads(call.request.content)["article"]["canonical_url"]
+            for call in devto.calls
+        )
+        assert canonicals == [
+            "https://zenn.dev/u/articles/first",
+            "https://zenn.dev/u/articles/second",
+        ]
+        out = capsys.readouterr().out
+        assert out.count("OK") == 4
+        assert "4 succeeded, 0 failed." in out
+
+    @respx.mock
+    @patch.dict(os.environ, {"DEVTO_API_KEY": "key"}, clear=True)
+    def test_failures_reported_and_exit_nonzero(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        respx.post("https://dev.to/api/articles").mock(
+            side_effect=[
+                httpx.Response(201, json={"url": "https://dev.to/u/a"}),
+                httpx.Response(422, text="Invalid"),
+            ]
+        )
+        argv = ["publish.py", *self._articles(tmp_path), "--platform", "devto", "--concurrency", "1"]
+        with patch("sys.argv", argv):
+            ret = main()
+
+        assert ret == 1
+        out = capsys.readouterr().out
+        assert "FAIL" in out
+        assert "1 succeeded, 1 failed." in out
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_dry_run_converts_and_shows_payloads(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        paths = self._articles(tmp_path)
+        broken = tmp_path / "articles-en" / "broken.md"
+        broken.write_bytes(b"---\ntitle: broken\n---\n\xff\n")
+        argv = ["publish.py", *paths, str(broken), "--platform", "devto", "--dry-run"]
+        with patch("sys.argv", argv):
+            ret = main()
+
+        assert ret == 1
+        out = capsys.readouterr().out
+        assert out.count("--- devto payload (dry-run) ---") == 2
+        assert "Title: first" in out and "Title: second" in out
+        assert "conversion failed: UnicodeDecodeError" in out
+
+    def test_rejects_shared_canonical_url(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        argv = [
+            "publish.py", *self._articles(tmp_path), "--platform", "devto",
+            "--canonical-url", "https://zenn.dev/u/articles/one",
+        ]
+        with patch("sys.argv", argv):
+            assert main() == 1
+        assert "{slug}" in capsys.readouterr().err
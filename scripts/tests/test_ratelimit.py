@@ -0,0 +1,117 @@
+"""Tests for ratelimit.py — token buckets and 429 handling."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import respx
+
+from publish import publish_to_devto, publish_to_qiita_async
+from ratelimit import MAX_429_RETRIES, RateLimit, RateLimiter, TokenBucket
+
+
+class _Clock:
+    def __init__(self, now: float = 1_700_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _request(token: str = "a") -> httpx.Request:
+    return httpx.Request("GET", "https://qiita.com/api/v2/items", headers={"Authorization": token})
+
+
+class TestTokenBucket:
+    def test_burst_then_paced(self) -> None:
+        clock = _Clock()
+        bucket = TokenBucket(rate=2.0, burst=2, clock=clock)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0.5
+        assert bucket.reserve() == 1.0
+
+    def test_refills_over_time(self) -> None:
+        clock = _Clock()
+        bucket = TokenBucket(rate=1.0, burst=1, clock=clock)
+        bucket.reserve()
+        clock.now += 1.0
+        assert bucket.reserve() == 0
+
+    def test_observe_spreads_remaining_quota(self) -> None:
+        clock = _Clock()
+        bucket = TokenBucket(rate=100.0, burst=1, clock=clock)
+        bucket.observe(remaining=10, reset_at=clock.now + 100)
+        assert bucket.rate == 0.1
+
+    def test_exhausted_quota_blocks_until_reset(self) -> None:
+        clock = _Clock()
+        bucket = TokenBucket(rate=100.0, burst=10, clock=clock)
+        bucket.observe(remaining=0, reset_at=clock.now + 30)
+        assert bucket.reserve() == 30
+
+
+class TestRateLimiter:
+    def test_bucket_per_platform_and_token(self) -> None:
+        limiter = RateLimiter({"qiita": RateLimit(1.0, 1)})
+        a = limiter.bucket("qiita", _request("a"))
+        assert limiter.bucket("qiita", _request("a")) is a
+        assert limiter.bucket("qiita", _request("b")) is not a
+        assert limiter.bucket("devto", _request("a")) is not a
+
+    def test_learns_from_qiita_headers(self) -> None:
+        clock = _Clock()
+        limiter = RateLimiter({"qiita": RateLimit(100.0, 1)}, clock=clock)
+        bucket = limiter.bucket("qiita", _request())
+        response = httpx.Response(
+            200, headers={"Rate-Remaining": "60", "Rate-Reset": str(int(clock.now) + 600)},
+        )
+        assert limiter.observe(bucket, response) is None
+        assert bucket.rate == 0.1
+
+    def test_retry_after_http_date(self) -> None:
+        clock = _Clock(1_700_000_000.0)
+        limiter = RateLimiter(clock=clock)
+        bucket = limiter.bucket("devto", _request())
+        response = httpx.Response(
+            429, headers={"Retry-After": "Tue, 14 Nov 2023 22:13:40 GMT"},
+        )
+        assert limiter.observe(bucket, response) == 20.0
+        assert bucket.reserve() == 20.0
+
+
+class TestTransportRetries429:
+    @respx.mock
+    def test_sync_retries_after_429(self) -> None:
+        route = respx.post("https://dev.to/api/articles").mock(
+            side_effect=[
+                httpx.Response(429, headers={"Retry-After": "0"}),
+                httpx.Response(201, json={"url": "https://dev.to/u/a"}),
+            ]
+        )
+        result = publish_to_devto({"article": {"title": "t"}}, "key")
+        assert result.success is True
+        assert route.call_count == 2
+
+    @respx.mock
+    def test_gives_up_after_max_retries(self) -> None:
+        route = respx.post("https://dev.to/api/articles").mock(
+            return_value=httpx.Response(429, headers={"Retry-After": "0"}, text="slow down")
+        )
+        result = publish_to_devto({"article": {"title": "t"}}, "key")
+        assert result.success is False
+        assert result.error.startswith("429")
+        assert route.call_count == MAX_429_RETRIES + 1
+
+    @respx.mock
+    def test_async_retries_after_429(self) -> None:
+        route = respx.post("https://qiita.com/api/v2/items").mock(
+            side_effect=[
+                httpx.Response(429, headers={"Retry-After": "0"}),
+                httpx.Response(201, json={"url": "https://qiita.com/items/x"}),
+            ]
+        )
+        result = asyncio.run(publish_to_qiita_async({"title": "t"}, "token"))
+        assert result.success is True
+        assert route.call_count == 2
@@ -0,0 +1,183 @@
+"""Tests for retry.py — backoff policy, idempotent retries and the create guard."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+import respx
+
+import retry
+from publish import (
+    publish_to_devto_async,
+    publish_to_hashnode,
+    publish_to_qiita,
+    update_on_qiita,
+)
+from retry import RetryPolicy, is_transient_error
+
+QIITA_ITEMS = "https://qiita.com/api/v2/items"
+QIITA_LIST = "https://qiita.com/api/v2/authenticated_user/items"
+
+
+class TestRetryPolicy:
+    def test_backoff_is_capped_full_jitter(self) -> None:
+        policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+        for retry_no in range(1, 8):
+            delay = policy.backoff(retry_no)
+            assert 0 <= delay <= min(4.0, 2 ** (retry_no - 1))
+
+    def test_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("PUBLISH_RETRIES", "4")
+        monkeypatch.setenv("PUBLISH_TIMEOUT", "5")
+        policy = RetryPolicy.from_env()
+        assert policy.attempts == 5
+        assert policy.timeout == 5.0
+
+    def test_invalid_env_falls_back_with_warning(
+        self, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        monkeypatch.setenv("PUBLISH_RETRIES", "three")
+        monkeypatch.setenv("PUBLISH_TIMEOUT", "0")
+        assert RetryPolicy.from_env() == RetryPolicy()
+        assert "PUBLISH_RETRIES='three'" in caplog.text
+        assert "PUBLISH_TIMEOUT=0" in caplog.text
+
+    def test_configure_reads_env_when_called(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("PUBLISH_RETRIES", "1")
+        policy = retry.configure()
+        assert policy.attempts == 2
+        assert policy.base_delay == 0.0  # the rest of the current policy is kept
+        assert retry.configure(timeout=2.5).attempts == 2
+
+    def test_configure(self) -> None:
+        policy = retry.configure(retries=0, timeout=2.5)
+        assert policy.attempts == 1
+        assert policy.timeout == 2.5
+        assert retry.policy is policy
+
+
+class TestIsTransientError:
+    @pytest.mark.parametrize(
+        "error",
+        ["503: Service Unavailable", "502: ", "ReadTimeout: timed out", "ConnectError: refused"],
+    )
+    def test_transient(self, error: str) -> None:
+        assert is_transient_error(error)
+
+    @pytest.mark.parametrize("error", [None, "", "422: invalid", "404: Not Found", '[{"message": "x"}]'])
+    def test_permanent(self, error: str | None) -> None:
+        assert not is_transient_error(error)
+
+
+class TestIdempotentRetries:
+    @respx.mock
+    def test_update_retried_on_5xx(self) -> None:
+        route = respx.patch(f"{QIITA_ITEMS}/abc").mock(
+            side_effect=[
+                httpx.Response(502),
+                httpx.Response(200, json={"id": "abc", "url": "https://qiita.com/items/abc"}),
+            ]
+        )
+        result = update_on_qiita("abc", {"title": "t"}, "token")
+        assert result.success
+        assert route.call_count == 2
+
+    @respx.mock
+    def test_update_gives_up_after_policy_attempts(self) -> None:
+        route = respx.patch(f"{QIITA_ITEMS}/abc").mock(return_value=httpx.Response(503))
+        result = update_on_qiita("abc", {"title": "t"}, "token")
+        assert not result.success
+        assert result.error.startswith("503")
+        assert route.call_count == retry.policy.attempts
+
+    @respx.mock
+    def test_client_errors_not_retried(self) -> None:
+        route = respx.patch(f"{QIITA_ITEMS}/abc").mock(return_value=httpx.Response(404))
+        update_on_qiita("abc", {"title": "t"}, "token")
+        assert route.call_count == 1
+
+
+class TestCreateGuard:
+    @respx.mock
+    def test_landed_create_is_not_resent(self) -> None:
+        create = respx.post(QIITA_ITEMS).mock(side_effect=httpx.ReadTimeout("timed out"))
+        respx.get(QIITA_LIST).mock(
+            return_value=httpx.Response(
+                200, json=[{"id": "q1", "title": "T", "url": "https://qiita.com/items/q1"}],
+            )
+        )
+        result = publish_to_qiita({"title": "T"}, "token")
+        assert result.success
+        assert result.remote_id == "q1"
+        assert result.url == "https://qiita.com/items/q1"
+        assert create.call_count == 1
+
+    @respx.mock
+    def test_resent_when_not_landed(self) -> None:
+        create = respx.post(QIITA_ITEMS).mock(
+            side_effect=[
+                httpx.Response(503),
+                httpx.Response(201, json={"id": "q2", "url": "https://qiita.com/items/q2"}),
+            ]
+        )
+        respx.get(QIITA_LIST).mock(return_value=httpx.Response(200, json=[]))
+        result = publish_to_qiita({"title": "T"}, "token")
+        assert result.success
+        assert result.remote_id == "q2"
+        assert create.call_count == 2
+
+    @respx.mock
+    def test_not_resent_when_listing_fails(self) -> None:
+        create = respx.post(QIITA_ITEMS).mock(return_value=httpx.Response(503))
+        respx.get(QIITA_LIST).mock(return_value=httpx.Response(401))
+        result = publish_to_qiita({"title": "T"}, "token")
+        assert not result.success
+        assert result.error.startswith("503")
+        assert create.call_count == 1
+
+    @respx.mock
+    def test_permanent_failure_not_retried(self) -> None:
+        create = respx.post(QIITA_ITEMS).mock(return_value=httpx.Response(422, text="bad"))
+        listing = respx.get(QIITA_LIST)
+        result = publish_to_qiita({"title": "T"}, "token")
+        assert result.error.startswith("422")
+        assert create.call_count == 1
+        assert not listing.called
+
+    @respx.mock
+    def test_hashnode_checks_publication_posts(self) -> None:
+        payload = {
+            "query": "mutation PublishPost",
+            "variables": {"input": {"title": "T", "publicationId": "pub"}},
+        }
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if b"PublishPost" in request.content:
+                raise httpx.ConnectError("reset")
+            edges = [{"node": {"id": "h1", "title": "T", "url": "https://h/t"}}]
+            return httpx.Response(
+                200, json={"data": {"publication": {"posts": {"edges": edges}}}},
+            )
+
+        route = respx.post("https://gql.hashnode.com").mock(side_effect=handler)
+        result = publish_to_hashnode(payload, "token")
+        assert result.success
+        assert result.remote_id == "h1"
+        assert route.call_count == 2
+
+    @respx.mock
+    def test_async_guard(self) -> None:
+        create = respx.post("https://dev.to/api/articles").mock(
+            side_effect=httpx.ReadTimeout("timed out")
+        )
+        respx.get("https://dev.to/api/articles/me/all").mock(
+            return_value=httpx.Response(
+                200, json=[{"id": 7, "title": "T", "url": "https://dev.to/u/t"}],
+            )
+        )
+        result = asyncio.run(publish_to_devto_async({"article": {"title": "T"}}, "key"))
+        assert result.success
+        assert result.remote_id == 7
+        assert create.call_count == 1
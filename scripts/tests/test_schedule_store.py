@@ -0,0 +1,88 @@
+"""Tests for schedule_store.py — journaled schedule.json updates."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+import schedule_store
+from schedule_store import ScheduleStore
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> ScheduleStore:
+    path = tmp_path / "schedule.json"
+    path.write_text(json.dumps({
+        "post_time_utc": "23:00",
+        "articles": [
+            {"file": "articles/a.md", "date": "2026-03-01", "devto": "pending"},
+            {"file": "articles/b.md", "date": "2026-03-03", "devto": "pending"},
+        ],
+    }))
+    return ScheduleStore(path)
+
+
+class TestScheduleStore:
+    def test_put_entry_journals_without_rewriting_snapshot(self, store: ScheduleStore) -> None:
+        before = store.path.read_text()
+        store.put_entry({"file": "articles/a.md", "date": "2026-03-01", "devto": "https://dev.to/a"})
+
+        assert store.path.read_text() == before
+        assert store.journal_path.exists()
+        articles = store.load()["articles"]
+        assert articles[0]["devto"] == "https://dev.to/a"
+        assert articles[1]["devto"] == "pending"
+
+    def test_unknown_file_is_appended(self, store: ScheduleStore) -> None:
+        store.put_entry({"file": "articles/c.md", "date": "2026-03-05"})
+        files = [e["file"] for e in store.load()["articles"]]
+        assert files == ["articles/a.md", "articles/b.md", "articles/c.md"]
+
+    def test_later_records_win(self, store: ScheduleStore) -> None:
+        store.put_entry({"file": "articles/a.md", "devto": "first"})
+        store.put_entry({"file": "articles/a.md", "devto": "second"})
+        assert store.load()["articles"][0]["devto"] == "second"
+
+    def test_torn_last_line_is_ignored(self, store: ScheduleStore) -> None:
+        store.put_entry({"file": "articles/a.md", "devto": "https://dev.to/a"})
+        with open(store.journal_path, "a") as f:
+            f.write('{"file": "articles/b.md", "dev')
+        articles = store.load()["articles"]
+        assert articles[0]["devto"] == "https://dev.to/a"
+        assert articles[1]["devto"] == "pending"
+
+    def test_compact_folds_journal_into_snapshot(self, store: ScheduleStore) -> None:
+        store.put_entry({"file": "articles/b.md", "devto": "https://dev.to/b"})
+        store.compact()
+
+        assert not store.journal_path.exists()
+        saved = json.loads(store.path.read_text())
+        assert saved["post_time_utc"] == "23:00"
+        assert saved["articles"][1] == {"file": "articles/b.md", "devto": "https://dev.to/b"}
+        assert store.path.read_text().endswith("}\n")
+
+    def test_save_replaces_snapshot_and_drops_journal(self, store: ScheduleStore) -> None:
+        store.put_entry({"file": "articles/a.md", "devto": "stale"})
+        store.save({"articles": []})
+        assert store.load() == {"articles": []}
+        assert not store.journal_path.exists()
+        assert list(store.path.parent.glob("*.tmp")) == []
+
+    def test_save_keeps_file_mode(self, store: ScheduleStore) -> None:
+        store.path.chmod(0o664)
+        store.save({"articles": []})
+        assert store.path.stat().st_mode & 0o777 == 0o664
+
+    def test_large_journal_compacts_automatically(
+        self, store: ScheduleStore, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(schedule_store, "COMPACT_BYTES", 10)
+        store.put_entry({"file": "articles/a.md", "devto": "https://dev.to/a"})
+        assert not store.journal_path.exists()
+        assert json.loads(store.path.read_text())["articles"][0]["devto"] == "https://dev.to/a"
+
+    def test_missing_schedule_raises(self, tmp_path: Path) -> None:
+        with pytest.raises(FileNotFoundError):
+            ScheduleStore(tmp_path / "missing.json").load()
@@ -2,20 +2,44 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
+import logging
+import shutil
+import subprocess
+from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 from unittest.mock import MagicMock, patch
 
 import frontmatter
+import httpx
 import pytest
+import respx
+
+import drift
+import metrics
+import publish
+from git_ops import GitError
+from publish import PublishResult
 
 from scheduled_publish import (
     _is_entry_done,
     _needs_posting,
     _process_entry,
     _process_zenn_entries,
-    _publish_zenn_article,
+    _set_zenn_published,
+    _try_publish,
+    _upsert,
+    _broken_link_gate,
     _Credentials,
+    _crosspost_entries,
+    build_dependency_graph,
+    due_at,
+    publish_due,
+    reconcile_remote_posts,
+    verify_remote_posts,
+    write_metrics,
 )
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
@@ -119,7 +143,7 @@ class TestProcessEntryPending:
     """_process_entry must attempt publishing when platform values are 'pending'."""
 
     @patch("scheduled_publish._validate_article_path")
-    @patch("scheduled_publish.parse_zenn_article")
+    @patch("publish.parse_zenn_article")
     @patch("scheduled_publish._try_publish")
     def test_pending_triggers_qiita_publish(
         self,
@@ -132,7 +156,7 @@ class TestProcessEntryPending:
         mock_try_publish.return_value = ("https://qiita.com/items/new", False)
 
         entry = _make_entry(qiita="pending", devto="n/a", hashnode="n/a")
-        updated, errors = _process_entry(entry, _make_creds(), dry_run=False)
+        updated, errors = asyncio.run(_process_entry(entry, _make_creds(), dry_run=False))
 
         # _try_publish should have been called for Qiita
         mock_try_publish.assert_called_once()
@@ -143,7 +167,7 @@ class TestProcessEntryPending:
         assert errors == 0
 
     @patch("scheduled_publish._validate_article_path")
-    @patch("scheduled_publish.parse_zenn_article")
+    @patch("publish.parse_zenn_article")
     @patch("scheduled_publish._try_publish")
     def test_pending_triggers_all_platforms(
         self,
@@ -160,7 +184,7 @@ class TestProcessEntryPending:
         ]
 
         entry = _make_entry(qiita="pending", devto="pending", hashnode="pending")
-        updated, errors = _process_entry(entry, _make_creds(), dry_run=False)
+        updated, errors = asyncio.run(_process_entry(entry, _make_creds(), dry_run=False))
 
         assert mock_try_publish.call_count == 3
         assert updated["qiita"] == "https://qiita.com/items/new"
@@ -169,7 +193,7 @@ class TestProcessEntryPending:
         assert errors == 0
 
     @patch("scheduled_publish._validate_article_path")
-    @patch("scheduled_publish.parse_zenn_article")
+    @patch("publish.parse_zenn_article")
     @patch("scheduled_publish._try_publish")
     def test_url_value_skips_publish(
         self,
@@ -186,13 +210,13 @@ class TestProcessEntryPending:
             devto="https://dev.to/existing",
             hashnode="https://hashnode.dev/existing",
         )
-        updated, errors = _process_entry(entry, _make_creds(), dry_run=False)
+        updated, errors = asyncio.run(_process_entry(entry, _make_creds(), dry_run=False))
 
         mock_try_publish.assert_not_called()
         assert errors == 0
 
     @patch("scheduled_publish._validate_article_path")
-    @patch("scheduled_publish.parse_zenn_article")
+    @patch("publish.parse_zenn_article")
     @patch("scheduled_publish._try_publish")
     def test_na_value_skips_publish(
         self,
@@ -207,13 +231,13 @@ class TestProcessEntryPending:
         # Entry without qiita key, devto/hashnode = "n/a"
         entry = _make_entry(devto="n/a", hashnode="n/a")
         del entry["qiita"]
-        updated, errors = _process_entry(entry, _make_creds(), dry_run=False)
+        updated, errors = asyncio.run(_process_entry(entry, _make_creds(), dry_run=False))
 
         mock_try_publish.assert_not_called()
         assert errors == 0
 
     @patch("scheduled_publish._validate_article_path")
-    @patch("scheduled_publish.parse_zenn_article")
+    @patch("publish.parse_zenn_article")
     @patch("scheduled_publish._try_publish")
     def test_empty_string_triggers_publish(
         self,
@@ -228,76 +252,540 @@ class TestProcessEntryPending:
 
         entry = _make_entry(devto="", hashnode="n/a")
         del entry["qiita"]
-        updated, errors = _process_entry(entry, _make_creds(), dry_run=False)
+        updated, errors = asyncio.run(_process_entry(entry, _make_creds(), dry_run=False))
 
         mock_try_publish.assert_called_once()
         assert updated["devto"] == "https://dev.to/new"
 
 
+class TestProcessEntryConcurrency:
+    """Pending platforms for one entry are posted concurrently."""
+
+    @patch("scheduled_publish._validate_article_path")
+    @patch("publish.parse_zenn_article")
+    def test_platforms_run_in_parallel(
+        self, mock_parse: MagicMock, mock_validate: MagicMock,
+    ) -> None:
+        mock_validate.return_value = SAMPLE_ARTICLE
+        mock_parse.return_value = MagicMock(title="テスト記事", topics=(), body="")
+        in_flight = 0
+        peak = 0
+
+        async def _slow_publish(platform: str) -> PublishResult:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return PublishResult(platform, True, f"https://{platform}/new", None)
+
+        async def _not_found(*_: Any) -> None:
+            return None
+
+        with (
+            patch("publish.find_qiita_item_by_title_async", _not_found),
+            patch("publish.find_devto_article_by_title_async", _not_found),
+            patch("publish.find_hashnode_post_by_title_async", _not_found),
+            patch(
+                "publish.publish_to_qiita_async",
+                lambda *_: _slow_publish("qiita"),
+            ),
+            patch(
+                "publish.publish_to_devto_async",
+                lambda *_: _slow_publish("devto"),
+            ),
+            patch(
+                "publish.publish_to_hashnode_async",
+                lambda *_: _slow_publish("hashnode"),
+            ),
+        ):
+            entry = _make_entry()
+            updated, errors = asyncio.run(
+                _process_entry(entry, _make_creds(), dry_run=False)
+            )
+
+        assert peak == 3
+        assert errors == 0
+        assert updated["qiita"] == "https://qiita/new"
+        assert updated["devto"] == "https://devto/new"
+        assert updated["hashnode"] == "https://hashnode/new"
+
+
+# ---------------------------------------------------------------------------
+# Remote ID index
+# ---------------------------------------------------------------------------
+
+
+def _result(url: str, remote_id: Any = None, success: bool = True) -> PublishResult:
+    error = None if success else "404: Not Found"
+    return PublishResult(
+        "qiita", success, url if success else None, error, remote_id, not_found=not success,
+    )
+
+
+class TestUpsert:
+    """_upsert prefers the recorded ID and only scans titles as a fallback."""
+
+    def _run(
+        self, record: dict[str, Any], find_result: Any, update_results: list,
+    ) -> tuple:
+        find = MagicMock()
+        update = MagicMock()
+        create = MagicMock()
+
+        async def _find() -> Any:
+            find()
+            return find_result
+
+        async def _update(remote_id: Any) -> PublishResult:
+            update(remote_id)
+            return update_results.pop(0)
+
+        async def _create() -> PublishResult:
+            create()
+            return _result("https://qiita.com/items/created", "created")
+
+        result = asyncio.run(
+            _upsert("qiita", "Qiita", record, "new-hash", _find, _update, _create)
+        )
+        return result, find, update, create
+
+    def test_recorded_id_skips_title_scan(self) -> None:
+        result, find, update, create = self._run(
+            {"id": "known", "hash": "old-hash"}, None,
+            [_result("https://qiita.com/items/known", "known")],
+        )
+        assert result.success is True
+        assert result.unchanged is False
+        find.assert_not_called()
+        update.assert_called_once_with("known")
+        create.assert_not_called()
+
+    def test_unchanged_hash_sends_nothing(self) -> None:
+        record = {"id": "known", "url": "https://qiita.com/items/known", "hash": "new-hash"}
+        result, find, update, create = self._run(record, None, [])
+        assert result.success is True
+        assert result.unchanged is True
+        assert result.url == "https://qiita.com/items/known"
+        find.assert_not_called()
+        update.assert_not_called()
+        create.assert_not_called()
+
+    def test_missing_recorded_post_falls_back_to_title_scan(self) -> None:
+        result, find, update, create = self._run(
+            {"id": "stale"}, "found",
+            [
+                _result("", success=False),
+                _result("https://qiita.com/items/found", "found"),
+            ],
+        )
+        assert result.remote_id == "found"
+        find.assert_called_once()
+        assert [c.args[0] for c in update.call_args_list] == ["stale", "found"]
+        create.assert_not_called()
+
+    @respx.mock
+    def test_deleted_hashnode_post_is_recreated(self) -> None:
+        # Hashnode reports a missing post as 200 with a GraphQL error.
+        respx.post("https://gql.hashnode.com").respond(200, json={"errors": [
+            {"message": "Post not found", "extensions": {"code": "NOT_FOUND"}},
+        ]})
+        article = publish.Article("T", "body", ())
+        created = _result("https://hashnode.dev/new", "new")
+
+        async def _find() -> None:
+            return None
+
+        async def _create() -> PublishResult:
+            return created
+
+        async def scenario() -> PublishResult:
+            try:
+                return await _upsert(
+                    "hashnode", "Hashnode", {"id": "gone", "hash": "old"}, "new-hash", _find,
+                    lambda post_id: publish.update_on_hashnode_async(post_id, article, "token"),
+                    _create,
+                )
+            finally:
+                await publish.aclose_clients()
+
+        assert asyncio.run(scenario()) is created
+
+    def test_no_id_and_no_match_creates(self) -> None:
+        result, find, update, create = self._run({}, None, [])
+        assert result.remote_id == "created"
+        find.assert_called_once()
+        update.assert_not_called()
+        create.assert_called_once()
+
+
+class TestDependencyGraph:
+    def test_parents_ordered_before_dependents(self) -> None:
+        entries = [
+            {"file": "articles-en/a.md", "depends_on": "articles/a.md"},
+            {"file": "articles/b.md"},
+            {"file": "articles/a.md"},
+        ]
+        graph = build_dependency_graph(entries)
+        assert graph.order == [1, 2, 0]
+        assert graph.parents == {0: 2}
+        assert graph.missing == {}
+        assert graph.cycles == []
+
+    def test_missing_parent_is_reported_and_not_blocking(self) -> None:
+        entries = [{"file": "articles-en/a.md", "depends_on": "articles/gone.md"}]
+        graph = build_dependency_graph(entries)
+        assert graph.order == [0]
+        assert graph.missing == {"articles-en/a.md": "articles/gone.md"}
+
+    def test_cycle_detected(self) -> None:
+        entries = [
+            {"file": "a.md", "depends_on": "b.md"},
+            {"file": "b.md", "depends_on": "a.md"},
+            {"file": "c.md"},
+        ]
+        graph = build_dependency_graph(entries)
+        assert graph.order == [2]
+        assert graph.cycles == ["a.md", "b.md"]
+
+
+class TestDueAt:
+    def test_post_time_is_utc(self) -> None:
+        assert due_at("2026-03-03", "23:00") == datetime(2026, 3, 3, 23, 0, tzinfo=UTC)
+
+    def test_without_post_time_local_midnight(self) -> None:
+        assert due_at("2026-03-03", None) == datetime(2026, 3, 3).astimezone()
+
+    def test_daemon_runs_are_minute_level(self) -> None:
+        process = MagicMock()
+        schedule = {"post_time_utc": "12:00", "articles": [_make_entry(date="2026-03-03")]}
+        with patch("scheduled_publish._process_entry", side_effect=process):
+            errors = asyncio.run(_crosspost_entries(
+                schedule, _make_creds(), dry_run=True,
+                now=datetime(2026, 3, 3, 11, 59, tzinfo=UTC),
+            ))
+        assert errors == 0
+        process.assert_not_called()
+
+
+class TestCrosspostDependencies:
+    """Dependents run in the same run once their parent completes."""
+
+    def _run(
+        self, entries: list[dict[str, Any]], process: Any, blocked: frozenset[str] = frozenset(),
+        concurrency: int = 4,
+    ) -> tuple[int, list]:
+        saved: list = []
+        with (
+            patch("scheduled_publish._process_entry", side_effect=process),
+            patch("scheduled_publish.save_entry"),
+            patch("scheduled_publish.save_schedule", side_effect=saved.append),
+        ):
+            errors = asyncio.run(_crosspost_entries(
+                {"articles": entries}, _make_creds(), dry_run=False, blocked=blocked,
+                concurrency=concurrency,
+            ))
+        return errors, saved
+
+    def test_dependent_runs_after_parent_in_same_run(self) -> None:
+        calls: list[str] = []
+
+        async def process(entry: dict, creds: Any, **kwargs: Any) -> tuple[dict, int]:
+            calls.append(entry["file"])
+            return {**entry, "qiita": "url", "devto": "url", "hashnode": "url"}, 0
+
+        entries = [
+            _make_entry(file="articles-en/test.md", depends_on="articles/test.md", qiita="n/a"),
+            _make_entry(file="articles/test.md"),
+        ]
+        errors, saved = self._run(entries, process)
+        assert errors == 0
+        assert calls == ["articles/test.md", "articles-en/test.md"]
+        # Saved in schedule order
+        assert [e["file"] for e in saved[0]["articles"]] == [
+            "articles-en/test.md", "articles/test.md",
+        ]
+
+    def test_independent_entries_run_concurrently(self) -> None:
+        running = 0
+        peak = 0
+
+        async def process(entry: dict, creds: Any, **kwargs: Any) -> tuple[dict, int]:
+            nonlocal running, peak
+            assert kwargs["hashnode"] is not None  # shared batcher
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {**entry, "qiita": "url", "devto": "url", "hashnode": "url"}, 0
+
+        entries = [_make_entry(file=f"articles/{name}.md") for name in "abc"]
+        errors, _ = self._run(entries, process)
+        assert errors == 0
+        assert peak == 3
+
+        peak = 0
+        entries = [_make_entry(file=f"articles/{name}.md") for name in "abcdefg"]
+        errors, _ = self._run(entries, process, concurrency=2)
+        assert errors == 0
+        assert peak == 2
+
+    def test_dependent_waits_when_parent_fails(self) -> None:
+        calls: list[str] = []
+
+        async def process(entry: dict, creds: Any, **kwargs: Any) -> tuple[dict, int]:
+            calls.append(entry["file"])
+            return entry, 1
+
+        entries = [
+            _make_entry(file="articles/test.md"),
+            _make_entry(file="articles-en/test.md", depends_on="articles/test.md"),
+        ]
+        errors, _ = self._run(entries, process)
+        assert calls == ["articles/test.md"]
+        assert errors == 1
+
+    def test_cycle_counts_as_error(self) -> None:
+        process = MagicMock()
+        entries = [
+            _make_entry(file="a.md", depends_on="b.md"),
+            _make_entry(file="b.md", depends_on="a.md"),
+        ]
+        errors, _ = self._run(entries, process)
+        assert errors == 1
+        process.assert_not_called()
+
+
+    def test_blocked_entry_and_its_dependents_wait(self) -> None:
+        process = MagicMock()
+        entries = [
+            _make_entry(file="articles/test.md"),
+            _make_entry(file="articles-en/test.md", depends_on="articles/test.md"),
+        ]
+        errors, _ = self._run(entries, process, blocked=frozenset({"articles/test.md"}))
+        assert errors == 1
+        process.assert_not_called()
+
+
+class TestBrokenLinkGate:
+    @respx.mock
+    def test_due_article_with_broken_link_is_blocked(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr("scheduled_publish.REPO_ROOT", tmp_path)
+        monkeypatch.setattr("linkcheck.DEFAULT_CACHE_PATH", tmp_path / "links.json")
+        (tmp_path / "articles").mkdir()
+        for name, url in (("ok", "https://good.test/"), ("bad", "https://bad.test/")):
+            (tmp_path / "articles" / f"{name}.md").write_text(f"---\ntitle: T\n---\n{url}\n")
+        respx.head("https://good.test/").respond(200)
+        respx.head("https://bad.test/").respond(404)
+        respx.get("https://bad.test/").respond(404)
+        schedule = {"articles": [
+            _make_entry(file="articles/ok.md"),
+            _make_entry(file="articles/bad.md"),
+            _make_entry(file="articles/future.md", date="2999-01-01"),
+        ]}
+        assert asyncio.run(_broken_link_gate(schedule)) == {"articles/bad.md"}
+
+
+class TestTryPublish:
+    def test_transport_error_is_a_failure_not_a_crash(self) -> None:
+        async def _timeout() -> PublishResult:
+            raise httpx.ReadTimeout("timed out")
+
+        url, had_error = asyncio.run(
+            _try_publish("Qiita", _timeout, dry_run=False, title="T")
+        )
+        assert url is None
+        assert had_error is True
+
+
+class TestProcessEntryRemoteIds:
+    @patch("scheduled_publish._validate_article_path")
+    @patch("publish.parse_zenn_article")
+    def test_records_remote_id_and_updates_by_id(
+        self, mock_parse: MagicMock, mock_validate: MagicMock,
+    ) -> None:
+        mock_validate.return_value = SAMPLE_ARTICLE
+        mock_parse.return_value = MagicMock(title="テスト記事", topics=(), body="")
+
+        async def _update(article_id: Any, *_: Any) -> PublishResult:
+            return PublishResult("devto", True, "https://dev.to/a", None, article_id)
+
+        async def _publish(*_: Any) -> PublishResult:
+            return PublishResult("qiita", True, "https://qiita.com/items/q1", None, "q1")
+
+        find = MagicMock()
+        with (
+            patch("publish.find_devto_article_by_title_async", find),
+            patch("publish.update_on_devto_async", _update),
+            patch("publish.find_qiita_item_by_title_async", return_value=None),
+            patch("publish.publish_to_qiita_async", _publish),
+        ):
+            entry = _make_entry(hashnode="n/a", remote={"devto": {"id": 42}})
+            updated, errors = asyncio.run(
+                _process_entry(entry, _make_creds(), dry_run=False)
+            )
+
+        find.assert_not_called()
+        assert errors == 0
+        assert updated["remote"]["devto"]["id"] == 42
+        assert updated["remote"]["qiita"]["id"] == "q1"
+        assert updated["remote"]["qiita"]["url"] == "https://qiita.com/items/q1"
+        assert len(updated["remote"]["qiita"]["hash"]) == 64
+
+    @patch("scheduled_publish._validate_article_path")
+    @patch("publish.parse_zenn_article")
+    def test_unchanged_payload_costs_no_requests(
+        self, mock_parse: MagicMock, mock_validate: MagicMock,
+    ) -> None:
+        from collections import Counter
+
+        from publish import Article, convert_to_devto, payload_hash
+
+        mock_validate.return_value = SAMPLE_ARTICLE
+        article = Article(title="テスト記事", body="本文", topics=("python",))
+        mock_parse.return_value = article
+        entry = _make_entry(qiita="n/a", hashnode="n/a")
+        content_hash = payload_hash(convert_to_devto(article, entry["canonical_url"]))
+        entry["remote"] = {
+            "devto": {"id": 42, "url": "https://dev.to/a", "hash": content_hash},
+        }
+        stats: Counter[str] = Counter()
+
+        with (
+            patch("publish.find_devto_article_by_title_async") as find,
+            patch("publish.update_on_devto_async") as update,
+        ):
+            updated, errors = asyncio.run(
+                _process_entry(entry, _make_creds(), dry_run=False, stats=stats)
+            )
+
+        find.assert_not_called()
+        update.assert_not_called()
+        assert errors == 0
+        assert stats["unchanged"] == 1
+        assert updated["devto"] == "https://dev.to/a"
+
+
+class TestReconcileRemoteIds:
+    @patch("publish.iter_hashnode_posts")
+    @patch("publish.iter_devto_articles")
+    @patch("publish.iter_qiita_items")
+    @patch("publish.parse_zenn_article")
+    @patch("scheduled_publish._validate_article_path")
+    def test_matches_listings_by_title(
+        self,
+        mock_validate: MagicMock,
+        mock_parse: MagicMock,
+        mock_qiita: MagicMock,
+        mock_devto: MagicMock,
+        mock_hashnode: MagicMock,
+    ) -> None:
+        mock_validate.return_value = SAMPLE_ARTICLE
+        mock_parse.return_value = MagicMock(title="Target")
+        mock_qiita.return_value = iter(
+            [{"id": "q1", "title": "Target", "url": "https://qiita.com/q1"}]
+        )
+        mock_devto.return_value = iter([{"id": 7, "title": "Other"}])
+        mock_hashnode.return_value = iter(
+            [{"id": "h1", "title": "Target", "url": "https://hashnode.dev/h1"}]
+        )
+        schedule = {
+            "articles": [
+                _make_entry(
+                    qiita="https://qiita.com/x",
+                    devto="pending",
+                    remote={"qiita": {"id": "q1", "hash": "kept"}},
+                ),
+                _make_entry(file="articles/na.md", qiita="n/a", devto="n/a", hashnode="n/a"),
+            ],
+        }
+
+        updated = reconcile_remote_posts(schedule, _make_creds())
+
+        assert updated["articles"][0]["remote"] == {
+            "qiita": {"id": "q1", "url": "https://qiita.com/q1", "hash": "kept"},
+            "hashnode": {"id": "h1", "url": "https://hashnode.dev/h1"},
+        }
+        assert "remote" not in updated["articles"][1]
+        assert mock_qiita.call_count == 1
+
+
+class TestVerifyRemotePosts:
+    @patch("scheduled_publish._validate_article_path")
+    def test_only_posted_copies_are_audited(self, mock_validate: MagicMock) -> None:
+        mock_validate.return_value = SAMPLE_ARTICLE
+        audited: list = []
+
+        async def audit(self: Any, jobs: Any) -> list:
+            audited.extend(target for target, _ in jobs)
+            return [drift.Verdict(target, drift.OK) for target in audited]
+
+        schedule = {"articles": [
+            _make_entry(qiita="https://qiita.com/u/items/q1", devto="pending"),
+            _make_entry(file="articles/na.md", qiita="n/a", devto="n/a", hashnode="n/a"),
+        ]}
+        with patch("drift.Auditor.audit", audit):
+            assert verify_remote_posts(schedule, _make_creds()) == 0
+        assert [(t.platform, t.url) for t in audited] == [
+            ("qiita", "https://qiita.com/u/items/q1"),
+        ]
+        assert mock_validate.call_count == 1
+
+    @patch("scheduled_publish._validate_article_path")
+    def test_any_problem_fails(self, mock_validate: MagicMock) -> None:
+        mock_validate.return_value = SAMPLE_ARTICLE
+
+        async def audit(self: Any, jobs: Any) -> list:
+            return [drift.Verdict(target, drift.MISSING) for target, _ in jobs]
+
+        schedule = {"articles": [_make_entry(devto="https://dev.to/u/a")]}
+        with patch("drift.Auditor.audit", audit):
+            assert verify_remote_posts(schedule, _make_creds()) == 1
+
+
 # ---------------------------------------------------------------------------
 # Zenn publishing tests
 # ---------------------------------------------------------------------------
 
 
-class TestPublishZennArticle:
-    """_publish_zenn_article frontmatter and git operations."""
+class TestSetZennPublished:
+    """_set_zenn_published flips the frontmatter flag without touching git."""
 
     def test_already_published_skips(self, tmp_path: Path) -> None:
-        """If frontmatter already has published: true, skip everything."""
+        """If frontmatter already has published: true, nothing changes."""
         article = tmp_path / "test.md"
         article.write_text("---\ntitle: Test\npublished: true\n---\nBody\n")
-        result = _publish_zenn_article(article, dry_run=False)
-        assert result is True
+        assert _set_zenn_published(article, dry_run=False) is False
 
     def test_dry_run_does_not_modify_file(self, tmp_path: Path) -> None:
         article = tmp_path / "test.md"
         article.write_text("---\ntitle: Test\npublished: false\n---\nBody\n")
-        result = _publish_zenn_article(article, dry_run=True)
+        result = _set_zenn_published(article, dry_run=True)
         assert result is True
         # File should remain unchanged
         post = frontmatter.load(article)
         assert post.metadata["published"] is False
 
-    @patch("scheduled_publish.subprocess.run")
-    def test_success_sets_published_true(
-        self, mock_run: MagicMock, tmp_path: Path,
-    ) -> None:
+    def test_sets_published_true(self, tmp_path: Path) -> None:
         article = tmp_path / "test.md"
         article.write_text("---\ntitle: Test\npublished: false\n---\nBody\n")
-
-        with patch("scheduled_publish.REPO_ROOT", tmp_path):
-            result = _publish_zenn_article(article, dry_run=False)
-
-        assert result is True
+        assert _set_zenn_published(article, dry_run=False) is True
         post = frontmatter.load(article)
         assert post.metadata["published"] is True
-        assert mock_run.call_count == 3  # git add, commit, push
-
-    @patch("scheduled_publish.subprocess.run")
-    def test_git_failure_returns_false(
-        self, mock_run: MagicMock, tmp_path: Path,
-    ) -> None:
-        import subprocess
-
-        article = tmp_path / "test.md"
-        article.write_text("---\ntitle: Test\npublished: false\n---\nBody\n")
-        mock_run.side_effect = subprocess.CalledProcessError(1, "git", stderr=b"error")
-
-        with patch("scheduled_publish.REPO_ROOT", tmp_path):
-            result = _publish_zenn_article(article, dry_run=False)
-
-        assert result is False
 
 
 class TestProcessZennEntries:
     """_process_zenn_entries filters and processes due Zenn articles."""
 
+    @patch("scheduled_publish.commit_and_push")
     @patch("scheduled_publish.save_schedule")
-    @patch("scheduled_publish._publish_zenn_article", return_value=True)
+    @patch("scheduled_publish._set_zenn_published", return_value=True)
     @patch("scheduled_publish._validate_article_path")
     def test_publishes_due_entry(
         self, mock_validate: MagicMock, mock_publish: MagicMock,
-        mock_save: MagicMock,
+        mock_save: MagicMock, mock_push: MagicMock,
     ) -> None:
         mock_validate.return_value = Path("/fake/article.md")
         schedule = {
@@ -321,9 +809,103 @@ class TestProcessZennEntries:
         assert errors == 0
         assert updated["articles"][0]["zenn_published"] is True
         mock_publish.assert_called_once()
+        mock_push.assert_called_once()
         mock_save.assert_called_once()
 
-    @patch("scheduled_publish._publish_zenn_article")
+    def _due_schedule(self, *files: str) -> dict[str, Any]:
+        return {
+            "articles": [
+                {
+                    "file": f,
+                    "date": "2026-02-01",
+                    "zenn_date": "2026-02-01",
+                    "zenn_published": False,
+                    "devto": "n/a",
+                    "hashnode": "n/a",
+                }
+                for f in files
+            ],
+        }
+
+    @patch("scheduled_publish.commit_and_push")
+    @patch("scheduled_publish.save_schedule")
+    @patch("scheduled_publish._set_zenn_published")
+    @patch("scheduled_publish._validate_article_path")
+    def test_due_entries_share_one_commit_and_push(
+        self, mock_validate: MagicMock, mock_set: MagicMock,
+        mock_save: MagicMock, mock_push: MagicMock,
+    ) -> None:
+        mock_validate.side_effect = lambda f: Path("/repo") / f
+        # b.md was flipped by an earlier run whose push failed
+        mock_set.side_effect = [True, False, True]
+        schedule = self._due_schedule("articles/a.md", "articles/b.md", "articles/c.md")
+
+        updated, count, errors = _process_zenn_entries(schedule, dry_run=False)
+
+        assert count == 3
+        assert errors == 0
+        mock_push.assert_called_once()
+        assert mock_push.call_args.args[1] == [
+            "articles/a.md", "articles/b.md", "articles/c.md",
+        ]
+        assert all(e["zenn_published"] for e in updated["articles"])
+
+    @patch("scheduled_publish.commit_and_push")
+    @patch("scheduled_publish.save_schedule")
+    @patch("scheduled_publish._set_zenn_published", return_value=True)
+    @patch("scheduled_publish._validate_article_path")
+    def test_failed_push_marks_nothing(
+        self, mock_validate: MagicMock, mock_set: MagicMock,
+        mock_save: MagicMock, mock_push: MagicMock,
+    ) -> None:
+        mock_validate.side_effect = lambda f: Path("/repo") / f
+        mock_push.side_effect = GitError("git push: rejected")
+        schedule = self._due_schedule("articles/a.md", "articles/b.md")
+
+        updated, count, errors = _process_zenn_entries(schedule, dry_run=False)
+
+        assert count == 0
+        assert errors == 1
+        assert not any(e["zenn_published"] for e in updated["articles"])
+        mock_save.assert_not_called()
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+    @patch("scheduled_publish.save_schedule")
+    def test_flipped_but_uncommitted_file_is_pushed(
+        self, mock_save: MagicMock, tmp_path: Path,
+    ) -> None:
+        remote, repo = tmp_path / "remote.git", tmp_path / "work"
+        subprocess.run(["git", "init", "-q", "--bare", "-b", "main", str(remote)], check=True)
+        subprocess.run(["git", "clone", "-q", str(remote), str(repo)], check=True)
+        for args in (("config", "user.email", "t@example.com"), ("config", "user.name", "t")):
+            subprocess.run(["git", "-C", str(repo), *args], check=True)
+        article = repo / "articles" / "a.md"
+        article.parent.mkdir()
+        article.write_text("---\ntitle: A\npublished: false\n---\nBody\n")
+        subprocess.run(["git", "-C", str(repo), "add", "."], check=True)
+        subprocess.run(["git", "-C", str(repo), "commit", "-q", "-m", "draft"], check=True)
+        subprocess.run(["git", "-C", str(repo), "push", "-q", "origin", "main"], check=True)
+        # An earlier run flipped the flag, but its commit failed.
+        article.write_text("---\ntitle: A\npublished: true\n---\nBody\n")
+        subprocess.run(["git", "-C", str(repo), "add", "."], check=True)
+
+        with (
+            patch("scheduled_publish.REPO_ROOT", repo),
+            patch("scheduled_publish._validate_article_path", side_effect=lambda f: repo / f),
+        ):
+            updated, count, errors = _process_zenn_entries(
+                self._due_schedule("articles/a.md"), dry_run=False,
+            )
+
+        assert (count, errors) == (1, 0)
+        assert updated["articles"][0]["zenn_published"] is True
+        pushed = subprocess.run(
+            ["git", "-C", str(remote), "show", "main:articles/a.md"],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        assert "published: true" in pushed
+
+    @patch("scheduled_publish._set_zenn_published")
     @patch("scheduled_publish._validate_article_path")
     def test_skips_already_published(
         self, mock_validate: MagicMock, mock_publish: MagicMock,
@@ -345,7 +927,7 @@ class TestProcessZennEntries:
         assert errors == 0
         mock_publish.assert_not_called()
 
-    @patch("scheduled_publish._publish_zenn_article")
+    @patch("scheduled_publish._set_zenn_published")
     @patch("scheduled_publish._validate_article_path")
     def test_skips_future_date(
         self, mock_validate: MagicMock, mock_publish: MagicMock,
@@ -370,7 +952,7 @@ class TestProcessZennEntries:
         assert count == 0
         mock_publish.assert_not_called()
 
-    @patch("scheduled_publish._publish_zenn_article")
+    @patch("scheduled_publish._set_zenn_published")
     @patch("scheduled_publish._validate_article_path")
     def test_skips_entries_without_zenn_date(
         self, mock_validate: MagicMock, mock_publish: MagicMock,
@@ -388,3 +970,39 @@ class TestProcessZennEntries:
         _, count, errors = _process_zenn_entries(schedule, dry_run=False)
         assert count == 0
         mock_publish.assert_not_called()
+
+
+class TestRunSummary:
+    @patch("scheduled_publish._crosspost_due")
+    @patch("scheduled_publish._load_credentials", return_value=_make_creds())
+    @patch("scheduled_publish._process_zenn_entries")
+    def test_total_counts_zenn_and_crosspost_errors(
+        self, mock_zenn: MagicMock, mock_creds: MagicMock, mock_crosspost: MagicMock,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        mock_zenn.side_effect = lambda schedule, **kwargs: (schedule, 1, 2)
+        mock_crosspost.return_value = 1
+        caplog.set_level(logging.INFO, logger="scheduled_publish")
+
+        assert publish_due({"articles": []}) == 1
+        assert "Run finished with 3 error(s): 2 Zenn, 1 cross-post." in caplog.text
+
+
+class TestRunMetrics:
+    """publish_due records phase timings; write_metrics exports them."""
+
+    @patch("scheduled_publish._load_credentials", return_value=None)
+    @patch("scheduled_publish._process_zenn_entries")
+    def test_phases_and_errors_are_written(
+        self, mock_zenn: MagicMock, mock_creds: MagicMock, tmp_path: Path,
+    ) -> None:
+        mock_zenn.side_effect = lambda schedule, **kwargs: (schedule, 0, 0)
+
+        assert publish_due({"articles": []}) == 1
+        write_metrics(tmp_path, started=0.0, exit_code=1)
+
+        assert metrics.registry.value("publish_phase_duration_seconds", phase="zenn") > 0
+        text = (tmp_path / "publish_due.prom").read_text()
+        assert "publish_run_errors 1" in text
+        [summary] = (tmp_path / "runs").glob("publish_due-*.json")
+        assert json.loads(summary.read_text())["exit_code"] == 1
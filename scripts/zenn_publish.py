@@ -7,6 +7,7 @@ Usage:
     python zenn_publish.py              # Publish due articles
     python zenn_publish.py --dry-run    # Preview without changing files
     python zenn_publish.py --status     # Show Zenn publish status
+    python zenn_publish.py --profile /tmp/prof  # Also write a CPU/memory profile
 """
 
 from __future__ import annotations
@@ -15,11 +16,15 @@ import argparse
 import json
 import logging
 import re
-import subprocess
 from datetime import date
 from pathlib import Path
 from typing import Any
 
+import profiling
+from article_index import ArticleIndex, read_frontmatter
+from git_ops import GitError, commit_and_push
+from schedule_store import ScheduleStore
+
 SCRIPT_DIR = Path(__file__).parent
 REPO_ROOT = SCRIPT_DIR.parent
 SCHEDULE_PATH = SCRIPT_DIR / "schedule.json"
@@ -43,7 +48,7 @@ def _setup_logging() -> None:
 
 def load_schedule() -> dict[str, Any]:
     try:
-        return json.loads(SCHEDULE_PATH.read_text())
+        return ScheduleStore(SCHEDULE_PATH).load()
     except FileNotFoundError:
         logger.error("Schedule file not found: %s", SCHEDULE_PATH)
         raise SystemExit(1)
@@ -53,7 +58,7 @@ def load_schedule() -> dict[str, Any]:
 
 
 def save_schedule(schedule: dict[str, Any]) -> None:
-    SCHEDULE_PATH.write_text(json.dumps(schedule, indent=2, ensure_ascii=False) + "\n")
+    ScheduleStore(SCHEDULE_PATH).save(schedule)
 
 
 def _validate_article_path(file_path: str) -> Path | None:
@@ -69,9 +74,7 @@ def _validate_article_path(file_path: str) -> Path | None:
 
 def _is_published(article_path: Path) -> bool:
     """Check if article frontmatter already has published: true."""
-    content = article_path.read_text()
-    m = re.search(r"^published:\s*(true|false)", content, re.MULTILINE)
-    return m is not None and m.group(1) == "true"
+    return read_frontmatter(article_path).get("published") is True
 
 
 def _set_published(article_path: Path, *, dry_run: bool) -> bool:
@@ -91,29 +94,17 @@ def _set_published(article_path: Path, *, dry_run: bool) -> bool:
 
 
 def _git_add_commit_push(file_paths: list[str], commit_msg: str, *, dry_run: bool) -> bool:
-    """Stage files, commit, and push. Returns True on success."""
+    """Stage files, commit, and push (rebasing on rejection). Returns True on success."""
     if dry_run:
         logger.info("  [DRY-RUN] Would commit %d file(s) and push.", len(file_paths))
         return True
     try:
-        for fp in file_paths:
-            subprocess.run(
-                ["git", "-C", str(REPO_ROOT), "add", fp],
-                check=True, capture_output=True, text=True,
-            )
-        subprocess.run(
-            ["git", "-C", str(REPO_ROOT), "commit", "-m", commit_msg],
-            check=True, capture_output=True, text=True,
-        )
-        subprocess.run(
-            ["git", "-C", str(REPO_ROOT), "push", "origin", "main"],
-            check=True, capture_output=True, text=True,
-        )
-        logger.info("  git push OK")
-        return True
-    except subprocess.CalledProcessError as e:
-        logger.error("Git error: %s", (e.stderr or e.stdout or "").strip())
+        commit_and_push(REPO_ROOT, file_paths, commit_msg, remote="origin", branch="main")
+    except GitError as e:
+        logger.error("Git error: %s", e)
         return False
+    logger.info("  git push OK")
+    return True
 
 
 def show_status(schedule: dict[str, Any]) -> None:
@@ -121,12 +112,14 @@ def show_status(schedule: dict[str, Any]) -> None:
     logger.info("Today: %s", today)
     logger.info("%-12s %-45s %-15s %s", "zenn_date", "File", "zenn_published", "Status")
     logger.info("-" * 90)
+    index = ArticleIndex()
     for entry in schedule["articles"]:
         zenn_date_str = entry.get("zenn_date")
         if not zenn_date_str:
             continue
         article_path = _validate_article_path(entry["file"])
-        published_in_file = _is_published(article_path) if article_path else False
+        meta = index.get(article_path) if article_path else None
+        published_in_file = meta is not None and meta.published is True
         tracked = entry.get("zenn_published", False)
         zenn_date = date.fromisoformat(zenn_date_str)
         if tracked or published_in_file:
@@ -139,6 +132,7 @@ def show_status(schedule: dict[str, Any]) -> None:
             "%-12s %-45s %-15s %s",
             zenn_date_str, entry["file"], str(tracked or published_in_file), status,
         )
+    index.save()
 
 
 def publish_due(schedule: dict[str, Any], *, dry_run: bool = False) -> int:
@@ -226,8 +220,13 @@ def main() -> int:
     parser = argparse.ArgumentParser(description="Zenn auto-publisher")
     parser.add_argument("--dry-run", action="store_true", help="Preview without changing files")
     parser.add_argument("--status", action="store_true", help="Show Zenn publish status")
+    profiling.add_argument(parser)
     args = parser.parse_args()
+    with profiling.profiled(args.profile, "zenn_publish"):
+        return _run(args)
+
 
+def _run(args: argparse.Namespace) -> int:
     schedule = load_schedule()
 
     if args.status: